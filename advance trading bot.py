@@ -4,8 +4,8 @@ import numpy as np
 from datetime import datetime
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import requests
 import os
+from zapier.protrader.brokers import BrokerError, DhanBroker
 
 class OptimizedTradingBot:
     def __init__(self):
@@ -284,6 +284,8 @@ class OptimizedTradingBot:
     def save_credentials(self):
         self.client_id = self.client_id_entry.get()
         self.token = self.token_entry.get()
+        # New credentials, same pooled HTTP session
+        self.broker = DhanBroker(self.client_id, self.token)
         self.log_message("Credentials saved successfully!")
 
     def create_slider(self, parent, label, min_val, max_val, default):
@@ -381,21 +383,15 @@ class OptimizedTradingBot:
             self.log_message("Market is closed. Using mock data.")
             return {"lastPrice": 42000}  # Mock data
 
-        url = f"https://api.dhan.co/marketdata/instruments/{self.current_instrument}"
-        headers = {
-            "Authorization": f"Bearer {self.token}"
-        }
+        if getattr(self, "broker", None) is None:
+            self.broker = DhanBroker(self.client_id, self.token)
 
         try:
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                self.log_message(f"404 Error: Invalid Instrument ID or Market Closed. Response: {response.text}")
-                return None
-            else:
-                self.log_message(f"Error fetching data: {response.status_code} | {response.text}")
-                return None
+            quote = self.broker.get_quote(self.current_instrument)
+            return {"lastPrice": quote["ltp"]}
+        except BrokerError as e:
+            self.log_message(f"Error fetching data: {e}")
+            return None
         except Exception as e:
             self.log_message(f"Exception occurred while fetching data: {e}")
             return None
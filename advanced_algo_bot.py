@@ -9,6 +9,7 @@ import customtkinter as ctk
 from PIL import Image, ImageTk
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from zapier.protrader.metrics import PerformanceAccumulator
 
 class AdvancedAlgoBot:
     def __init__(self):
@@ -27,6 +28,7 @@ class AdvancedAlgoBot:
         self.trades_today = 0
         self.win_rate = 0
         self.total_trades = 0
+        self.performance = PerformanceAccumulator(100000)
         
         # Initialize strategy parameters
         self.init_strategy_params()
@@ -370,10 +372,11 @@ class AdvancedAlgoBot:
     
     def update_stats(self):
         # Simulate trading activity
-        self.pnl += np.random.normal(0, 100)
+        self.performance.record(np.random.normal(0, 100))
+        self.pnl = self.performance.total_pnl
         self.trades_today += 1
-        self.total_trades += 1
-        self.win_rate = np.random.randint(40, 80)
+        self.total_trades = self.performance.total_trades
+        self.win_rate = round(self.performance.win_rate)
         
         # Update labels
         self.pnl_label.configure(
@@ -387,6 +390,8 @@ class AdvancedAlgoBot:
         self.metric_labels["Total Trades"].configure(text=str(self.total_trades))
         self.metric_labels["Win Rate"].configure(text=f"{self.win_rate}%")
         self.metric_labels["Avg Profit"].configure(text=f"₹{self.pnl/max(1,self.total_trades):,.2f}")
+        self.metric_labels["Max Drawdown"].configure(text=f"{self.performance.max_drawdown:.1f}%")
+        self.metric_labels["Sharpe Ratio"].configure(text=f"{self.performance.sharpe_ratio:.2f}")
         
         # Log activity
         self.log_message(f"Trade executed at {datetime.now().strftime('%H:%M:%S')}")
@@ -6,6 +6,7 @@ from datetime import datetime
 import threading
 import time
 import customtkinter as ctk
+from zapier.protrader.scalping import TickScalper, simulate_ticks
 
 class AlgoTradingBot:
     def __init__(self):
@@ -22,6 +23,7 @@ class AlgoTradingBot:
         self.current_strategy = None
         self.pnl = 0
         self.trades_today = 0
+        self.scalper = None
         
         self.create_gui()
         
@@ -238,7 +240,8 @@ class AlgoTradingBot:
         self.log_message(f"Stop Loss: {sl}%")
         
         # Start trading thread
-        self.trading_thread = threading.Thread(target=self.run_strategy)
+        target = self.run_scalping if strategy == "Futures Scalping" else self.run_strategy
+        self.trading_thread = threading.Thread(target=target)
         self.trading_thread.daemon = True
         self.trading_thread.start()
     
@@ -257,7 +260,7 @@ class AlgoTradingBot:
         """Emergency stop - close all positions"""
         self.is_trading = False
         self.log_message("⚠️ EMERGENCY STOP - Closing all positions!")
-        # Add position closing logic here
+        # The scalping worker flattens its position once it sees is_trading go False
         self.stop_trading()
     
     def run_strategy(self):
@@ -267,6 +270,60 @@ class AlgoTradingBot:
             time.sleep(2)
             self.update_stats()
     
+    def run_scalping(self, ticks_per_batch=2000, batch_interval=0.25):
+        """Run the tick scalper on a simulated futures feed, a block of ticks at a time"""
+        self.scalper = scalper = TickScalper()
+        price = 22450.0
+        seed = 0
+        while self.is_trading:
+            bid, ask, bid_qty, ask_qty = simulate_ticks(ticks_per_batch, start=price, seed=seed)
+            price = float(bid[-1])
+            seed += 1
+            
+            first_new = len(scalper.trades)
+            started = time.perf_counter()
+            scalper.process(bid.tolist(), ask.tolist(), bid_qty.tolist(), ask_qty.tolist())
+            elapsed = time.perf_counter() - started
+            self.root.after(0, self.show_scalper_stats, first_new, ticks_per_batch / elapsed if elapsed else 0)
+            time.sleep(batch_interval)
+        
+        # Never leave a scalp open once trading stops
+        if scalper.position:
+            first_new = len(scalper.trades)
+            scalper.flatten("STOPPED")
+            self.root.after(0, self.show_scalper_stats, first_new)
+    
+    def show_scalper_stats(self, first_new, ticks_per_second=None):
+        """Refresh labels, position row and log from the scalper (Tk thread)"""
+        scalper = self.scalper
+        self.pnl = scalper.realized_pnl
+        self.trades_today = len(scalper.trades)
+        
+        self.pnl_label.configure(
+            text=f"P&L: ₹{self.pnl:,.2f}",
+            text_color="#2ECC71" if self.pnl >= 0 else "#E74C3C"
+        )
+        self.trades_label.configure(text=f"Trades: {self.trades_today}")
+        self.winrate_label.configure(text=f"Win Rate: {scalper.win_rate:.0f}%")
+        
+        # Current position
+        self.positions_tree.delete(*self.positions_tree.get_children())
+        if scalper.position:
+            mark = scalper.bid if scalper.position == 1 else scalper.ask
+            open_pnl = (mark - scalper.entry_price) * scalper.position * scalper.qty
+            self.positions_tree.insert("", "end", values=(
+                "FUT LONG" if scalper.position == 1 else "FUT SHORT",
+                f"{scalper.entry_price:.2f}", f"{mark:.2f}", f"{open_pnl:.2f}", "Futures Scalping"
+            ))
+        
+        # Log the last few closed trades of this batch
+        new_trades = scalper.trades[first_new:]
+        for _, _, side, entry, exit_price, pnl, reason in new_trades[-5:]:
+            self.log_message(f"{'LONG' if side == 1 else 'SHORT'} {entry:.2f} -> {exit_price:.2f} "
+                             f"{reason} P&L ₹{pnl:.2f}")
+        if ticks_per_second:
+            self.log_message(f"{len(new_trades)} trades this batch, {ticks_per_second:,.0f} ticks/s")
+    
     def update_stats(self):
         """Update trading statistics"""
         # Simulate P&L changes
@@ -0,0 +1,21 @@
+// Push mode bridge: any page containing <div id="price-stream" data-url="..."> opens an
+// EventSource on that URL and hands every delta to the 'price-stream-data' dcc.Store.
+// Clientside callbacks on that store then update the page without a server round-trip.
+(function () {
+    function connect(el) {
+        var source = new EventSource(el.getAttribute('data-url'));
+        source.onmessage = function (event) {
+            window.dash_clientside.set_props('price-stream-data', {data: JSON.parse(event.data)});
+        };
+    }
+
+    // Dash renders the layout after load, so wait for the element to appear
+    var timer = setInterval(function () {
+        var el = document.getElementById('price-stream');
+        if (el && window.dash_clientside && window.dash_clientside.set_props) {
+            clearInterval(timer);
+            connect(el);
+        }
+    }, 200);
+    setTimeout(function () { clearInterval(timer); }, 30000);
+})();
@@ -4,9 +4,15 @@ from dash.dependencies import Input, Output
 from datetime import datetime
 import pytz
 import random  # For sample data
+import os
+from zapier.protrader.pricehub import PriceHub
+from zapier.protrader.stream import register_sse_route
 
 app = dash.Dash(__name__)
 
+# 'push' streams sample prices over SSE; 'poll' refreshes through dcc.Interval
+PUSH_MODE = os.environ.get('DASHBOARD_MODE', 'poll') == 'push'
+
 # Color scheme
 COLORS = {
     'bg': '#000000',
@@ -25,6 +31,15 @@ def get_sample_data():
         'sensex': 66881.60 + random.uniform(-30, 30)
     }
 
+def sample_quotes(symbols):
+    data = get_sample_data()
+    return {s: {'ltp': data[s], 'change': 0.0, 'change_percent': random.uniform(-0.5, 0.5)}
+            for s in symbols}
+
+# Push mode source: one sampler shared by every connected browser
+price_hub = PriceHub([sample_quotes], ['nifty', 'banknifty', 'sensex'], interval=1.0)
+register_sse_route(app.server, price_hub, '/stream/prices')
+
 app.layout = html.Div([
     # Header
     html.Div([
@@ -105,8 +120,13 @@ app.layout = html.Div([
     
     dcc.Interval(
         id='interval-component',
-        interval=1000
-    )
+        interval=1000,
+        disabled=PUSH_MODE
+    ),
+    
+    # Push mode: assets/price_stream.js feeds stream deltas into this store
+    html.Div(id='price-stream', **{'data-url': '/stream/prices'}) if PUSH_MODE else html.Div(),
+    dcc.Store(id='price-stream-data')
 ], style={
     'backgroundColor': COLORS['bg'],
     'padding': '20px',
@@ -159,7 +179,42 @@ def update_data(n):
         get_change_style(changes['sensex'])
     )
 
+# Push mode: format streamed deltas in the browser
+app.clientside_callback(
+    """
+    function(delta) {
+        var no = window.dash_clientside.no_update;
+        var out = ['🕒 ' + new Date((delta.time + 19800) * 1000).toISOString().slice(11, 19)];
+        ['nifty', 'banknifty', 'sensex'].forEach(function (s) {
+            var q = (delta.quotes || {})[s];
+            if (!q) { out.push(no, no, no); return; }
+            var pct = q.change_percent;
+            out.push(
+                '₹' + q.ltp.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2}),
+                '(' + (pct >= 0 ? '+' : '') + pct.toFixed(2) + '%)',
+                {color: pct >= 0 ? '#00ff00' : '#ff4444', margin: '5px', fontSize: '16px'}
+            );
+        });
+        return out;
+    }
+    """,
+    [Output('time-display', 'children', allow_duplicate=True),
+     Output('nifty-price', 'children', allow_duplicate=True),
+     Output('nifty-change', 'children', allow_duplicate=True),
+     Output('nifty-change', 'style', allow_duplicate=True),
+     Output('banknifty-price', 'children', allow_duplicate=True),
+     Output('banknifty-change', 'children', allow_duplicate=True),
+     Output('banknifty-change', 'style', allow_duplicate=True),
+     Output('sensex-price', 'children', allow_duplicate=True),
+     Output('sensex-change', 'children', allow_duplicate=True),
+     Output('sensex-change', 'style', allow_duplicate=True)],
+    Input('price-stream-data', 'data'),
+    prevent_initial_call=True
+)
+
 if __name__ == '__main__':
+    if PUSH_MODE:
+        price_hub.start()
     print("\n=== Trading Dashboard ===")
     print("Starting server...")
     print("Go to: http://127.0.0.1:8060")
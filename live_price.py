@@ -1,4 +1,4 @@
-from dhanhq import dhanhq
+from zapier.protrader.brokers import DhanBroker
 import time
 
 # Credentials
@@ -10,17 +10,17 @@ def check_prices():
     
     try:
         # Connect
-        dhan = dhanhq(
+        dhan = DhanBroker(
             client_id=CLIENT_ID,
             access_token=TOKEN
         )
         print("Connected!")
         
         # Get single price check
-        nifty = dhan.get_ltp("NIFTY")
+        nifty = dhan.get_quote("NIFTY")["ltp"]
         print(f"\nNIFTY: {nifty}")
         
-        banknifty = dhan.get_ltp("BANKNIFTY")
+        banknifty = dhan.get_quote("BANKNIFTY")["ltp"]
         print(f"BANKNIFTY: {banknifty}")
         
     except Exception as e:
@@ -1,4 +1,4 @@
-from dhanhq import dhanhq
+from zapier.protrader.brokers import DhanBroker
 import time
 from datetime import datetime
 
@@ -11,7 +11,7 @@ def monitor_prices():
     
     try:
         # Connect to broker
-        broker = dhanhq(
+        broker = DhanBroker(
             client_id=CLIENT_ID,
             access_token=TOKEN
         )
@@ -23,11 +23,10 @@ def monitor_prices():
                 # Get current time
                 current_time = datetime.now().strftime("%H:%M:%S")
                 
-                # Get NIFTY price
-                nifty = broker.get_ltp("NIFTY")
-                
-                # Get BANKNIFTY price
-                banknifty = broker.get_ltp("BANKNIFTY")
+                # Get NIFTY and BANKNIFTY in one request on the pooled connection
+                quotes = broker.get_quotes(["NIFTY", "BANKNIFTY"])
+                nifty = quotes["NIFTY"]["ltp"]
+                banknifty = quotes["BANKNIFTY"]["ltp"]
                 
                 # Clear screen (optional)
                 print("\033c", end="")
@@ -2,6 +2,7 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import yfinance as yf
+from zapier.protrader.metrics import PerformanceAccumulator
 
 class SmartAlgoBot:
     def __init__(self):
@@ -14,7 +15,6 @@ class SmartAlgoBot:
         self.min_capital = self.initial_capital
         
         # Performance tracking
-        self.daily_returns = []
         self.trades_history = []
         self.win_trades = 0
         self.loss_trades = 0
@@ -23,6 +23,7 @@ class SmartAlgoBot:
         self.max_drawdown = 0
         self.sharpe_ratio = 0
         self.risk_free_rate = 0.06  # 6% risk-free rate
+        self.performance = PerformanceAccumulator(self.initial_capital, risk_free_rate=self.risk_free_rate)
         
         self.create_gui()
         self.start_metrics_update()
@@ -107,11 +108,12 @@ class SmartAlgoBot:
         self.metric_labels[key] = label
 
     def update_metrics(self):
-        if not self.trades_history:
+        stats = self.performance
+        if not stats.total_trades:
             return
             
         # Calculate P&L
-        total_pnl = self.current_capital - self.initial_capital
+        total_pnl = stats.total_pnl
         pnl_percentage = (total_pnl / self.initial_capital) * 100
         
         # Update P&L labels with colors
@@ -125,60 +127,34 @@ class SmartAlgoBot:
             text_color=color
         )
         
-        # Calculate win rate
-        total_trades = self.win_trades + self.loss_trades
-        win_rate = (self.win_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        # Calculate profit factor
-        total_profits = sum(t['pnl'] for t in self.trades_history if t['pnl'] > 0)
-        total_losses = abs(sum(t['pnl'] for t in self.trades_history if t['pnl'] < 0))
-        profit_factor = total_profits / total_losses if total_losses > 0 else 0
-        
-        # Calculate average win/loss
-        winning_trades = [t['pnl'] for t in self.trades_history if t['pnl'] > 0]
-        losing_trades = [t['pnl'] for t in self.trades_history if t['pnl'] < 0]
-        
-        avg_win = np.mean(winning_trades) if winning_trades else 0
-        avg_loss = np.mean(losing_trades) if losing_trades else 0
-        
+        # Win rate, profit factor, averages and Sharpe come from the running accumulator
+        avg_win = stats.avg_win
+        avg_loss = stats.avg_loss
         avg_win_pct = (avg_win / self.initial_capital) * 100
         avg_loss_pct = (avg_loss / self.initial_capital) * 100
-        
-        # Calculate Sharpe Ratio
-        returns = pd.Series(self.daily_returns)
-        if len(returns) > 1:
-            excess_returns = returns - (self.risk_free_rate / 252)  # Daily risk-free rate
-            sharpe = np.sqrt(252) * (excess_returns.mean() / excess_returns.std())
-        else:
-            sharpe = 0
+        self.sharpe_ratio = stats.sharpe_ratio
         
         # Update metric labels
-        self.metric_labels["win_rate"].configure(text=f"{win_rate:.1f}%")
-        self.metric_labels["profit_factor"].configure(text=f"{profit_factor:.2f}")
+        self.metric_labels["win_rate"].configure(text=f"{stats.win_rate:.1f}%")
+        self.metric_labels["profit_factor"].configure(text=f"{stats.profit_factor:.2f}")
         self.metric_labels["avg_win"].configure(text=f"₹{avg_win:,.2f} ({avg_win_pct:+.1f}%)")
         self.metric_labels["avg_loss"].configure(text=f"₹{avg_loss:,.2f} ({avg_loss_pct:+.1f}%)")
         self.metric_labels["max_drawdown"].configure(text=f"{self.max_drawdown:.1f}%")
-        self.metric_labels["sharpe_ratio"].configure(text=f"{sharpe:.2f}")
+        self.metric_labels["sharpe_ratio"].configure(text=f"{self.sharpe_ratio:.2f}")
 
     def simulate_trade(self):
         """Simulate a trade for testing"""
         # Simulate P&L
         pnl = np.random.normal(100, 500)  # Random P&L with mean 100 and std 500
         
-        # Update capital
-        self.current_capital += pnl
-        self.max_capital = max(self.max_capital, self.current_capital)
+        # Update capital and running performance (peak, drawdown, returns)
+        self.performance.record(pnl)
+        self.current_capital = self.performance.equity
+        self.max_capital = self.performance.peak_equity
         self.min_capital = min(self.min_capital, self.current_capital)
-        
-        # Calculate drawdown
-        current_drawdown = ((self.max_capital - self.current_capital) / self.max_capital) * 100
-        self.max_drawdown = max(self.max_drawdown, current_drawdown)
-        
-        # Update trade counts
-        if pnl > 0:
-            self.win_trades += 1
-        else:
-            self.loss_trades += 1
+        self.max_drawdown = self.performance.max_drawdown
+        self.win_trades = self.performance.winning_trades
+        self.loss_trades = self.performance.losing_trades
         
         # Record trade
         trade = {
@@ -188,10 +164,6 @@ class SmartAlgoBot:
         }
         self.trades_history.append(trade)
         
-        # Calculate daily return
-        daily_return = pnl / self.current_capital
-        self.daily_returns.append(daily_return)
-        
         # Update metrics
         self.update_metrics()
         
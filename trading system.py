@@ -4,8 +4,8 @@ import numpy as np
 from datetime import datetime
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import requests
 import os
+from zapier.protrader.brokers import BrokerError, DhanBroker
 
 class OptimizedTradingBot:
     def __init__(self):
@@ -255,6 +255,8 @@ class OptimizedTradingBot:
     def save_credentials(self):
         self.client_id = self.client_id_entry.get()
         self.token = self.token_entry.get()
+        # New credentials, same pooled HTTP session
+        self.broker = DhanBroker(self.client_id, self.token)
         self.log_message("Credentials saved successfully!")
 
     def create_slider(self, parent, label, min_val, max_val, default):
@@ -319,17 +321,14 @@ class OptimizedTradingBot:
             self.log_message("Error: Access Token is not set.")
             return None
 
-        endpoint = f"/marketdata/instruments/{instrument}"
-        url = f"https://api.dhan.co{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.token}"
-        }
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            return data
-        else:
-            self.log_message(f"Error fetching data: {response.status_code}")
+        if getattr(self, "broker", None) is None:
+            self.broker = DhanBroker(self.client_id, self.token)
+
+        try:
+            quote = self.broker.get_quote(instrument)
+            return {"lastPrice": quote["ltp"]}
+        except BrokerError as e:
+            self.log_message(f"Error fetching data: {e}")
             return None
 
     def simulate_trading(self):
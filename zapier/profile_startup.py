@@ -0,0 +1,102 @@
+"""Report what the strategy page costs at startup: import time per module and time to first frame
+
+Imports run in a fresh interpreter under ``python -X importtime`` so nothing
+is cached from this process. Heavy optional modules (matplotlib, requests,
+fyers_apiv3) should be absent from the report; they load on first use.
+
+    python profile_startup.py                # import report for strategy.py
+    python profile_startup.py --top 25 --page
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Modules that should stay off the startup path
+DEFERRED_MODULES = ("matplotlib", "requests", "fyers_apiv3")
+
+
+def import_times(module):
+    """[(name, self_us, cumulative_us, depth)] for a cold ``import module`` in a child interpreter"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1])
+    return rows
+
+
+def import_report(module="strategy", top=15):
+    """Print the total, the slowest top-level imports and any deferred module that still loaded"""
+    rows = import_times(module)
+    if not rows:
+        return None
+    total = next((r[2] for r in rows if r[0] == module), sum(r[1] for r in rows))
+    print(f"import {module}: {total / 1000:.1f} ms over {len(rows)} modules")
+
+    # importtime lists children before their parent: the module's direct imports
+    # are the depth-1 rows just above its own row
+    end = next((i for i, r in enumerate(rows) if r[0] == module and r[3] == 0), len(rows))
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    direct = [(r[0], r[2]) for r in rows[start:end] if r[3] == 1]
+    if end < len(rows):
+        direct.append((f"{module} (own body)", rows[end][1]))
+    print("\nSlowest direct imports (cumulative ms):")
+    for name, cumulative_us in sorted(direct, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f}  {name}")
+
+    print("\nSlowest modules by own time (ms):")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f}  {name}")
+
+    loaded = [m for m in DEFERRED_MODULES if any(r[0] == m for r in rows)]
+    print(f"\nDeferred modules loaded at import: {', '.join(loaded) if loaded else 'none'}")
+    return total / 1e6
+
+
+def first_frame_time():
+    """Seconds from ``import strategy`` to the first drawn StrategyPage (needs a display)"""
+    started = time.perf_counter()
+    import customtkinter as ctk
+    import strategy
+
+    root = ctk.CTk()
+    root.geometry("1400x900")
+    page = strategy.StrategyPage(root, None, None)
+    root.update()
+    elapsed = time.perf_counter() - started
+    page.running = False
+    root.destroy()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="strategy")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--page", action="store_true", help="Also time the strategy page to its first frame")
+    args = parser.parse_args()
+
+    if import_report(args.module, args.top) is None:
+        return 1
+    if args.page:
+        try:
+            print(f"\nCold start to first frame: {first_frame_time() * 1000:.0f} ms")
+        except Exception as e:
+            print(f"\nCould not build the page for timing: {str(e)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,34 @@
+"""Headless trading core: strategies, trade engine, data layer and pricing, shared by the strategy page and the GUI bots"""
+
+from .metrics import PerformanceAccumulator
+from .equity import EquityCurveRecorder
+from .fills import FillSimulator
+from .throttle import TokenBucket, SingleFlight, TTLCache
+from .brokers import Broker, BrokerError, FyersBroker, DhanBroker, FakeBroker, create_broker
+from .trailing import TrailingStopBook, StopUpdate
+from .pricehub import PriceHub, PriceSnapshot, PriceSeries
+from .snapshot_store import SnapshotStore, SnapshotReader
+from .indicators import (SessionVWAP, RollingSum, RollingSums, RollingMax, RollingMin, RollingMoments,
+                         RollingMomentsColumns)
+from .grid import GridBook, GridEngine
+from .options import IVRank, StrangleEngine, StranglePosition
+from .ml import FeatureCache, LinearModel, SklearnModel, OnnxModel, MLSignalEngine
+from .plan import IndicatorCache, StrategyPlan
+from .strategies import ProTraderStrategy, STRATEGY_TYPES, create_strategy, load_strategy_config
+from .market_data import MarketData
+from .trading import VirtualTrade, TradeManager
+from .autotrade import AutoTradingEngine
+from .scanner import StrategyScanner
+
+# TickScalper is not re-exported: importing protrader.scalping here would make
+# ``python -m protrader.scalping`` (its benchmark) run a second copy of the module
+__all__ = ["PerformanceAccumulator", "EquityCurveRecorder", "TrailingStopBook", "StopUpdate",
+           "FillSimulator", "Broker", "BrokerError", "FyersBroker", "DhanBroker", "FakeBroker",
+           "create_broker", "TokenBucket", "SingleFlight", "TTLCache", "PriceHub", "PriceSnapshot",
+           "PriceSeries", "SnapshotStore", "SnapshotReader", "SessionVWAP", "RollingSum",
+           "RollingSums", "RollingMax", "RollingMin", "RollingMoments", "RollingMomentsColumns",
+           "GridBook", "GridEngine", "IVRank", "StrangleEngine", "StranglePosition", "FeatureCache",
+           "LinearModel", "SklearnModel", "OnnxModel", "MLSignalEngine", "IndicatorCache",
+           "StrategyPlan", "ProTraderStrategy", "STRATEGY_TYPES", "create_strategy",
+           "load_strategy_config", "MarketData", "VirtualTrade", "TradeManager", "AutoTradingEngine",
+           "StrategyScanner"]
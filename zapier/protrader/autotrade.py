@@ -0,0 +1,170 @@
+import copy
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from .market_data import seconds_until_bar_close, closed_bars
+
+
+class AutoTradeSymbolContext:
+    """Auto-trading state for one symbol, kept apart from the UI selection"""
+
+    def __init__(self, symbol, strategy):
+        self.symbol = symbol
+        # Private copy so parameter edits in the UI never race with a running analysis
+        self.strategy = copy.deepcopy(strategy)
+        self.last_bar_time = None
+        self.last_signal = "NEUTRAL"
+        self.last_signal_bar = None
+        self.trades_opened = 0
+
+
+class AutoTradingEngine:
+    """Opens virtual trades from bar-close strategy signals, one context per symbol"""
+
+    def __init__(self, trade_manager, data_provider, strategy, symbols, timeframe="15M",
+                 max_open_trades=5, max_trades_per_symbol=1, sizing="notional",
+                 trade_size=10000, risk_per_trade=0.01, sl_percent=0.015, target_percent=0.03,
+                 instrument_resolver=None, on_trade=None):
+        self.trade_manager = trade_manager
+        self.data_provider = data_provider  # callable(symbol, timeframe) -> OHLCV DataFrame
+        self.timeframe = timeframe
+        self.contexts = {symbol: AutoTradeSymbolContext(symbol, strategy) for symbol in symbols}
+
+        # Position limits and sizing
+        self.max_open_trades = max_open_trades
+        self.max_trades_per_symbol = max_trades_per_symbol
+        self.sizing = sizing  # "notional" or "risk"
+        self.trade_size = trade_size
+        self.risk_per_trade = risk_per_trade
+        self.sl_percent = sl_percent
+        self.target_percent = target_percent
+
+        # callable(symbol, signal, price) -> (full_symbol, entry_price, trade_type)
+        self.instrument_resolver = instrument_resolver
+        self.on_trade = on_trade
+
+        self.active = False
+        self.thread = None
+        self._wake = threading.Event()  # Set by stop() to end the wait for the next bar close
+        self.signal_latencies_ms = deque(maxlen=500)
+
+    def start(self):
+        if self.active:
+            return
+        self.active = True
+        self._wake = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(self._wake,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.active = False
+        self._wake.set()
+
+    def _run(self, wake):
+        """Wake at every bar close and evaluate each symbol"""
+        while self.active:
+            if wake.wait(seconds_until_bar_close(self.timeframe) + 1) or not self.active:
+                break
+            for symbol in list(self.contexts):
+                try:
+                    data = self.data_provider(symbol, self.timeframe)
+                    self.on_bar_close(symbol, data)
+                except Exception as e:
+                    print(f"Auto-trading error for {symbol}: {str(e)}")
+
+    def on_bar_close(self, symbol, data):
+        """Evaluate the closed bar for a symbol and trade its signal. Returns the trade or None."""
+        context = self.contexts.get(symbol)
+        # The provider's last candle is usually the one that just opened
+        data = closed_bars(data, self.timeframe)
+        if context is None or data is None or data.empty:
+            return None
+
+        bar_time = data.index[-1]
+        if bar_time == context.last_bar_time:
+            return None
+        context.last_bar_time = bar_time
+
+        analyzed = context.strategy.analyze(data)
+        signal = context.strategy.get_last_signal(analyzed)
+        context.last_signal = signal
+        if signal not in ("BUY", "SELL"):
+            return None
+
+        signal_time = time.perf_counter()
+        context.last_signal_bar = bar_time
+        return self._execute_signal(context, signal, float(data['Close'].iloc[-1]), signal_time)
+
+    def _count_open(self, symbol=None):
+        open_trades = self.trade_manager.open_trades
+        if symbol is None:
+            return len(open_trades)
+        return sum(1 for t in open_trades if t.symbol.split(' ')[0] == symbol)
+
+    def _quantity(self, entry_price):
+        if self.sizing == "risk":
+            risk_amount = self.trade_manager.virtual_balance * self.risk_per_trade
+            return max(1, int(risk_amount / (entry_price * self.sl_percent)))
+        return max(1, int(self.trade_size / entry_price))
+
+    def _execute_signal(self, context, signal, price, signal_time):
+        symbol = context.symbol
+
+        if self._count_open() >= self.max_open_trades:
+            print(f"Maximum trades ({self.max_open_trades}) already reached. Skipping {symbol} {signal}.")
+            return None
+        if self._count_open(symbol) >= self.max_trades_per_symbol:
+            return None
+
+        if self.instrument_resolver:
+            full_symbol, entry_price, trade_type = self.instrument_resolver(symbol, signal, price)
+        else:
+            full_symbol, entry_price, trade_type = symbol, price, signal
+
+        qty = self._quantity(entry_price)
+        if entry_price * qty > self.trade_manager.virtual_balance:
+            print(f"Insufficient balance for auto-trade on {symbol}")
+            return None
+
+        if trade_type == "BUY":
+            stop_loss = entry_price * (1 - self.sl_percent)
+            target = entry_price * (1 + self.target_percent)
+        else:  # SELL
+            stop_loss = entry_price * (1 + self.sl_percent)
+            target = entry_price * (1 - self.target_percent)
+
+        self.signal_latencies_ms.append((time.perf_counter() - signal_time) * 1000)
+        success, trade = self.trade_manager.create_trade(
+            symbol=full_symbol,
+            trade_type=trade_type,
+            entry_price=entry_price,
+            qty=qty,
+            stop_loss=stop_loss,
+            target=target
+        )
+
+        if not success:
+            print(f"Failed to create auto-trade: {trade}")
+            return None
+
+        context.trades_opened += 1
+        print(f"Auto-trade created: {full_symbol} {trade_type} at {entry_price}")
+        if self.on_trade:
+            self.on_trade(context, trade)
+        return trade
+
+    def get_stats(self):
+        """Signal-to-order latency and per-symbol activity"""
+        latencies = list(self.signal_latencies_ms)
+        return {
+            "signals_traded": len(latencies),
+            "avg_latency_ms": float(np.mean(latencies)) if latencies else 0.0,
+            "max_latency_ms": float(np.max(latencies)) if latencies else 0.0,
+            "symbols": {
+                symbol: {"last_signal": c.last_signal, "trades_opened": c.trades_opened}
+                for symbol, c in self.contexts.items()
+            }
+        }
@@ -0,0 +1,536 @@
+import random
+import threading
+import time
+import zlib
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .throttle import SingleFlight, TokenBucket, TTLCache
+
+
+class BrokerError(Exception):
+    """A broker call failed after its retry budget, or the broker rejected it"""
+
+    def __init__(self, message, endpoint=None, status=None, payload=None):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status = status
+        self.payload = payload
+
+
+# timeout in seconds, extra attempts after the first, base backoff in seconds
+EndpointPolicy = namedtuple("EndpointPolicy", ["timeout", "retries", "backoff"])
+
+DEFAULT_POLICIES = {
+    "quote": EndpointPolicy(2.0, 2, 0.2),
+    "history": EndpointPolicy(10.0, 2, 0.5),
+    "positions": EndpointPolicy(5.0, 1, 0.5),
+    "funds": EndpointPolicy(5.0, 1, 0.5),
+    "profile": EndpointPolicy(5.0, 1, 0.5),
+    "orders": EndpointPolicy(5.0, 0, 0.0),  # Never retry: placing an order is not idempotent
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# endpoint -> (requests per second, burst); brokers override per their published limits
+DEFAULT_RATE_LIMITS = {
+    "quote": (10, 10),
+    "history": (1, 3),
+    "positions": (1, 2),
+    "funds": (1, 2),
+    "profile": (0.2, 1),
+    "orders": (10, 10),
+}
+
+# endpoint -> seconds a response is reused; orders are never cached
+DEFAULT_CACHE_TTLS = {
+    "quote": 1.0,
+    "history": 30.0,
+    "positions": 2.0,
+    "funds": 5.0,
+    "profile": 60.0,
+}
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(broker_name, endpoint, rate, burst):
+    """Process-wide token bucket per (broker, endpoint), shared by every adapter instance"""
+    key = (broker_name, endpoint)
+    with _buckets_lock:
+        if key not in _buckets:
+            _buckets[key] = TokenBucket(rate, burst)
+        return _buckets[key]
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_shared_session():
+    """Process-wide keep-alive session; connections are pooled per host
+
+    requests is imported here, on first use, so importing the adapters (and
+    building a FakeBroker) stays off the network stack's import cost.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def history_date(value):
+    """``YYYY-MM-DD`` for a date/datetime, as the history endpoints take it; strings pass through"""
+    return value.strftime("%Y-%m-%d") if hasattr(value, "strftime") else value
+
+
+class Broker:
+    """Common broker interface
+
+    Quotes are dicts with ``symbol``, ``ltp``, ``change``, ``change_percent``
+    and ``timestamp``; history is an OHLCV DataFrame indexed by time.
+    Every HTTP call goes through ``_request`` on the shared session, using
+    the timeout and retry budget of its endpoint, after taking a token from
+    the process-wide bucket for that endpoint.
+
+    Reads are served from a short-TTL cache, and concurrent identical reads
+    share one in-flight call, so many dashboards polling the same data cost
+    one request per TTL. Subclasses implement the underscored fetchers.
+    """
+
+    name = "base"
+    RATE_LIMITS = {}
+
+    def __init__(self, session=None, policies=None, cache_ttls=None):
+        self._session = session
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self.cache_ttls = dict(DEFAULT_CACHE_TTLS)
+        self.cache_ttls.update(cache_ttls or {})
+        self._cache = TTLCache(ttl=1.0)
+        self._flights = SingleFlight()
+
+    @property
+    def session(self):
+        """HTTP session, created on the first request rather than with the adapter"""
+        if self._session is None:
+            self._session = get_shared_session()
+        return self._session
+
+    def _rate_limiter(self, endpoint):
+        rate, burst = self.RATE_LIMITS.get(endpoint, DEFAULT_RATE_LIMITS[endpoint])
+        return get_rate_limiter(self.name, endpoint, rate, burst)
+
+    def _cached(self, endpoint, key, fn, *args):
+        """Serve from cache, else run fn once for all concurrent callers and cache the result"""
+        ttl = self.cache_ttls.get(endpoint)
+        cache_key = (endpoint, key)
+        if ttl:
+            value = self._cache.get(cache_key)
+            if value is not None:
+                return value
+        value = self._flights.do(cache_key, fn, *args)
+        if ttl:
+            self._cache.put(cache_key, value, ttl)
+        return value
+
+    def get_quote(self, symbol):
+        return self.get_quotes([symbol])[symbol]
+
+    def get_quotes(self, symbols):
+        quotes = {}
+        missing = []
+        for symbol in symbols:
+            quote = self._cache.get(("quote", symbol))
+            if quote is None:
+                missing.append(symbol)
+            else:
+                quotes[symbol] = dict(quote)
+        if missing:
+            fetched = self._flights.do(("quote", tuple(missing)), self._get_quotes, missing)
+            ttl = self.cache_ttls.get("quote")
+            for symbol, quote in fetched.items():
+                if ttl:
+                    self._cache.put(("quote", symbol), quote, ttl)
+                quotes[symbol] = dict(quote)
+        return quotes
+
+    def get_history(self, symbol, resolution, start, end):
+        # Keyed on the dates the adapters send, so datetime.now() with its microseconds still hits
+        return self._cached("history", (symbol, str(resolution), history_date(start), history_date(end)),
+                            self._get_history, symbol, resolution, start, end)
+
+    def get_positions(self):
+        return self._cached("positions", None, self._get_positions)
+
+    def get_funds(self):
+        return self._cached("funds", None, self._get_funds)
+
+    def get_profile(self):
+        return self._cached("profile", None, self._get_profile)
+
+    def place_order(self, symbol, side, qty, order_type="MARKET", price=None, product="INTRADAY"):
+        order_id = self._place_order(symbol, side, qty, order_type, price, product)
+        # Positions and funds change with every order
+        self._cache.clear()
+        return order_id
+
+    def _get_quotes(self, symbols):
+        raise NotImplementedError
+
+    def _get_history(self, symbol, resolution, start, end):
+        raise NotImplementedError
+
+    def _get_positions(self):
+        raise NotImplementedError
+
+    def _get_funds(self):
+        raise NotImplementedError
+
+    def _get_profile(self):
+        raise NotImplementedError
+
+    def _place_order(self, symbol, side, qty, order_type, price, product):
+        raise NotImplementedError
+
+    def _headers(self):
+        return {}
+
+    def _request(self, endpoint, method, url, **kwargs):
+        """Send one request with the endpoint's timeout and retry budget; returns parsed JSON"""
+        session = self.session
+        import requests  # loaded by get_shared_session, so only a module lookup here
+        policy = self.policies[endpoint]
+        limiter = self._rate_limiter(endpoint)
+        headers = self._headers()
+        headers.update(kwargs.pop("headers", {}))
+        last_error = None
+        for attempt in range(policy.retries + 1):
+            if attempt:
+                time.sleep(policy.backoff * (2 ** (attempt - 1)))
+            # Retries spend tokens too, so a failing broker isn't hammered
+            if not limiter.acquire(timeout=policy.timeout):
+                raise BrokerError(f"{self.name} {endpoint}: client-side rate limit", endpoint)
+            try:
+                response = session.request(method, url, headers=headers, timeout=policy.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = BrokerError(f"{self.name} {endpoint}: {e}", endpoint)
+                continue
+            if response.status_code in RETRY_STATUS:
+                last_error = BrokerError(f"{self.name} {endpoint}: HTTP {response.status_code}",
+                                         endpoint, response.status_code, response.text)
+                continue
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = None
+            if response.status_code >= 400:
+                raise BrokerError(f"{self.name} {endpoint}: HTTP {response.status_code}",
+                                  endpoint, response.status_code, payload or response.text)
+            return payload
+        raise last_error
+
+
+def fyers_symbol(symbol):
+    """Map a plain symbol (NIFTY, RELIANCE) to its Fyers ticker"""
+    if ":" in symbol:
+        return symbol
+    index_symbols = {
+        "NIFTY": "NSE:NIFTY50-INDEX",
+        "NIFTY50": "NSE:NIFTY50-INDEX",
+        "BANKNIFTY": "NSE:NIFTYBANK-INDEX",
+        "FINNIFTY": "NSE:FINNIFTY-INDEX",
+        "SENSEX": "BSE:SENSEX-INDEX"
+    }
+    return index_symbols.get(symbol, f"NSE:{symbol}-EQ")
+
+
+class FyersBroker(Broker):
+    """Fyers API v3 over the shared session"""
+
+    name = "fyers"
+    API_URL = "https://api-t1.fyers.in/api/v3"
+    DATA_URL = "https://api-t1.fyers.in/data"
+
+    def __init__(self, client_id, access_token, session=None, policies=None, cache_ttls=None):
+        super().__init__(session, policies, cache_ttls)
+        self.client_id = client_id
+        self.access_token = access_token
+
+    def _headers(self):
+        return {"Authorization": f"{self.client_id}:{self.access_token}"}
+
+    def _ok(self, endpoint, payload):
+        if not isinstance(payload, dict) or payload.get("s") != "ok":
+            message = payload.get("message", payload) if isinstance(payload, dict) else payload
+            raise BrokerError(f"fyers {endpoint}: {message}", endpoint, payload=payload)
+        return payload
+
+    def _get_quotes(self, symbols):
+        tickers = {fyers_symbol(s): s for s in symbols}
+        payload = self._ok("quote", self._request(
+            "quote", "GET", f"{self.DATA_URL}/quotes", params={"symbols": ",".join(tickers)}))
+        quotes = {}
+        for item in payload.get("d", []):
+            values = item.get("v", {})
+            symbol = tickers.get(item.get("n"), item.get("n"))
+            quotes[symbol] = {
+                "symbol": symbol,
+                "ltp": float(values.get("lp", 0)),
+                "change": float(values.get("ch", 0)),
+                "change_percent": float(values.get("chp", 0)),
+                "timestamp": values.get("tt")
+            }
+        return quotes
+
+    def _get_history(self, symbol, resolution, start, end):
+        payload = self._ok("history", self._request("history", "GET", f"{self.DATA_URL}/history", params={
+            "symbol": fyers_symbol(symbol),
+            "resolution": resolution,
+            "date_format": "1",
+            "range_from": history_date(start),
+            "range_to": history_date(end),
+            "cont_flag": "1"
+        }))
+        # Fyers returns [timestamp, open, high, low, close, volume]
+        df = pd.DataFrame(payload.get("candles", []), columns=["Timestamp", "Open", "High", "Low", "Close", "Volume"])
+        df.index = pd.to_datetime(df.pop("Timestamp"), unit="s")
+        df.index.name = "Date"
+        return df
+
+    def _get_positions(self):
+        return self._ok("positions", self._request("positions", "GET", f"{self.API_URL}/positions")).get("netPositions", [])
+
+    def _get_funds(self):
+        return self._ok("funds", self._request("funds", "GET", f"{self.API_URL}/funds")).get("fund_limit", [])
+
+    def _get_profile(self):
+        return self._ok("profile", self._request("profile", "GET", f"{self.API_URL}/profile")).get("data", {})
+
+    def _place_order(self, symbol, side, qty, order_type, price, product):
+        payload = self._ok("orders", self._request("orders", "POST", f"{self.API_URL}/orders/sync", json={
+            "symbol": fyers_symbol(symbol),
+            "qty": int(qty),
+            "type": 2 if order_type == "MARKET" else 1,
+            "side": 1 if side == "BUY" else -1,
+            "productType": product,
+            "limitPrice": price or 0,
+            "stopPrice": 0,
+            "validity": "DAY",
+            "disclosedQty": 0,
+            "offlineOrder": False
+        }))
+        return payload.get("id")
+
+
+# Plain symbol -> (exchange segment, security id)
+DHAN_SECURITIES = {
+    "NIFTY": ("IDX_I", "13"),
+    "BANKNIFTY": ("IDX_I", "25"),
+    "FINNIFTY": ("IDX_I", "27"),
+    "SENSEX": ("IDX_I", "51")
+}
+
+
+def dhan_security(symbol):
+    """Resolve a plain symbol or 'SEGMENT:security_id' to a Dhan (segment, id) pair"""
+    if ":" in symbol:
+        segment, security_id = symbol.split(":", 1)
+        return segment, security_id
+    if symbol in DHAN_SECURITIES:
+        return DHAN_SECURITIES[symbol]
+    if str(symbol).isdigit():
+        return "NSE_EQ", str(symbol)
+    raise BrokerError(f"dhan: no security id for {symbol}")
+
+
+class DhanBroker(Broker):
+    """Dhan API v2 over the shared session"""
+
+    name = "dhan"
+    API_URL = "https://api.dhan.co/v2"
+    # Dhan allows one market-quote request per second
+    RATE_LIMITS = {"quote": (1, 1)}
+
+    def __init__(self, client_id, access_token, session=None, policies=None, cache_ttls=None):
+        super().__init__(session, policies, cache_ttls)
+        self.client_id = client_id
+        self.access_token = access_token
+
+    def _headers(self):
+        return {
+            "access-token": self.access_token,
+            "client-id": self.client_id,
+            "Accept": "application/json"
+        }
+
+    def _get_quotes(self, symbols):
+        request = {}
+        for symbol in symbols:
+            segment, security_id = dhan_security(symbol)
+            request.setdefault(segment, []).append(int(security_id))
+        payload = self._request("quote", "POST", f"{self.API_URL}/marketfeed/quote", json=request)
+        if not isinstance(payload, dict) or payload.get("status") != "success":
+            raise BrokerError(f"dhan quote: {payload}", "quote", payload=payload)
+
+        data = payload.get("data", {})
+        quotes = {}
+        for symbol in symbols:
+            segment, security_id = dhan_security(symbol)
+            values = data.get(segment, {}).get(str(security_id), {})
+            ltp = float(values.get("last_price", 0))
+            change = float(values.get("net_change", 0))
+            previous = ltp - change
+            quotes[symbol] = {
+                "symbol": symbol,
+                "ltp": ltp,
+                "change": change,
+                "change_percent": (change / previous * 100) if previous else 0.0,
+                "timestamp": values.get("last_trade_time")
+            }
+        return quotes
+
+    def _get_history(self, symbol, resolution, start, end):
+        segment, security_id = dhan_security(symbol)
+        daily = str(resolution).upper() in ("D", "1D")
+        body = {
+            "securityId": str(security_id),
+            "exchangeSegment": segment,
+            "instrument": "INDEX" if segment == "IDX_I" else "EQUITY",
+            "fromDate": history_date(start),
+            "toDate": history_date(end)
+        }
+        if not daily:
+            body["interval"] = str(resolution)
+        url = f"{self.API_URL}/charts/{'historical' if daily else 'intraday'}"
+        payload = self._request("history", "POST", url, json=body) or {}
+        df = pd.DataFrame({
+            "Open": payload.get("open", []),
+            "High": payload.get("high", []),
+            "Low": payload.get("low", []),
+            "Close": payload.get("close", []),
+            "Volume": payload.get("volume", [])
+        }, index=pd.to_datetime(payload.get("timestamp", []), unit="s"))
+        df.index.name = "Date"
+        return df
+
+    def _get_positions(self):
+        return self._request("positions", "GET", f"{self.API_URL}/positions") or []
+
+    def _get_funds(self):
+        return self._request("funds", "GET", f"{self.API_URL}/fundlimit") or {}
+
+    def _get_profile(self):
+        return self._request("profile", "GET", f"{self.API_URL}/profile") or {}
+
+    def _place_order(self, symbol, side, qty, order_type, price, product):
+        segment, security_id = dhan_security(symbol)
+        payload = self._request("orders", "POST", f"{self.API_URL}/orders", json={
+            "dhanClientId": self.client_id,
+            "transactionType": side,
+            "exchangeSegment": segment,
+            "productType": product,
+            "orderType": order_type,
+            "validity": "DAY",
+            "securityId": str(security_id),
+            "quantity": int(qty),
+            "price": price or 0
+        })
+        return (payload or {}).get("orderId")
+
+
+class FakeBroker(Broker):
+    """In-memory broker for offline runs and tests; prices follow a seeded random walk"""
+
+    name = "fake"
+
+    def __init__(self, prices=None, balance=1000000, seed=0, volatility=0.0005):
+        super().__init__()
+        self.prices = dict(prices or {"NIFTY": 22450.75, "BANKNIFTY": 47325.50,
+                                      "FINNIFTY": 21150.25, "SENSEX": 74125.80})
+        self.opening = dict(self.prices)
+        self.balance = balance
+        self.volatility = volatility
+        self.positions = {}
+        self.orders = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _tick(self, symbol):
+        price = self.prices.setdefault(symbol, 1000.0)
+        self.opening.setdefault(symbol, price)
+        price *= 1 + self._rng.gauss(0, self.volatility)
+        self.prices[symbol] = price
+        return price
+
+    def _get_quotes(self, symbols):
+        quotes = {}
+        with self._lock:
+            for symbol in symbols:
+                ltp = self._tick(symbol)
+                change = ltp - self.opening[symbol]
+                quotes[symbol] = {
+                    "symbol": symbol,
+                    "ltp": ltp,
+                    "change": change,
+                    "change_percent": change / self.opening[symbol] * 100,
+                    "timestamp": int(time.time())
+                }
+        return quotes
+
+    def _get_history(self, symbol, resolution, start, end):
+        freq = "1D" if str(resolution).upper() in ("D", "1D") else f"{int(resolution)}min"
+        index = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq=freq)
+        rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+        close = self.prices.get(symbol, 1000.0) * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+        open_ = np.r_[close[:1], close[:-1]]
+        return pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, close) * 1.001,
+            "Low": np.minimum(open_, close) * 0.999,
+            "Close": close,
+            "Volume": rng.integers(1000, 100000, len(index))
+        }, index=index.rename("Date"))
+
+    def _get_positions(self):
+        with self._lock:
+            return [dict(symbol=s, qty=q) for s, q in self.positions.items() if q]
+
+    def _get_funds(self):
+        return {"available_balance": self.balance}
+
+    def _get_profile(self):
+        return {"name": "Paper Trader", "broker": self.name}
+
+    def _place_order(self, symbol, side, qty, order_type, price, product):
+        with self._lock:
+            fill = price if order_type != "MARKET" and price else self.prices.get(symbol) or self._tick(symbol)
+            signed = qty if side == "BUY" else -qty
+            self.positions[symbol] = self.positions.get(symbol, 0) + signed
+            self.balance -= signed * fill
+            order_id = f"FAKE-{len(self.orders) + 1}"
+            self.orders.append({"id": order_id, "symbol": symbol, "side": side, "qty": qty,
+                                "price": fill, "time": datetime.now()})
+        return order_id
+
+
+BROKERS = {"fyers": FyersBroker, "dhan": DhanBroker, "fake": FakeBroker}
+
+
+def create_broker(name, **kwargs):
+    """Build a broker adapter by name ("fyers", "dhan" or "fake")"""
+    try:
+        return BROKERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown broker: {name}")
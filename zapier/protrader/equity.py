@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+# One OHLC bar of account equity; used for both minute and day files
+EQUITY_BAR_DTYPE = np.dtype([
+    ("time", "<f8"),     # Bucket start, epoch seconds
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("samples", "<u4"),
+])
+
+RESOLUTION_SECONDS = {"minute": 60, "day": 86400}
+
+
+class _BarRoller:
+    """Accumulates samples into fixed buckets and appends finished bars to a binary file"""
+
+    def __init__(self, path, bucket_seconds):
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self.current = None  # Open bar, a 1-element structured array
+        self._resumed = False
+
+    def _resume(self, bucket):
+        """Reopen the last stored bar if it is still in ``bucket`` (a restart within the same minute/day)
+
+        The bar is cut off the file and becomes the open bar again, so the
+        flush after this run writes one merged record with the original open.
+        """
+        self._resumed = True
+        if not (self.path and os.path.exists(self.path)):
+            return
+        size = os.path.getsize(self.path)
+        itemsize = EQUITY_BAR_DTYPE.itemsize
+        if size < itemsize:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(size - size % itemsize - itemsize)
+            last = np.fromfile(f, dtype=EQUITY_BAR_DTYPE, count=1)
+        if len(last) and last["time"][0] == bucket:
+            os.truncate(self.path, size - size % itemsize - itemsize)
+            self.current = last
+
+    def add(self, ts, value):
+        bucket = ts - (ts % self.bucket_seconds)
+        if not self._resumed:
+            self._resume(bucket)
+        bar = self.current
+        if bar is not None and bar["time"][0] == bucket:
+            bar["high"][0] = max(bar["high"][0], value)
+            bar["low"][0] = min(bar["low"][0], value)
+            bar["close"][0] = value
+            bar["samples"][0] += 1
+            return
+        if bar is not None:
+            self.flush()
+        self.current = np.array([(bucket, value, value, value, value, 1)], dtype=EQUITY_BAR_DTYPE)
+
+    def flush(self):
+        """Append the open bar to disk and start over"""
+        if self.current is None:
+            return
+        if self.path:
+            with open(self.path, "ab") as f:
+                self.current.tofile(f)
+        self.current = None
+
+    def load(self, start, end):
+        """Bars with start <= time <= end, from disk plus the open bar"""
+        bars = np.empty(0, dtype=EQUITY_BAR_DTYPE)
+        if self.path and os.path.exists(self.path) and os.path.getsize(self.path):
+            stored = np.memmap(self.path, dtype=EQUITY_BAR_DTYPE, mode="r")
+            # Bars are appended in time order, so bisect instead of scanning
+            lo = np.searchsorted(stored["time"], start, side="left")
+            hi = np.searchsorted(stored["time"], end, side="right")
+            bars = np.array(stored[lo:hi])
+            del stored
+        if self.current is not None and start <= self.current["time"][0] <= end:
+            bars = np.concatenate([bars, self.current])
+        return bars
+
+
+class EquityCurveRecorder:
+    """Mark-to-market equity samples in a numpy ring buffer, rolled into minute/day bars on disk
+
+    Raw samples live in two preallocated float64 arrays (no Python object per
+    sample). Each sample also updates the open minute and day bars; finished
+    bars are appended to ``equity_minute.bin`` / ``equity_day.bin`` as packed
+    records, which are memory-mapped and bisected for range queries.
+    """
+
+    def __init__(self, directory="equity_data", capacity=86400):
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._head = 0   # Next write position
+        self._count = 0
+        self._lock = threading.Lock()
+
+        minute_path = day_path = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            minute_path = os.path.join(directory, "equity_minute.bin")
+            day_path = os.path.join(directory, "equity_day.bin")
+        self._rollers = {
+            "minute": _BarRoller(minute_path, RESOLUTION_SECONDS["minute"]),
+            "day": _BarRoller(day_path, RESOLUTION_SECONDS["day"]),
+        }
+
+    def __len__(self):
+        return self._count
+
+    def record(self, equity, ts=None):
+        """Add one equity sample (ts in epoch seconds, defaults to now)"""
+        ts = time.time() if ts is None else float(ts)
+        with self._lock:
+            self._times[self._head] = ts
+            self._values[self._head] = equity
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            for roller in self._rollers.values():
+                roller.add(ts, equity)
+
+    def last(self):
+        """Most recent (time, equity) sample or None"""
+        with self._lock:
+            if not self._count:
+                return None
+            i = (self._head - 1) % self.capacity
+            return self._times[i], self._values[i]
+
+    def _raw(self):
+        """Ring contents in time order, as copies"""
+        if self._count < self.capacity:
+            return self._times[:self._count].copy(), self._values[:self._count].copy()
+        order = np.r_[self._head:self.capacity, 0:self._head]
+        return self._times[order], self._values[order]
+
+    def query(self, start=None, end=None, resolution="raw"):
+        """Return (times, equity) arrays for the range
+
+        ``resolution`` is "raw" (ring buffer samples), "minute" or "day"
+        (bar close values). Times are epoch seconds; for bars they are the
+        bucket start.
+        """
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        with self._lock:
+            if resolution == "raw":
+                times, values = self._raw()
+                lo = np.searchsorted(times, start, side="left")
+                hi = np.searchsorted(times, end, side="right")
+                return times[lo:hi], values[lo:hi]
+            bars = self._rollers[resolution].load(start, end)
+        return bars["time"], bars["close"]
+
+    def query_bars(self, start=None, end=None, resolution="minute"):
+        """Return the full OHLC bar records for the range"""
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        with self._lock:
+            return self._rollers[resolution].load(start, end)
+
+    def flush(self):
+        """Write any open bars to disk (e.g. at shutdown)"""
+        with self._lock:
+            for roller in self._rollers.values():
+                roller.flush()
@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+from .metrics import PerformanceAccumulator
+
+FILL_MODES = ("last", "ohlc", "ticks")
+FILL_PATHS = ("auto", "OHLC", "OLHC", "worst")
+
+
+def bar_close(bar):
+    """Last traded price of a bar given as a price, an (o, h, l, c) tuple or a tick array"""
+    if np.ndim(bar) == 0:
+        return float(bar)
+    return float(np.asarray(bar, dtype=np.float64)[-1])
+
+
+class FillSimulator:
+    """Decides whether stops/targets fill inside a bar, and at what price
+
+    Modes:
+        last  - only the bar's last price is known (what the live poller sees)
+        ohlc  - walk an assumed intrabar path through open/high/low/close
+        ticks - replay the actual tick sequence of the bar
+
+    OHLC paths: "OHLC" visits the high first, "OLHC" the low first, "auto"
+    picks OLHC for up bars and OHLC for down bars, and "worst" always lets
+    the stop win when both levels are inside the range.
+
+    A bar that opens through a stop fills at the open (gap-through), not at
+    the stop. Stop fills are market orders and pay ``slippage_bps``;
+    targets are limit orders and fill at the target or at a better open.
+    Everything broadcasts, so one call can price many trades against one
+    bar (live) or one trade against many bars (backtests).
+    """
+
+    def __init__(self, mode="ohlc", path="auto", slippage_bps=0.0, tick_size=0.0):
+        if mode not in FILL_MODES:
+            raise ValueError(f"Unknown fill mode: {mode}")
+        if path not in FILL_PATHS:
+            raise ValueError(f"Unknown OHLC path: {path}")
+        self.mode = mode
+        self.path = path
+        self.slippage_bps = slippage_bps
+        self.tick_size = tick_size
+
+    def slip(self, price, side):
+        """Move a market-order price against the trade by the configured slippage"""
+        price = np.asarray(price, dtype=np.float64)
+        slipped = price * (1.0 - np.asarray(side) * self.slippage_bps / 10000.0)
+        if self.tick_size:
+            # Round away from the trade (down for sells of a long, up for buys back of a short)
+            ticks = slipped / self.tick_size
+            slipped = np.where(np.asarray(side) > 0, np.floor(ticks), np.ceil(ticks)) * self.tick_size
+        return slipped
+
+    def entry_price(self, price, side):
+        """Fill price for a market entry (slippage works against the entry side)"""
+        return self.slip(price, -np.asarray(side))
+
+    def resolve(self, side, stop, target, bar):
+        """Exit check for one bar; returns (hit, exit_price, is_stop) arrays
+
+        ``side`` is +1 for BUY and -1 for SELL; NaN stop/target means none.
+        ``bar`` is a price, an (o, h, l, c) tuple or a tick array. The
+        configured mode is used when the bar carries enough detail, else the
+        best available one.
+        """
+        side = np.asarray(side, dtype=np.float64)
+        stop = np.asarray(stop, dtype=np.float64)
+        target = np.asarray(target, dtype=np.float64)
+        if np.ndim(bar) == 0 or self.mode == "last":
+            return self._resolve_last(side, stop, target, bar_close(bar))
+        bar = np.asarray(bar, dtype=np.float64)
+        if self.mode == "ohlc" and len(bar) == 4:
+            o, h, l, c = bar
+            return self.resolve_ohlc(side, stop, target, o, h, l, c)
+        return self._resolve_ticks(side, stop, target, bar)
+
+    def _resolve_last(self, side, stop, target, price):
+        stop_hit = side * (price - stop) <= 0
+        target_hit = ~stop_hit & (side * (price - target) >= 0)
+        hit = stop_hit | target_hit
+        exit_price = np.where(stop_hit, self.slip(price, side), price)
+        return hit, exit_price, stop_hit
+
+    def resolve_ohlc(self, side, stop, target, o, h, l, c):
+        """Vectorized OHLC exit check; any argument may be an array"""
+        side = np.asarray(side, dtype=np.float64)
+        buy = side > 0
+        adverse = np.where(buy, l, h)
+        favourable = np.where(buy, h, l)
+
+        gap_stop = side * (o - stop) <= 0
+        gap_target = ~gap_stop & (side * (o - target) >= 0)
+        stop_hit = side * (adverse - stop) <= 0
+        target_hit = side * (favourable - target) >= 0
+
+        # Which level the assumed path reaches first when both are inside the range
+        if self.path == "worst":
+            target_first = np.zeros(np.broadcast(side, o).shape, dtype=bool)
+        else:
+            if self.path == "OHLC":
+                high_first = np.ones(np.shape(o), dtype=bool)
+            elif self.path == "OLHC":
+                high_first = np.zeros(np.shape(o), dtype=bool)
+            else:  # auto
+                high_first = np.asarray(c) < np.asarray(o)
+            target_first = np.where(buy, high_first, ~high_first)
+
+        is_stop = gap_stop | (~gap_target & stop_hit & ~(target_hit & target_first))
+        is_target = ~is_stop & (gap_target | target_hit)
+        hit = is_stop | is_target
+
+        stop_price = np.where(gap_stop, o, stop)
+        target_price = np.where(gap_target, o, target)
+        exit_price = np.where(is_stop, self.slip(stop_price, side), target_price)
+        return hit, exit_price, is_stop
+
+    def _resolve_ticks(self, side, stop, target, ticks):
+        # trades x ticks crossing masks; argmax finds the first crossing per trade
+        s = np.atleast_1d(side)[:, None]
+        stop_cross = s * (ticks[None, :] - np.atleast_1d(stop)[:, None]) <= 0
+        target_cross = s * (ticks[None, :] - np.atleast_1d(target)[:, None]) >= 0
+        n_ticks = len(ticks)
+        first_stop = np.where(stop_cross.any(axis=1), stop_cross.argmax(axis=1), n_ticks)
+        first_target = np.where(target_cross.any(axis=1), target_cross.argmax(axis=1), n_ticks)
+
+        is_stop = first_stop <= first_target
+        hit = np.minimum(first_stop, first_target) < n_ticks
+        is_stop &= hit
+        fill_tick = ticks[np.minimum(np.minimum(first_stop, first_target), n_ticks - 1)]
+        exit_price = np.where(is_stop, self.slip(fill_tick, np.atleast_1d(side)), fill_tick)
+        shape = np.shape(side)
+        return hit.reshape(shape), exit_price.reshape(shape), is_stop.reshape(shape)
+
+    def first_exit(self, side, stop, target, o, h, l, c, start=0, chunk=64):
+        """First bar index >= start where a fixed stop/target fills
+
+        Scans in doubling windows so short holds don't pay for the whole
+        series. Returns (index, exit_price, is_stop) or (None, None, None).
+        """
+        n = len(c)
+        while start < n:
+            end = min(n, start + chunk)
+            hit, price, is_stop = self.resolve_ohlc(
+                side, stop, target, o[start:end], h[start:end], l[start:end], c[start:end]
+            ) if self.mode != "last" else self._resolve_last(side, stop, target, c[start:end])
+            if hit.any():
+                i = int(hit.argmax())
+                return start + i, float(price[i]), bool(is_stop[i])
+            start = end
+            chunk *= 2
+        return None, None, None
+
+    def backtest(self, data, sl_percent=0.015, target_percent=0.03, initial_capital=100000, qty=1):
+        """Trade a strategy's Buy_Signal/Sell_Signal columns bar by bar
+
+        Entries fill at the next bar's open (with slippage); one position at
+        a time; exits through ``first_exit``, or at the last close. Returns
+        (trades DataFrame, metrics summary dict).
+        """
+        o = data['Open'].to_numpy(dtype=np.float64)
+        h = data['High'].to_numpy(dtype=np.float64)
+        l = data['Low'].to_numpy(dtype=np.float64)
+        c = data['Close'].to_numpy(dtype=np.float64)
+        buy = data['Buy_Signal'].to_numpy() == 1 if 'Buy_Signal' in data else np.zeros(len(c), dtype=bool)
+        sell = data['Sell_Signal'].to_numpy() == 1 if 'Sell_Signal' in data else np.zeros(len(c), dtype=bool)
+        signal_bars = np.flatnonzero(buy | sell)
+
+        performance = PerformanceAccumulator(initial_capital)
+        trades = []
+        next_free = 0
+        for bar in signal_bars:
+            entry_bar = bar + 1
+            if entry_bar < next_free or entry_bar >= len(c):
+                continue
+            side = 1.0 if buy[bar] else -1.0
+            entry = float(self.entry_price(o[entry_bar], side))
+            stop = entry * (1 - side * sl_percent)
+            target = entry * (1 + side * target_percent)
+
+            exit_bar, exit_price, is_stop = self.first_exit(side, stop, target, o, h, l, c, start=entry_bar)
+            if exit_bar is None:
+                exit_bar, exit_price, status = len(c) - 1, c[-1], "END"
+            else:
+                status = "SL_HIT" if is_stop else "TARGET_HIT"
+
+            pnl = side * (exit_price - entry) * qty
+            performance.record(pnl)
+            trades.append({
+                "entry_time": data.index[entry_bar],
+                "exit_time": data.index[exit_bar],
+                "trade_type": "BUY" if side > 0 else "SELL",
+                "entry_price": entry,
+                "exit_price": exit_price,
+                "status": status,
+                "pnl": pnl,
+            })
+            next_free = exit_bar + 1
+
+        return pd.DataFrame(trades), performance.summary()
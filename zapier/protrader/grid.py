@@ -0,0 +1,188 @@
+import numpy as np
+
+BUY = 1
+SELL = -1
+
+
+class GridBook:
+    """Grid levels and pending virtual orders for one symbol
+
+    Levels are a sorted array ``base + step * k``. The grid is neutral:
+    every level below the anchor (the last filled level) holds a BUY, every
+    level above holds a SELL, and the anchor itself is empty. A price move
+    is matched against the levels by bisection, so the cost depends on the
+    number of levels crossed, never on the size of the grid.
+
+    A BUY at level i closes the short opened at level i + 1 if there is
+    one, otherwise opens a long at i; SELLs mirror that. ``positions`` holds
+    the trade ID opened at each level.
+    """
+
+    def __init__(self, symbol, center, spacing_pct=0.5, levels=5):
+        self.symbol = symbol
+        self.half = int(levels)
+        self.step = center * spacing_pct / 100.0
+        k = np.arange(-self.half, self.half + 1, dtype=np.float64)
+        self.levels = center + self.step * k
+        self.sides = np.zeros(len(self.levels), dtype=np.int8)
+        self.positions = np.full(len(self.levels), None, dtype=object)
+        self.position_sides = np.zeros(len(self.levels), dtype=np.int8)
+        self.last_price = float(center)
+        self._set_anchor(self.half, 0, len(self.levels) - 1)
+
+    def _set_anchor(self, anchor, lo, hi):
+        """Re-derive pending order sides for levels lo..hi around a new anchor"""
+        self.anchor = anchor
+        idx = np.arange(lo, hi + 1)
+        self.sides[lo:hi + 1] = np.where(idx < anchor, BUY, np.where(idx > anchor, SELL, 0))
+
+    def cross(self, price):
+        """Fills for a move from the last price to ``price``: (level indexes in hit order, side)"""
+        price = float(price)
+        p0, self.last_price = self.last_price, price
+        levels = self.levels
+        if price < p0:
+            # Falling: buy limits at levels in [price, p0)
+            lo = np.searchsorted(levels, price, side="left")
+            hi = np.searchsorted(levels, p0, side="left")
+            hit = np.arange(hi - 1, lo - 1, -1)
+            side = BUY
+        elif price > p0:
+            # Rising: sell limits at levels in (p0, price]
+            lo = np.searchsorted(levels, p0, side="right")
+            hi = np.searchsorted(levels, price, side="right")
+            hit = np.arange(lo, hi)
+            side = SELL
+        else:
+            return np.empty(0, dtype=np.intp), 0
+
+        hit = hit[self.sides[hit] == side]
+        if len(hit):
+            old, new = self.anchor, int(hit[-1])
+            self._set_anchor(new, min(old, new), max(old, new))
+        return hit, side
+
+    def level_index(self, level_price):
+        """Index of the level at ``level_price``, or None if it is no longer on the grid"""
+        i = int(round((level_price - self.levels[0]) / self.step))
+        return i if 0 <= i < len(self.levels) else None
+
+    def out_of_range(self, price):
+        return price < self.levels[0] or price > self.levels[-1]
+
+    def recenter(self, price):
+        """Shift the grid by whole steps so ``price`` sits in the middle
+
+        Levels keep their spacing, so positions move with their level;
+        returns the (level price, trade_id) of positions shifted off the grid.
+        """
+        center_index = self.half
+        shift = int(round((price - self.levels[center_index]) / self.step))
+        if shift == 0:
+            return []
+        n = len(self.levels)
+        anchor_price = self.levels[self.anchor]
+        # Positions whose level leaves the grid
+        gone = np.arange(0, min(shift, n)) if shift > 0 else np.arange(max(n + shift, 0), n)
+        dropped = [(float(self.levels[i]), self.positions[i]) for i in gone if self.positions[i] is not None]
+
+        positions = np.full(n, None, dtype=object)
+        position_sides = np.zeros(n, dtype=np.int8)
+        if abs(shift) < n:
+            if shift > 0:
+                positions[:n - shift] = self.positions[shift:]
+                position_sides[:n - shift] = self.position_sides[shift:]
+            else:
+                positions[-shift:] = self.positions[:n + shift]
+                position_sides[-shift:] = self.position_sides[:n + shift]
+        self.positions = positions
+        self.position_sides = position_sides
+        self.levels = self.levels + shift * self.step
+
+        # Keep the last filled level as the anchor if it is still on the grid
+        self.last_price = float(price)
+        anchor = self.level_index(anchor_price)
+        if anchor is None:
+            anchor = int(np.clip(np.searchsorted(self.levels, price), 0, n - 1))
+        self._set_anchor(anchor, 0, n - 1)
+        return dropped
+
+
+class GridEngine:
+    """Runs GridBooks for many symbols and books their fills through a TradeManager
+
+    ``on_prices`` crosses every symbol's move against its grid, turns the
+    fills into open/close orders and sends all of them to
+    ``trade_manager.execute_batch`` as a single write. Grids that the price
+    left are re-centred after the fills are booked, so positions opened on
+    the way out are tracked and closed with the rest (GRID_RECENTER, a
+    second write on those ticks only).
+    """
+
+    def __init__(self, trade_manager, spacing_pct=0.5, levels=5, qty=100):
+        self.trade_manager = trade_manager
+        self.spacing_pct = spacing_pct
+        self.levels = levels
+        self.qty = qty
+        self.books = {}
+
+    def add_symbol(self, symbol, center):
+        self.books[symbol] = GridBook(symbol, center, self.spacing_pct, self.levels)
+        return self.books[symbol]
+
+    def remove_symbol(self, symbol, price):
+        """Stop gridding a symbol and close its open grid positions at ``price``"""
+        book = self.books.pop(symbol, None)
+        if book is None:
+            return []
+        orders = [("close", trade_id, price, "GRID_STOP") for trade_id in book.positions if trade_id is not None]
+        return self.trade_manager.execute_batch(orders) if orders else []
+
+    def on_prices(self, prices):
+        """Process {symbol: last price}; returns the execute_batch results"""
+        orders = []
+        pending = []   # (book, level index, side, trade_id) per order; trade_id is None for opens
+        recenter = []  # (book, price) of grids the price has left
+
+        for symbol, price in prices.items():
+            book = self.books.get(symbol)
+            if book is None or price is None:
+                continue
+            hit, side = book.cross(price)
+            for i in hit:
+                self._fill(book, int(i), side, orders, pending)
+            if book.out_of_range(price):
+                recenter.append((book, price))
+
+        results = self.trade_manager.execute_batch(orders) if orders else []
+
+        # Levels have not moved yet, so every result maps back to its level index
+        for (book, i, side, trade_id), (ok, view) in zip(pending, results):
+            if trade_id is None:
+                if ok:
+                    book.positions[i] = view.trade_id
+                    book.position_sides[i] = side
+            elif not ok:
+                # The take-profit close was rejected: keep tracking the position
+                book.positions[i] = trade_id
+                book.position_sides[i] = side
+
+        closes = [("close", trade_id, price, "GRID_RECENTER")
+                  for book, price in recenter for _, trade_id in book.recenter(price)]
+        if closes:
+            results = results + self.trade_manager.execute_batch(closes)
+        return results
+
+    def _fill(self, book, i, side, orders, pending):
+        """Turn one level fill into an order: close the adjacent opposite position, else open"""
+        level_price = float(book.levels[i])
+        j = i + side  # BUY pairs with the short one level up, SELL with the long one level down
+        if 0 <= j < len(book.levels) and book.positions[j] is not None and book.position_sides[j] == -side:
+            orders.append(("close", book.positions[j], level_price, "GRID_TAKE_PROFIT"))
+            pending.append((book, j, -side, book.positions[j]))
+            book.positions[j] = None
+            book.position_sides[j] = 0
+        else:
+            trade_type = "BUY" if side == BUY else "SELL"
+            orders.append(("open", book.symbol, trade_type, level_price, self.qty))
+            pending.append((book, i, side, None))
@@ -0,0 +1,376 @@
+from collections import deque
+
+import numpy as np
+
+IST_OFFSET = 19800                  # IST = UTC + 5:30, in seconds
+SESSION_OPEN = 9 * 3600 + 15 * 60   # NSE cash session opens at 09:15 IST
+SESSION_CLOSE = 15 * 3600 + 30 * 60  # and closes at 15:30 IST
+
+
+def epoch_seconds(index):
+    """Epoch seconds (int64) for a DatetimeIndex; naive timestamps are taken as UTC, like broker candles"""
+    return np.asarray(index.values).astype("datetime64[s]").astype(np.int64)
+
+
+def session_key(ts):
+    """Session number of one epoch-seconds timestamp; sessions roll over at 09:15 IST"""
+    return (int(ts) + IST_OFFSET - SESSION_OPEN) // 86400
+
+
+def session_keys(times):
+    """Vectorized ``session_key``"""
+    return (np.asarray(times, dtype=np.int64) + IST_OFFSET - SESSION_OPEN) // 86400
+
+
+def _block_prefix(values, window):
+    """Running totals restarted every ``window`` values, and each block's total
+
+    Window sums are built from one block's prefix and the tail of the block
+    before it, so no total ever spans more than two windows and rounding
+    error depends on the window, not on how long the series has run.
+    """
+    n = len(values)
+    blocks = -(-n // window)
+    padded = np.zeros(blocks * window)
+    padded[:n] = values
+    prefix = np.cumsum(padded.reshape(blocks, window), axis=1)
+    return prefix.ravel()[:n], prefix[:, -1]
+
+
+def _previous_block_part(prefix, block_totals, window):
+    """For every i >= window - 1: the part of i's window that lies in the previous block
+
+    That is the previous block's total minus its prefix at i - window (zero
+    for the first block).
+    """
+    i = np.arange(window - 1, len(prefix))
+    block = i // window
+    previous_total = np.where(block > 0, block_totals[np.maximum(block - 1, 0)], 0.0)
+    before = np.where(i >= window, prefix[np.maximum(i - window, 0)], 0.0)
+    return previous_total - before
+
+
+def rolling_sum(values, window):
+    """Trailing ``window`` sums from block-restarted running totals (NaN during warm-up)
+
+    Uses exactly the additions RollingSum performs, so batch and streaming
+    results are bit-identical.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        prefix, totals = _block_prefix(values, window)
+        out[window - 1:] = prefix[window - 1:] + _previous_block_part(prefix, totals, window)
+    return out
+
+
+class RollingSum:
+    """Streaming counterpart of ``rolling_sum``: O(1) per value, no Python list"""
+
+    def __init__(self, window):
+        self.window = window
+        self._prefixes = np.zeros(window + 1)  # Ring of the last window+1 in-block running totals
+        self._prefix = 0.0
+        self._previous_total = 0.0
+        self._count = 0
+
+    def update(self, value):
+        i = self._count
+        window = self.window
+        if i % window == 0:
+            # New block: restart the running total
+            self._previous_total = self._prefix
+            self._prefix = 0.0
+        self._prefix += float(value)
+        self._prefixes[i % (window + 1)] = self._prefix
+        self._count = i + 1
+        if i < window - 1:
+            return np.nan
+        before = self._prefixes[(i - window) % (window + 1)] if i >= window else 0.0
+        return self._prefix + (self._previous_total - before)
+
+
+class RollingSums:
+    """RollingSum over many series at once: one column per series, one row of values per update
+
+    ``active`` marks the columns that take a value this update (default all);
+    the others keep their state, so a series can start late or skip bars and
+    still get exactly the sums RollingSum gives on its own values. Columns
+    are NaN until they have taken ``window`` values.
+    """
+
+    def __init__(self, window, width):
+        self.window = window
+        self._prefixes = np.zeros((window + 1, width))
+        self._prefix = np.zeros(width)
+        self._previous_total = np.zeros(width)
+        self._counts = np.zeros(width, dtype=np.int64)
+        self._columns = np.arange(width)
+
+    def update(self, values, active=None):
+        window = self.window
+        i = self._counts
+        active = np.ones(len(i), dtype=bool) if active is None else np.asarray(active, dtype=bool)
+        new_block = active & (i % window == 0)
+        self._previous_total = np.where(new_block, self._prefix, self._previous_total)
+        self._prefix = np.where(active, np.where(new_block, 0.0, self._prefix) + values, self._prefix)
+        self._prefixes[i[active] % (window + 1), self._columns[active]] = self._prefix[active]
+        self._counts = i = i + active
+
+        last = i - 1
+        before = np.where(last >= window, self._prefixes[(last - window) % (window + 1), self._columns], 0.0)
+        sums = self._prefix + (self._previous_total - before)
+        sums[i < window] = np.nan
+        return sums
+
+
+def session_vwap(sessions, high, low, close, volume):
+    """Cumulative VWAP of the typical price, restarting whenever the session key changes"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    sessions = np.asarray(sessions)
+    n = len(close)
+    if n == 0:
+        return np.empty(0)
+
+    typical = (high + low + close) / 3.0
+    cum_pv = np.cumsum(typical * volume)
+    cum_v = np.cumsum(volume)
+
+    # Running totals just before each session's first bar, spread over the session
+    starts = np.flatnonzero(np.concatenate(([True], sessions[1:] != sessions[:-1])))
+    run = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+    base_pv = np.concatenate(([0.0], cum_pv))[starts][run]
+    base_v = np.concatenate(([0.0], cum_v))[starts][run]
+
+    pv = cum_pv - base_pv
+    v = cum_v - base_v
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(v > 0, pv / v, typical)
+
+
+class SessionVWAP:
+    """Streaming counterpart of ``session_vwap``: O(1) state, resets at the 09:15 IST session open"""
+
+    def __init__(self):
+        self._session = None
+        self._cum_pv = 0.0
+        self._cum_v = 0.0
+        self._base_pv = 0.0
+        self._base_v = 0.0
+
+    def update(self, ts, high, low, close, volume):
+        session = session_key(ts)
+        if session != self._session:
+            self._session = session
+            self._base_pv = self._cum_pv
+            self._base_v = self._cum_v
+        typical = (float(high) + float(low) + float(close)) / 3.0
+        self._cum_pv += typical * float(volume)
+        self._cum_v += float(volume)
+        v = self._cum_v - self._base_v
+        return (self._cum_pv - self._base_pv) / v if v > 0 else typical
+
+
+def sliding_max(values, window):
+    """Max of each trailing ``window`` (NaN during warm-up), vectorized in O(n) for any window
+
+    van Herk/Gil-Werman: split into blocks of ``window``; every window spans
+    the suffix of one block and the prefix of the next, so it is the max of
+    one suffix-max and one prefix-max.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:n] = values
+    padded = padded.reshape(blocks, window)
+    prefix = np.maximum.accumulate(padded, axis=1).ravel()
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    out[window - 1:] = np.maximum(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def sliding_min(values, window):
+    """Min counterpart of ``sliding_max``"""
+    return -sliding_max(-np.asarray(values, dtype=np.float64), window)
+
+
+class RollingMax:
+    """Max of the last ``window`` values via a monotonic deque: amortized O(1) per value"""
+
+    _sign = 1.0
+
+    def __init__(self, window):
+        self.window = window
+        self._deque = deque()  # (position, signed value), signed values strictly decreasing
+        self._count = 0
+
+    def push(self, value):
+        v = self._sign * float(value)
+        d = self._deque
+        while d and d[-1][1] <= v:
+            d.pop()
+        d.append((self._count, v))
+        self._count += 1
+        if d[0][0] <= self._count - 1 - self.window:
+            d.popleft()
+
+    @property
+    def value(self):
+        """Current extreme, NaN until ``window`` values have been pushed"""
+        if self._count < self.window:
+            return np.nan
+        return self._sign * self._deque[0][1]
+
+
+class RollingMin(RollingMax):
+    """Min of the last ``window`` values via a monotonic deque"""
+
+    _sign = -1.0
+
+
+def rolling_moments(values, window):
+    """Trailing mean, sample std and z-score of ``window`` values from block running sums
+
+    Each block of ``window`` values is summed about its own first value,
+    which keeps the sum of squares small for prices and avoids the
+    catastrophic cancellation of the textbook ``E[x^2] - E[x]^2``; the tail
+    of the previous block is re-centred onto the current block's reference.
+    NaN during warm-up; z is NaN where the window is flat. RollingMoments
+    repeats the exact arithmetic, so batch and streaming values are identical.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    mean, std, z = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    if n < window:
+        return mean, std, z
+    refs = values[::window]
+    shifted = values - refs[np.arange(n) // window]
+    p1, t1 = _block_prefix(shifted, window)
+    p2, t2 = _block_prefix(shifted * shifted, window)
+    a1 = _previous_block_part(p1, t1, window)
+    a2 = _previous_block_part(p2, t2, window)
+
+    i = np.arange(window - 1, n)
+    block = i // window
+    ref = refs[block]
+    k = window - 1 - i % window  # Values of the window in the previous block
+    d = np.where(block > 0, refs[np.maximum(block - 1, 0)] - ref, 0.0)
+    s1, s2 = _recentre(p1[i], p2[i], a1, a2, k, d)
+    mean[window - 1:], std[window - 1:], z[window - 1:] = _moments(values[window - 1:], s1, s2, window, ref)
+    return mean, std, z
+
+
+def _recentre(p1, p2, a1, a2, k, d):
+    """Window sums about the current block's reference: the block prefix plus the previous
+    block's ``k`` values (sums ``a1``/``a2`` about its reference, ``d`` away)"""
+    return p1 + (a1 + k * d), p2 + (a2 + d * (2 * a1 + k * d))
+
+
+def _moments(x, s1, s2, window, ref):
+    """Shared arithmetic for rolling_moments / RollingMoments (works on scalars and arrays)"""
+    mean_shifted = s1 / window
+    var = np.maximum((s2 - s1 * mean_shifted) / (window - 1), 0.0) if window > 1 else s2 * 0.0
+    std = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(std > 0, (x - ref - mean_shifted) / std, np.nan)
+    return mean_shifted + ref, std, z
+
+
+class RollingMoments:
+    """Streaming counterpart of ``rolling_moments``: O(1) per value"""
+
+    def __init__(self, window):
+        self.window = window
+        self.ref = None           # First value of the current block
+        self._previous_ref = 0.0
+        self._p1 = self._p2 = 0.0
+        self._t1 = self._t2 = 0.0  # Previous block's totals
+        self._ring1 = np.zeros(window + 1)
+        self._ring2 = np.zeros(window + 1)
+        self._count = 0
+
+    def update(self, value):
+        """Add a value; returns (mean, std, z) of the current window"""
+        value = float(value)
+        i = self._count
+        window = self.window
+        if i % window == 0:
+            self._previous_ref = value if self.ref is None else self.ref
+            self.ref = value
+            self._t1, self._t2 = self._p1, self._p2
+            self._p1 = self._p2 = 0.0
+        shifted = value - self.ref
+        self._p1 += shifted
+        self._p2 += shifted * shifted
+        slot = i % (window + 1)
+        self._ring1[slot] = self._p1
+        self._ring2[slot] = self._p2
+        self._count = i + 1
+        if i < window - 1:
+            return np.nan, np.nan, np.nan
+
+        old = (i - window) % (window + 1)
+        a1 = self._t1 - (self._ring1[old] if i >= window else 0.0)
+        a2 = self._t2 - (self._ring2[old] if i >= window else 0.0)
+        d = self._previous_ref - self.ref
+        s1, s2 = _recentre(self._p1, self._p2, a1, a2, window - 1 - i % window, d)
+        mean, std, z = _moments(value, s1, s2, window, self.ref)
+        return float(mean), float(std), float(z)
+
+
+class RollingMomentsColumns:
+    """RollingMoments over many series at once: one column per series, one row of values per update
+
+    ``active`` works as in RollingSums: inactive columns keep their state
+    and each column's blocks and reference start from its own first value.
+    """
+
+    def __init__(self, window, width):
+        self.window = window
+        self.ref = np.zeros(width)
+        self._previous_ref = np.zeros(width)
+        self._p1 = np.zeros(width)
+        self._p2 = np.zeros(width)
+        self._t1 = np.zeros(width)
+        self._t2 = np.zeros(width)
+        self._ring1 = np.zeros((window + 1, width))
+        self._ring2 = np.zeros((window + 1, width))
+        self._counts = np.zeros(width, dtype=np.int64)
+        self._columns = np.arange(width)
+
+    def update(self, values, active=None):
+        """Add one row of values; returns (mean, std, z) arrays"""
+        values = np.asarray(values, dtype=np.float64)
+        window = self.window
+        i = self._counts
+        active = np.ones(len(i), dtype=bool) if active is None else np.asarray(active, dtype=bool)
+        new_block = active & (i % window == 0)
+        self._previous_ref = np.where(new_block, np.where(i == 0, values, self.ref), self._previous_ref)
+        self.ref = np.where(new_block, values, self.ref)
+        self._t1 = np.where(new_block, self._p1, self._t1)
+        self._t2 = np.where(new_block, self._p2, self._t2)
+        shifted = values - self.ref
+        self._p1 = np.where(active, np.where(new_block, 0.0, self._p1) + shifted, self._p1)
+        self._p2 = np.where(active, np.where(new_block, 0.0, self._p2) + shifted * shifted, self._p2)
+        slots, columns = i[active] % (window + 1), self._columns[active]
+        self._ring1[slots, columns] = self._p1[active]
+        self._ring2[slots, columns] = self._p2[active]
+        self._counts = i = i + active
+
+        last = i - 1
+        old = (last - window) % (window + 1)
+        a1 = self._t1 - np.where(last >= window, self._ring1[old, self._columns], 0.0)
+        a2 = self._t2 - np.where(last >= window, self._ring2[old, self._columns], 0.0)
+        d = self._previous_ref - self.ref
+        s1, s2 = _recentre(self._p1, self._p2, a1, a2, window - 1 - last % window, d)
+        mean, std, z = _moments(values, s1, s2, window, self.ref)
+        warming = i < window
+        mean[warming] = std[warming] = z[warming] = np.nan
+        return mean, std, z
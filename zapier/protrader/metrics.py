@@ -0,0 +1,141 @@
+import math
+
+
+class PerformanceAccumulator:
+    """Streaming trade statistics, updated in O(1) per closed trade
+
+    Per-trade returns (P&L over equity before the trade) feed a Welford
+    mean/variance for the Sharpe ratio and a running downside sum of squares
+    for the Sortino ratio. Equity is tracked against its running peak for
+    max drawdown, and gross profit/loss and win/loss counts give profit
+    factor and win rate. Nothing is kept per trade, so ``summary()`` costs
+    the same after ten trades or ten million.
+    """
+
+    def __init__(self, initial_capital, risk_free_rate=0.0, periods_per_year=252):
+        self.initial_capital = initial_capital
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded trades"""
+        self.equity = self.initial_capital
+        self.peak_equity = self.initial_capital
+        self.max_drawdown = 0.0      # Percent below peak
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0        # Positive number
+        self.max_win = 0.0
+        self.max_loss = 0.0          # Most negative P&L seen
+
+        # Welford state for per-trade returns
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside_sq = 0.0
+
+    def record(self, pnl):
+        """Add one closed trade's P&L"""
+        equity_before = self.equity
+        self.equity += pnl
+        self.total_trades += 1
+
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+            self.max_win = max(self.max_win, pnl)
+        elif pnl < 0:
+            self.losing_trades += 1
+            self.gross_loss -= pnl
+            self.max_loss = min(self.max_loss, pnl)
+
+        # Running peak and drawdown
+        if self.equity > self.peak_equity:
+            self.peak_equity = self.equity
+        elif self.peak_equity > 0:
+            drawdown = (self.peak_equity - self.equity) / self.peak_equity * 100
+            self.max_drawdown = max(self.max_drawdown, drawdown)
+
+        # Welford update on the trade return
+        ret = pnl / equity_before if equity_before else 0.0
+        delta = ret - self._mean
+        self._mean += delta / self.total_trades
+        self._m2 += delta * (ret - self._mean)
+
+        excess = ret - self.risk_free_rate / self.periods_per_year
+        if excess < 0:
+            self._downside_sq += excess * excess
+
+    @property
+    def total_pnl(self):
+        return self.equity - self.initial_capital
+
+    @property
+    def win_rate(self):
+        return self.winning_trades / self.total_trades * 100 if self.total_trades else 0.0
+
+    @property
+    def profit_factor(self):
+        return self.gross_profit / self.gross_loss if self.gross_loss > 0 else 0.0
+
+    @property
+    def avg_win(self):
+        return self.gross_profit / self.winning_trades if self.winning_trades else 0.0
+
+    @property
+    def avg_loss(self):
+        return -self.gross_loss / self.losing_trades if self.losing_trades else 0.0
+
+    @property
+    def current_drawdown(self):
+        if self.peak_equity <= 0:
+            return 0.0
+        return (self.peak_equity - self.equity) / self.peak_equity * 100
+
+    @property
+    def return_std(self):
+        """Sample standard deviation of per-trade returns"""
+        if self.total_trades < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.total_trades - 1))
+
+    @property
+    def sharpe_ratio(self):
+        std = self.return_std
+        if std == 0:
+            return 0.0
+        excess_mean = self._mean - self.risk_free_rate / self.periods_per_year
+        return math.sqrt(self.periods_per_year) * excess_mean / std
+
+    @property
+    def sortino_ratio(self):
+        if self.total_trades < 2 or self._downside_sq == 0:
+            return 0.0
+        downside_dev = math.sqrt(self._downside_sq / self.total_trades)
+        excess_mean = self._mean - self.risk_free_rate / self.periods_per_year
+        return math.sqrt(self.periods_per_year) * excess_mean / downside_dev
+
+    def summary(self):
+        """Return all metrics as a plain dict"""
+        return {
+            "total_trades": self.total_trades,
+            "winning_trades": self.winning_trades,
+            "losing_trades": self.losing_trades,
+            "win_rate": self.win_rate,
+            "total_pnl": self.total_pnl,
+            "gross_profit": self.gross_profit,
+            "gross_loss": self.gross_loss,
+            "profit_factor": self.profit_factor,
+            "avg_win": self.avg_win,
+            "avg_loss": self.avg_loss,
+            "max_profit_trade": self.max_win,
+            "max_loss_trade": self.max_loss,
+            "equity": self.equity,
+            "peak_equity": self.peak_equity,
+            "current_drawdown": self.current_drawdown,
+            "max_drawdown": self.max_drawdown,
+            "sharpe_ratio": self.sharpe_ratio,
+            "sortino_ratio": self.sortino_ratio,
+        }
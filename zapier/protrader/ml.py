@@ -0,0 +1,310 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .indicators import rolling_sum, rolling_moments, RollingSums, RollingMomentsColumns
+
+
+def feature_names(lags=5):
+    return [f"ret_{k}" for k in range(lags)] + ["ema_fast_gap", "ema_slow_gap", "rsi", "bb_z"]
+
+
+def _ema_alpha(span):
+    return 2.0 / (span + 1.0)
+
+
+def _indicator_features(close, ema_fast, ema_slow, gain_sum, loss_sum, z, rsi_period):
+    """EMA gaps, RSI and Bollinger z as feature columns; works on (bars,) and (symbols,) arrays alike"""
+    avg_gain = gain_sum / rsi_period
+    avg_loss = loss_sum / rsi_period
+    rs = avg_gain / np.where(avg_loss == 0, 0.00001, avg_loss)
+    rsi = 100 - (100 / (1 + rs))
+    return [ema_fast / close - 1.0, ema_slow / close - 1.0, rsi / 100.0 - 0.5, z]
+
+
+def warmup_bars(lags=5, ema_fast=9, ema_slow=21, rsi_period=14, bb_period=20):
+    """Bars needed before every feature is defined"""
+    return max(lags + 1, ema_fast, ema_slow, rsi_period + 1, bb_period)
+
+
+def candle_features(close, lags=5, ema_fast=9, ema_slow=21, rsi_period=14, bb_period=20):
+    """Feature matrix (bars, features) for one symbol's closes; rows before warm-up are NaN
+
+    Columns are ``feature_names(lags)``: the last ``lags`` log returns, the
+    close's distance from the fast and slow EMAs, RSI (centred on 0) and the
+    Bollinger z-score, i.e. the EMA/RSI/BB columns the rule strategies
+    draw. FeatureCache produces the same rows one bar at a time.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    columns = []
+
+    log_ret = np.diff(np.log(close), prepend=np.nan)
+    for k in range(lags):
+        columns.append(np.concatenate((np.full(min(k, n), np.nan), log_ret[:n - k])))
+
+    series = pd.Series(close)
+    ema_f = series.ewm(span=ema_fast, adjust=False).mean().to_numpy()
+    ema_s = series.ewm(span=ema_slow, adjust=False).mean().to_numpy()
+    delta = np.diff(close, prepend=close[:1])
+    gain_sum = rolling_sum(np.where(delta > 0, delta, 0.0), rsi_period)
+    loss_sum = rolling_sum(np.where(delta < 0, -delta, 0.0), rsi_period)
+    _, _, z = rolling_moments(close, bb_period)
+    columns.extend(_indicator_features(close, ema_f, ema_s, gain_sum, loss_sum, z, rsi_period))
+
+    features = np.column_stack(columns) if n else np.empty((0, lags + 4))
+    features[:warmup_bars(lags, ema_fast, ema_slow, rsi_period, bb_period) - 1] = np.nan
+    return features
+
+
+def forward_labels(close, period=5):
+    """1 where the close ``period`` bars ahead is higher, else 0; NaN for the last ``period`` bars"""
+    close = np.asarray(close, dtype=np.float64)
+    labels = np.full(len(close), np.nan)
+    if len(close) > period:
+        labels[:-period] = (close[period:] > close[:-period]).astype(np.float64)
+    return labels
+
+
+class FeatureCache:
+    """Incremental ``candle_features`` for many symbols: one vectorized update per bar
+
+    State is a handful of (symbols,) arrays (EMAs, previous log close, a
+    ring of recent returns, rolling sums for RSI and Bollinger bands), so a
+    bar costs the same whatever the history length. A symbol starts on its
+    first finite close (a late listing gets the rows ``candle_features``
+    gives on its own history); after that a NaN close repeats the symbol's
+    previous close.
+    """
+
+    def __init__(self, n_symbols, lags=5, ema_fast=9, ema_slow=21, rsi_period=14, bb_period=20):
+        self.n_symbols = n_symbols
+        self.lags = lags
+        self.rsi_period = rsi_period
+        self.bb_period = bb_period
+        self.warmup = warmup_bars(lags, ema_fast, ema_slow, rsi_period, bb_period)
+        self._alpha_fast = _ema_alpha(ema_fast)
+        self._alpha_slow = _ema_alpha(ema_slow)
+        self.reset()
+
+    def reset(self):
+        n = self.n_symbols
+        self._count = 0
+        self._bars = np.zeros(n, dtype=np.int64)  # Bars since each symbol's first close
+        self._started = np.zeros(n, dtype=bool)
+        self._close = np.full(n, np.nan)
+        self._log_close = np.full(n, np.nan)
+        self._returns = np.full((self.lags, n), np.nan)  # Ring, newest at _count % lags
+        self._ema_fast = np.full(n, np.nan)
+        self._ema_slow = np.full(n, np.nan)
+        self._gain = RollingSums(self.rsi_period, n)
+        self._loss = RollingSums(self.rsi_period, n)
+        self._bb = RollingMomentsColumns(self.bb_period, n)
+
+    @staticmethod
+    def _ema(previous, value, alpha, first):
+        # Same arithmetic as pandas ewm(adjust=False), so batch and cached features agree
+        old = 1.0 - alpha
+        return np.where(first, value, (old * previous + alpha * value) / (old + alpha))
+
+    def update(self, closes):
+        """Add one bar of closes (symbols,); returns the (symbols, features) rows, NaN until warmed up"""
+        close = np.asarray(closes, dtype=np.float64)
+        finite = np.isfinite(close)
+        first = finite & ~self._started
+        self._started |= finite
+        started = self._started
+        close = np.where(started & ~finite, self._close, close)
+        self._count += 1
+        self._bars += started
+
+        log_close = np.log(close)
+        self._returns[self._count % self.lags] = log_close - self._log_close
+        self._log_close = log_close
+
+        delta = np.where(first, 0.0, close - self._close)
+        self._close = close
+        self._ema_fast = self._ema(self._ema_fast, close, self._alpha_fast, first)
+        self._ema_slow = self._ema(self._ema_slow, close, self._alpha_slow, first)
+        gain_sum = self._gain.update(np.where(delta > 0, delta, 0.0), started)
+        loss_sum = self._loss.update(np.where(delta < 0, -delta, 0.0), started)
+
+        _, _, z = self._bb.update(close, started)
+
+        # Newest return first, matching the ret_0..ret_{lags-1} columns
+        order = (self._count - np.arange(self.lags)) % self.lags
+        columns = list(self._returns[order])
+        columns.extend(_indicator_features(close, self._ema_fast, self._ema_slow, gain_sum, loss_sum,
+                                           z, self.rsi_period))
+        features = np.column_stack(columns)
+        features[self._bars < self.warmup] = np.nan
+        return features
+
+
+class LinearModel:
+    """Logistic regression in plain NumPy: P(up) = sigmoid(((X - mean) / scale) @ weights + bias)
+
+    ``fit`` runs a few Newton (IRLS) steps with an L2 penalty, which for a
+    dozen features converges in milliseconds on a CPU. Saved as ``.npz``.
+    """
+
+    def __init__(self, weights, bias=0.0, mean=None, scale=None, names=None):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.mean = np.zeros(len(self.weights)) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scale = np.ones(len(self.weights)) if scale is None else np.asarray(scale, dtype=np.float64)
+        self.names = list(names) if names is not None else None
+
+    def predict(self, X):
+        """Probability of an up move for each row of X"""
+        z = ((np.asarray(X, dtype=np.float64) - self.mean) / self.scale) @ self.weights + self.bias
+        return 1.0 / (1.0 + np.exp(-z))
+
+    @classmethod
+    def fit(cls, X, y, l2=1.0, iterations=25, names=None):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        A = np.column_stack(((X - mean) / scale, np.ones(len(X))))
+        penalty = np.full(A.shape[1], l2)
+        penalty[-1] = 0.0  # Bias is not penalized
+        w = np.zeros(A.shape[1])
+        for _ in range(iterations):
+            p = 1.0 / (1.0 + np.exp(-(A @ w)))
+            gradient = A.T @ (p - y) + penalty * w
+            hessian = (A * (p * (1 - p))[:, None]).T @ A + np.diag(penalty)
+            step = np.linalg.solve(hessian, gradient)
+            w -= step
+            if np.abs(step).max() < 1e-8:
+                break
+        return cls(w[:-1], w[-1], mean, scale, names)
+
+    def save(self, path):
+        np.savez(path, weights=self.weights, bias=self.bias, mean=self.mean, scale=self.scale,
+                 names=np.array(self.names or [], dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            names = [str(n) for n in data["names"]] or None
+            return cls(data["weights"], float(data["bias"]), data["mean"], data["scale"], names)
+
+
+class SklearnModel:
+    """Any fitted scikit-learn classifier with ``predict_proba``, loaded from a pickle/joblib file"""
+
+    def __init__(self, estimator):
+        self.estimator = estimator
+
+    def predict(self, X):
+        return self.estimator.predict_proba(np.asarray(X, dtype=np.float64))[:, 1]
+
+    @classmethod
+    def load(cls, path):
+        try:
+            import joblib
+            return cls(joblib.load(path))
+        except ImportError:
+            with open(path, "rb") as f:
+                return cls(pickle.load(f))
+
+
+class OnnxModel:
+    """A binary classifier exported to ONNX, run with onnxruntime on the CPU
+
+    Export sklearn models with ``zipmap=False`` so the probabilities come
+    back as an array; the last output is taken as P(up) (its second column
+    when it has two).
+    """
+
+    def __init__(self, path):
+        import onnxruntime
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, X):
+        outputs = self.session.run(None, {self.input_name: np.asarray(X, dtype=np.float32)})
+        proba = np.asarray(outputs[-1], dtype=np.float64)
+        return proba[:, 1] if proba.ndim == 2 and proba.shape[1] == 2 else proba.reshape(-1)
+
+    @classmethod
+    def load(cls, path):
+        return cls(path)
+
+
+MODEL_LOADERS = {".npz": LinearModel, ".onnx": OnnxModel, ".pkl": SklearnModel, ".joblib": SklearnModel}
+
+
+def load_model(path):
+    """Load a model by file extension (.npz, .onnx, .pkl or .joblib); it exposes ``predict(X) -> P(up)``"""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        loader = MODEL_LOADERS[ext]
+    except KeyError:
+        raise ValueError(f"Unsupported model file: {path}")
+    return loader.load(path)
+
+
+def predict_rows(model, features):
+    """Model probabilities for the rows with every feature defined; NaN elsewhere"""
+    proba = np.full(len(features), np.nan)
+    ready = np.isfinite(features).all(axis=1)
+    if ready.any():
+        proba[ready] = model.predict(features[ready])
+    return proba
+
+
+def confidence_flags(proba, threshold):
+    """Bull/bear flags for probabilities beyond ``threshold`` either way (NaN is neither)"""
+    with np.errstate(invalid="ignore"):
+        return proba >= threshold, proba <= 1.0 - threshold
+
+
+def edge_signals(proba, threshold):
+    """Buy/Sell signal arrays (0/1) on the first bar of each confident run, as analyze() writes them"""
+    bull, bear = confidence_flags(proba, threshold)
+    prev_bull = np.concatenate(([False], bull[:-1]))
+    prev_bear = np.concatenate(([False], bear[:-1]))
+    return (bull & ~prev_bull).astype(int), (bear & ~prev_bear).astype(int)
+
+
+class MLSignalEngine:
+    """Runs one model over many symbols: one FeatureCache update and one ``predict`` call per bar
+
+    ``on_bar`` takes the bar's closes (a {symbol: close} dict or an array
+    in ``symbols`` order) and returns {symbol: 'BUY'/'SELL'/'NEUTRAL'}. A
+    signal fires on the first bar the probability crosses
+    ``confidence_threshold`` (or drops below 1 - threshold), like the rule
+    strategies' first-bar-of-condition signals.
+    """
+
+    def __init__(self, model, symbols, confidence_threshold=0.6, **feature_params):
+        self.model = model
+        self.symbols = list(symbols)
+        self.confidence_threshold = confidence_threshold
+        self.cache = FeatureCache(len(self.symbols), **feature_params)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._prev_bull = np.zeros(len(self.symbols), dtype=bool)
+        self._prev_bear = np.zeros(len(self.symbols), dtype=bool)
+        self.last_proba = np.full(len(self.symbols), np.nan)
+
+    def on_bar(self, closes):
+        if isinstance(closes, dict):
+            row = np.full(len(self.symbols), np.nan)
+            for symbol, close in closes.items():
+                i = self._index.get(symbol)
+                if i is not None:
+                    row[i] = close
+            closes = row
+        proba = predict_rows(self.model, self.cache.update(closes))
+        bull, bear = confidence_flags(proba, self.confidence_threshold)
+        buy = bull & ~self._prev_bull
+        sell = bear & ~self._prev_bear
+        self._prev_bull, self._prev_bear = bull, bear
+        self.last_proba = proba
+        return {symbol: "BUY" if buy[i] else "SELL" if sell[i] else "NEUTRAL"
+                for i, symbol in enumerate(self.symbols)}
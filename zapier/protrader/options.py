@@ -0,0 +1,488 @@
+import math
+import os
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import numpy as np
+
+YEAR_SECONDS = 365.0 * 86400.0
+MIN_TIME = 1.0 / (365.0 * 24 * 60)   # One minute, so expiring options price at intrinsic
+STRIKE_INTERVALS = {"NIFTY": 50, "BANKNIFTY": 100, "FINNIFTY": 50}
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+# Black-Scholes prices and Greeks, each an array broadcast over (underlyings, strikes)
+OptionGreeks = namedtuple("OptionGreeks", [
+    "call", "put", "call_delta", "put_delta", "gamma", "vega", "call_theta", "put_theta"
+])
+
+# One strangle pick per underlying (arrays of shape (underlyings,))
+StranglePick = namedtuple("StranglePick", [
+    "call_strike", "put_strike", "call_price", "put_price", "call_delta", "put_delta"
+])
+
+# Fields of an option_symbol, read back by parse_option_symbol
+OptionSymbol = namedtuple("OptionSymbol", ["underlying", "expiry", "strike", "option_type"])
+
+# One stored day of IV history (day is a date ordinal), as written by IVRank.save
+IV_DAY_DTYPE = np.dtype([("day", "<i8"), ("iv", "<f8")])
+
+
+def norm_pdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def norm_cdf(x):
+    """Standard normal CDF, vectorized (Abramowitz & Stegun 26.2.17, |error| < 7.5e-8)"""
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.2316419 * z)
+    poly = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    upper = norm_pdf(z) * poly  # P(Z > |x|)
+    return np.where(x >= 0, 1.0 - upper, upper)
+
+
+def black_scholes(spot, strikes, t, iv, rate=0.0):
+    """European call/put prices and Greeks for every (spot, strike) pair in one pass
+
+    Arguments broadcast like numpy arrays: pass spots, times and IVs as
+    ``(n, 1)`` columns against ``(n, k)`` strikes to price n chains at once.
+    ``t`` is in years and floored at one minute. Vega is per 1.00 of
+    volatility, theta per year.
+    """
+    spot = np.asarray(spot, dtype=np.float64)
+    strikes = np.asarray(strikes, dtype=np.float64)
+    t = np.maximum(np.asarray(t, dtype=np.float64), MIN_TIME)
+    iv = np.asarray(iv, dtype=np.float64)
+
+    sqrt_t = np.sqrt(t)
+    vol_t = iv * sqrt_t
+    d1 = (np.log(spot / strikes) + (rate + 0.5 * iv * iv) * t) / vol_t
+    d2 = d1 - vol_t
+    nd1 = norm_cdf(d1)
+    nd2 = norm_cdf(d2)
+    pdf = norm_pdf(d1)
+    discount = strikes * np.exp(-rate * t)
+
+    call = spot * nd1 - discount * nd2
+    put = call - spot + discount  # Put-call parity
+    decay = -spot * pdf * iv / (2.0 * sqrt_t)
+    return OptionGreeks(
+        call, put, nd1, nd1 - 1.0,
+        pdf / (spot * vol_t), spot * pdf * sqrt_t,
+        decay - rate * discount * nd2, decay + rate * discount * (1.0 - nd2)
+    )
+
+
+def strike_ladder(spot, interval, count=20):
+    """``2 * count + 1`` strikes around the ATM strike of each spot: shape (n, 2 * count + 1)"""
+    spot = np.atleast_1d(np.asarray(spot, dtype=np.float64))
+    interval = np.atleast_1d(np.asarray(interval, dtype=np.float64))
+    atm = np.round(spot / interval) * interval
+    return atm[:, None] + interval[:, None] * np.arange(-count, count + 1)
+
+
+def select_strangle(spot, strikes, t, iv, target_delta=0.3, rate=0.0):
+    """Price each chain and pick the call and put closest to ``target_delta``
+
+    ``spot``, ``t`` and ``iv`` are per underlying (n,), ``strikes`` is the
+    (n, k) chain. The search is one argmin per row, so any number of
+    underlyings is a single vectorized pass.
+    """
+    spot = np.atleast_1d(np.asarray(spot, dtype=np.float64))[:, None]
+    t = np.atleast_1d(np.asarray(t, dtype=np.float64))[:, None]
+    iv = np.atleast_1d(np.asarray(iv, dtype=np.float64))[:, None]
+    strikes = np.atleast_2d(strikes)
+    greeks = black_scholes(spot, strikes, t, iv, rate)
+
+    call_idx = np.abs(greeks.call_delta - target_delta).argmin(axis=1)[:, None]
+    put_idx = np.abs(greeks.put_delta + target_delta).argmin(axis=1)[:, None]
+
+    def pick(values, idx):
+        return np.take_along_axis(values, idx, axis=1)[:, 0]
+
+    return StranglePick(
+        pick(strikes, call_idx), pick(strikes, put_idx),
+        pick(greeks.call, call_idx), pick(greeks.put, put_idx),
+        pick(greeks.call_delta, call_idx), pick(greeks.put_delta, put_idx)
+    )
+
+
+def weekly_expiry(now, dte):
+    """First Thursday at least ``dte`` days out, at the 15:30 close"""
+    target = now + timedelta(days=dte)
+    days_to_thursday = (3 - target.weekday()) % 7  # 3 is Thursday
+    expiry = target + timedelta(days=days_to_thursday)
+    return expiry.replace(hour=15, minute=30, second=0, microsecond=0)
+
+
+def option_symbol(underlying, expiry, strike, option_type):
+    """Trading symbol in the strategy page's format: SYMBOL EXPIRY STRIKE CE/PE"""
+    return f"{underlying} {expiry.strftime('%d%b%y').upper()} {int(strike)} {option_type}"
+
+
+def parse_option_symbol(symbol):
+    """OptionSymbol for an ``option_symbol`` string (expiry at the 15:30 close), None for anything else"""
+    parts = symbol.split(" ")
+    if len(parts) != 4 or parts[3] not in ("CE", "PE"):
+        return None
+    try:
+        expiry = datetime.strptime(parts[1], "%d%b%y").replace(hour=15, minute=30)
+        strike = float(parts[2])
+    except ValueError:
+        return None
+    return OptionSymbol(parts[0], expiry, strike, parts[3])
+
+
+class IVRank:
+    """IV rank and percentile over a rolling window of daily implied volatilities
+
+    Keeps one IV per trading day in a preallocated ring of ``window`` days
+    (252 by default, one year). Updates within the same day replace that
+    day's value, so it can be fed every tick. ``rank`` is where today's IV
+    sits between the window's low and high, ``percentile`` the share of
+    days with a lower IV; both are 0-100 and NaN until two days are known.
+
+    With a ``path`` the window is read back on construction and rewritten
+    (IV_DAY_DTYPE records, oldest first) whenever a new day starts, so a
+    restart keeps its rank. ``seed`` fills it from past daily IVs, e.g. the
+    broker's history, instead of waiting for the days to pass.
+    """
+
+    def __init__(self, window=252, path=None):
+        self.window = window
+        self.path = path
+        self._values = np.full(window, np.nan)
+        self._days = np.zeros(window, dtype=np.int64)
+        self._day = None
+        self._count = 0
+        if path and os.path.exists(path):
+            records = np.fromfile(path, dtype=IV_DAY_DTYPE)
+            for day, iv in zip(records["day"], records["iv"]):
+                self._record(int(day), iv)
+
+    def _record(self, day, iv):
+        """Store ``iv`` for ``day``; True if it started a new day"""
+        new_day = day != self._day
+        if new_day:
+            self._day = day
+            self._count += 1
+        slot = (self._count - 1) % self.window
+        self._values[slot] = float(iv)
+        self._days[slot] = day
+        return new_day
+
+    def update(self, iv, day=None):
+        """Record the IV for ``day`` (a date ordinal, defaults to today); returns the rank"""
+        day = datetime.now().date().toordinal() if day is None else day
+        if self._record(day, iv) and self.path:
+            self.save()
+        return self.rank
+
+    def seed(self, history):
+        """Add past daily IVs: (day, iv) pairs oldest first, or a Series indexed by date
+
+        Days are dates/Timestamps or date ordinals. Days up to the latest one
+        already recorded are skipped, so seeding after a reload only fills
+        the gap. Returns the rank.
+        """
+        items = history.items() if hasattr(history, "items") else history
+        added = False
+        for day, iv in items:
+            day = day.toordinal() if hasattr(day, "toordinal") else int(day)
+            if (self._day is None or day > self._day) and np.isfinite(iv):
+                self._record(day, iv)
+                added = True
+        if added and self.path:
+            self.save()
+        return self.rank
+
+    def save(self):
+        """Write the window to ``path``, replacing the previous file"""
+        n = min(self._count, self.window)
+        slots = np.arange(self._count - n, self._count) % self.window
+        records = np.empty(n, dtype=IV_DAY_DTYPE)
+        records["day"] = self._days[slots]
+        records["iv"] = self._values[slots]
+        tmp = self.path + ".tmp"
+        records.tofile(tmp)
+        os.replace(tmp, self.path)
+
+    @property
+    def current(self):
+        return self._values[(self._count - 1) % self.window] if self._count else np.nan
+
+    @property
+    def rank(self):
+        if self._count < 2:
+            return np.nan
+        values = self._values[:min(self._count, self.window)]
+        low, high = values.min(), values.max()
+        if high == low:
+            return 50.0
+        return float((self.current - low) / (high - low) * 100.0)
+
+    @property
+    def percentile(self):
+        if self._count < 2:
+            return np.nan
+        values = self._values[:min(self._count, self.window)]
+        return float((values < self.current).sum() / (len(values) - 1) * 100.0)
+
+
+class StranglePosition:
+    """A short strangle: two linked SELL legs sharing a ``group_id`` in the TradeManager"""
+
+    __slots__ = ("underlying", "group_id", "expiry", "qty", "call_strike", "put_strike",
+                 "call_symbol", "put_symbol", "call_id", "put_id", "credit",
+                 "call_price", "put_price", "call_delta", "put_delta", "pnl")
+
+    def __init__(self, underlying, group_id, expiry, qty, call_strike, put_strike, call_price, put_price):
+        self.underlying = underlying
+        self.group_id = group_id
+        self.expiry = expiry
+        self.qty = qty
+        self.call_strike = float(call_strike)
+        self.put_strike = float(put_strike)
+        self.call_symbol = option_symbol(underlying, expiry, call_strike, "CE")
+        self.put_symbol = option_symbol(underlying, expiry, put_strike, "PE")
+        self.call_id = None
+        self.put_id = None
+        self.credit = float(call_price) + float(put_price)  # Premium collected per unit
+        self.call_price = float(call_price)
+        self.put_price = float(put_price)
+        self.call_delta = np.nan
+        self.put_delta = np.nan
+        self.pnl = 0.0
+
+    @property
+    def net_delta(self):
+        """Position delta in underlying units (short both legs)"""
+        return -(self.call_delta + self.put_delta) * self.qty
+
+
+class StrangleEngine:
+    """Sells 0.3-delta strangles on several underlyings and manages the legs as one trade
+
+    ``on_tick`` takes {underlying: spot} and {underlying: IV} and does all
+    of its pricing in two vectorized Black-Scholes passes: one marking
+    every open strangle (both legs of all underlyings as an (n, 2) array)
+    and one pricing the strike ladders of the underlyings looking for an
+    entry. An entry needs the IV rank to be at least ``iv_rank_min``.
+
+    Open strangles are closed as a pair when the combined P&L reaches
+    ``profit_take`` of the credit (STRANGLE_TARGET), loses ``stop_loss``
+    times the credit (STRANGLE_STOP), ``exit_dte`` days remain
+    (STRANGLE_EXPIRY), or either leg's delta drifts past ``max_leg_delta``
+    (STRANGLE_ROLL, re-entered on the same tick if IV rank still allows).
+    All opens and closes of a tick go to ``trade_manager.execute_batch``
+    as one write; the two legs share a ``group_id``. Strangles still open
+    in the trade manager (e.g. reloaded from trades.json) are picked up
+    again on construction, see ``restore_positions``. Each underlying's
+    IV history is kept in ``iv_directory`` (one file per underlying, None
+    to keep it in memory only) and can be seeded with ``seed_iv``.
+    """
+
+    def __init__(self, trade_manager, target_delta=0.3, dte=30, iv_rank_min=50.0, qty=50,
+                 strikes_each_side=20, rate=0.065, profit_take=0.5, stop_loss=2.0, exit_dte=5,
+                 max_leg_delta=0.5, iv_window=252, iv_directory="iv_data"):
+        self.trade_manager = trade_manager
+        self.target_delta = target_delta
+        self.dte = dte
+        self.iv_rank_min = iv_rank_min
+        self.qty = qty
+        self.strikes_each_side = strikes_each_side
+        self.rate = rate
+        self.profit_take = profit_take
+        self.stop_loss = stop_loss
+        self.exit_dte = exit_dte
+        self.max_leg_delta = max_leg_delta
+        self.iv_window = iv_window
+        self.iv_directory = iv_directory
+        if iv_directory:
+            os.makedirs(iv_directory, exist_ok=True)
+        self.intervals = {}    # underlying -> strike interval
+        self.iv_ranks = {}     # underlying -> IVRank
+        self.positions = {}    # underlying -> StranglePosition
+        self._orphans = []     # (trade_id, OptionSymbol) of restored legs without a pair, closed on the next tick
+        if trade_manager is not None:
+            self.restore_positions()
+
+    def restore_positions(self):
+        """Rebuild StranglePositions from the trade manager's open legs, e.g. after a restart
+
+        Open SELL option legs are grouped by ``group_id`` (``get_group``); a
+        group with one open call and one open put on the same underlying and
+        expiry becomes a position again, with the entry premiums as its
+        credit and marks from the next tick. Every other open leg of such a
+        group (its pair already closed, or a second strangle on an underlying)
+        is closed at its mark on the first tick that prices its underlying
+        (STRANGLE_ABORT). Returns the restored positions.
+        """
+        # Legs this engine already tracks are left alone, so restoring twice is harmless
+        known = {trade_id for trade_id, _ in self._orphans}
+        known.update(trade_id for p in self.positions.values() for trade_id in (p.call_id, p.put_id))
+        group_ids = dict.fromkeys(view.group_id for view in self.trade_manager.open_trades
+                                  if view.group_id is not None and view.trade_id not in known)
+        restored = []
+        for group_id in group_ids:
+            legs = [(view, parse_option_symbol(view.symbol)) for view in self.trade_manager.get_group(group_id)
+                    if view.status == "OPEN" and view.trade_type == "SELL" and view.trade_id not in known]
+            legs = [(view, parsed) for view, parsed in legs if parsed]
+            calls = [leg for leg in legs if leg[1].option_type == "CE"]
+            puts = [leg for leg in legs if leg[1].option_type == "PE"]
+            if len(calls) == 1 and len(puts) == 1:
+                (call, call_symbol), (put, put_symbol) = calls[0], puts[0]
+                underlying = call_symbol.underlying
+                if (put_symbol.underlying == underlying and put_symbol.expiry == call_symbol.expiry
+                        and underlying not in self.positions):
+                    position = StranglePosition(underlying, group_id, call_symbol.expiry, call.qty,
+                                                call_symbol.strike, put_symbol.strike,
+                                                call.entry_price, put.entry_price)
+                    position.call_id = call.trade_id
+                    position.put_id = put.trade_id
+                    self.positions[underlying] = position
+                    restored.append(position)
+                    continue
+            self._orphans.extend((view.trade_id, parsed) for view, parsed in legs)
+        return restored
+
+    def add_underlying(self, underlying, strike_interval=None):
+        self.intervals[underlying] = strike_interval or STRIKE_INTERVALS.get(underlying, 50)
+        if underlying not in self.iv_ranks:
+            path = os.path.join(self.iv_directory, f"iv_{underlying}.bin") if self.iv_directory else None
+            self.iv_ranks[underlying] = IVRank(self.iv_window, path)
+
+    def seed_iv(self, underlying, history):
+        """Fill an underlying's IV history from past daily IVs (see ``IVRank.seed``); returns the rank"""
+        self.add_underlying(underlying, self.intervals.get(underlying))
+        return self.iv_ranks[underlying].seed(history)
+
+    def remove_underlying(self, underlying):
+        """Stop trading an underlying and close its strangle at the last marks"""
+        self.intervals.pop(underlying, None)
+        self.iv_ranks.pop(underlying, None)
+        position = self.positions.pop(underlying, None)
+        if position is None:
+            return []
+        return self.trade_manager.execute_batch(self._close_orders(position, "STRANGLE_STOP"))
+
+    def on_tick(self, spots, ivs, now=None):
+        """Process {underlying: spot} and {underlying: implied vol}; returns the execute_batch results"""
+        now = now or datetime.now()
+        day = now.date().toordinal()
+        for underlying, iv in ivs.items():
+            tracker = self.iv_ranks.get(underlying)
+            if tracker is not None and iv:
+                tracker.update(iv, day)
+
+        orders = []
+        self._close_orphans(spots, ivs, now, orders)
+        exits = self._mark(spots, ivs, now, orders)
+        entries = self._enter(spots, ivs, now, orders)
+        if not orders:
+            return []
+        results = self.trade_manager.execute_batch(orders)
+        self._record_entries(entries, results[len(orders) - 2 * len(entries):])
+        return results
+
+    def _mark(self, spots, ivs, now, orders):
+        """Mark every open strangle in one pass and queue the pair closes that are due"""
+        live = [p for u, p in self.positions.items() if spots.get(u) and ivs.get(u)]
+        if not live:
+            return []
+        spot = np.array([spots[p.underlying] for p in live])[:, None]
+        iv = np.array([ivs[p.underlying] for p in live])[:, None]
+        t = np.array([(p.expiry - now).total_seconds() / YEAR_SECONDS for p in live])[:, None]
+        strikes = np.array([(p.call_strike, p.put_strike) for p in live])
+        greeks = black_scholes(spot, strikes, t, iv, self.rate)
+
+        calls, puts = greeks.call[:, 0], greeks.put[:, 1]
+        call_deltas, put_deltas = greeks.call_delta[:, 0], greeks.put_delta[:, 1]
+        credit = np.array([p.credit for p in live])
+        qty = np.array([p.qty for p in live])
+        pnl = (credit - calls - puts) * qty
+
+        # Exit reasons, first match wins
+        status = np.select(
+            [pnl >= self.profit_take * credit * qty,
+             pnl <= -self.stop_loss * credit * qty,
+             t[:, 0] * 365.0 <= self.exit_dte,
+             (call_deltas >= self.max_leg_delta) | (-put_deltas >= self.max_leg_delta)],
+            ["STRANGLE_TARGET", "STRANGLE_STOP", "STRANGLE_EXPIRY", "STRANGLE_ROLL"],
+            default=""
+        )
+
+        exits = []
+        for i, position in enumerate(live):
+            position.call_price = float(calls[i])
+            position.put_price = float(puts[i])
+            position.call_delta = float(call_deltas[i])
+            position.put_delta = float(put_deltas[i])
+            position.pnl = float(pnl[i])
+            if status[i]:
+                orders.extend(self._close_orders(position, str(status[i])))
+                del self.positions[position.underlying]
+                exits.append(position)
+        return exits
+
+    def _close_orphans(self, spots, ivs, now, orders):
+        """Queue closes, at this tick's marks, for restored legs that have no pair"""
+        waiting = []
+        for trade_id, parsed in self._orphans:
+            spot, iv = spots.get(parsed.underlying), ivs.get(parsed.underlying)
+            if not spot or not iv:
+                waiting.append((trade_id, parsed))
+                continue
+            greeks = black_scholes(spot, parsed.strike, (parsed.expiry - now).total_seconds() / YEAR_SECONDS,
+                                   iv, self.rate)
+            price = greeks.call if parsed.option_type == "CE" else greeks.put
+            orders.append(("close", trade_id, float(price), "STRANGLE_ABORT"))
+        self._orphans = waiting
+
+    def _close_orders(self, position, status):
+        return [("close", trade_id, price, status)
+                for trade_id, price in ((position.call_id, position.call_price),
+                                        (position.put_id, position.put_price))
+                if trade_id is not None]
+
+    def _enter(self, spots, ivs, now, orders):
+        """Price the ladders of every flat underlying whose IV rank qualifies and queue both legs"""
+        flat = [u for u in self.intervals
+                if u not in self.positions and spots.get(u) and ivs.get(u)
+                and self.iv_ranks[u].rank >= self.iv_rank_min]
+        if not flat:
+            return []
+        expiry = weekly_expiry(now, self.dte)
+        t = (expiry - now).total_seconds() / YEAR_SECONDS
+        spot = np.array([spots[u] for u in flat])
+        strikes = strike_ladder(spot, [self.intervals[u] for u in flat], self.strikes_each_side)
+        pick = select_strangle(spot, strikes, np.full(len(flat), t), [ivs[u] for u in flat],
+                               self.target_delta, self.rate)
+
+        entries = []
+        for i, underlying in enumerate(flat):
+            position = StranglePosition(underlying, uuid.uuid4().hex[:12], expiry, self.qty,
+                                        pick.call_strike[i], pick.put_strike[i],
+                                        pick.call_price[i], pick.put_price[i])
+            position.call_delta = float(pick.call_delta[i])
+            position.put_delta = float(pick.put_delta[i])
+            orders.append(("open", position.call_symbol, "SELL", position.call_price, self.qty, position.group_id))
+            orders.append(("open", position.put_symbol, "SELL", position.put_price, self.qty, position.group_id))
+            entries.append(position)
+        return entries
+
+    def _record_entries(self, entries, results):
+        """Attach leg trade IDs; a strangle whose other leg was rejected is unwound"""
+        unwind = []
+        for position, (call_ok, call), (put_ok, put) in zip(entries, results[0::2], results[1::2]):
+            position.call_id = call.trade_id if call_ok else None
+            position.put_id = put.trade_id if put_ok else None
+            if call_ok and put_ok:
+                self.positions[position.underlying] = position
+            else:
+                print(f"Strangle on {position.underlying} rejected: {call if not call_ok else put}")
+                unwind.extend(self._close_orders(position, "STRANGLE_ABORT"))
+        if unwind:
+            self.trade_manager.execute_batch(unwind)
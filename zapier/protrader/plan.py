@@ -0,0 +1,166 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from .indicators import epoch_seconds, session_keys, session_vwap, rolling_sum, rolling_moments, sliding_max, sliding_min
+
+
+def shift(values, periods=1):
+    """pandas-style shift of a 1-D array: positive periods look back, negative ahead
+
+    Vacated slots are NaN for numeric arrays and False for boolean ones.
+    """
+    values = np.asarray(values)
+    is_bool = values.dtype == bool
+    out = np.full(len(values), False if is_bool else np.nan, dtype=bool if is_bool else np.float64)
+    if periods == 0:
+        out[:] = values
+    elif abs(periods) < len(values):
+        if periods > 0:
+            out[periods:] = values[:-periods]
+        else:
+            out[:periods] = values[-periods:]
+    return out
+
+
+class IndicatorCache:
+    """Indicator arrays over one OHLCV frame, each computed at most once
+
+    Strategies ask for what they need (``ema("Close", 9)``,
+    ``moments("Close", 20)``, ...) and get the cached array if another
+    strategy already asked for the same key. Each indicator keeps the exact
+    arithmetic its strategies used before, so shared and standalone runs
+    give the same signals. ``computed`` / ``hits`` count misses and reuses.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._values = {}
+        self.computed = 0
+        self.hits = 0
+
+    def get(self, key, compute):
+        """Cached value for ``key``, computing it with ``compute()`` on first use"""
+        try:
+            value = self._values[key]
+        except KeyError:
+            value = self._values[key] = compute()
+            self.computed += 1
+            return value
+        self.hits += 1
+        return value
+
+    def keys(self):
+        return list(self._values)
+
+    def column(self, name):
+        return self.get(("column", name), lambda: self.data[name].to_numpy(dtype=np.float64))
+
+    def rolling_sum(self, column, window):
+        return self.get(("rolling_sum", column, window), lambda: rolling_sum(self.column(column), window))
+
+    def rolling_mean(self, column, window):
+        """pandas ``rolling(window).mean()`` (the idiom of the older strategies)"""
+        return self.get(("rolling_mean", column, window),
+                        lambda: pd.Series(self.column(column)).rolling(window=window).mean().to_numpy())
+
+    def ema(self, column, span):
+        """pandas ``ewm(span, adjust=False).mean()``"""
+        return self.get(("ema", column, span),
+                        lambda: pd.Series(self.column(column)).ewm(span=span, adjust=False).mean().to_numpy())
+
+    def moments(self, column, window):
+        """(mean, std, z) from the rolling-moments kernel"""
+        return self.get(("moments", column, window), lambda: rolling_moments(self.column(column), window))
+
+    def sliding_max(self, column, window):
+        return self.get(("sliding_max", column, window), lambda: sliding_max(self.column(column), window))
+
+    def sliding_min(self, column, window):
+        return self.get(("sliding_min", column, window), lambda: sliding_min(self.column(column), window))
+
+    def session_vwap(self):
+        def compute():
+            sessions = session_keys(epoch_seconds(self.data.index))
+            return session_vwap(sessions, self.column("High"), self.column("Low"),
+                                self.column("Close"), self.column("Volume"))
+        return self.get(("session_vwap",), compute)
+
+    def rsi(self, period):
+        """RSI from simple rolling means of gains and losses, NaN filled with 50"""
+        def compute():
+            delta = np.diff(self.column("Close"), prepend=np.nan)
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = -np.where(delta < 0, delta, 0.0)
+            avg_gain = pd.Series(gain).rolling(window=period).mean()
+            avg_loss = pd.Series(loss).rolling(window=period).mean()
+            rs = avg_gain / avg_loss.replace(0, 0.00001)
+            return (100 - (100 / (1 + rs))).fillna(50).to_numpy()
+        return self.get(("rsi", period), compute)
+
+
+class StrategyPlan:
+    """Evaluates many strategy instances over the same candles with shared work
+
+    Compiling groups instances whose type and parameters are identical
+    (``plan_key``), so each distinct configuration runs once. Running hands
+    every distinct strategy the same IndicatorCache, so an indicator shared
+    by several configurations (the same EMA, band or VWAP) is computed once
+    per frame. Strategies without a ``signals`` implementation fall back to
+    ``analyze``.
+    """
+
+    def __init__(self, strategies):
+        # Accept {name: strategy} or a list (named by strategy.name)
+        if not isinstance(strategies, dict):
+            strategies = {s.name: s for s in strategies}
+        self.strategies = dict(strategies)
+        self.compile()
+
+    def compile(self):
+        """Group instances by plan key; call again after changing parameters"""
+        self._groups = {}  # plan key -> (strategy that runs, [names])
+        for name, strategy in self.strategies.items():
+            key = strategy.plan_key()
+            if key in self._groups:
+                self._groups[key][1].append(name)
+            else:
+                self._groups[key] = (strategy, [name])
+        self.last_cache = None
+        return self
+
+    @property
+    def distinct(self):
+        """Number of configurations that actually run"""
+        return len(self._groups)
+
+    def run(self, data):
+        """{name: (buy, sell)} 0/1 arrays for every instance over one OHLCV frame"""
+        cache = IndicatorCache(data)
+        results = {}
+        for strategy, names in self._groups.values():
+            try:
+                signals = strategy.signals(cache)
+            except Exception as e:
+                print(f"Plan error in {strategy.name}: {str(e)}")
+                continue
+            for name in names:
+                results[name] = signals
+        self.last_cache = cache
+        return results
+
+    def describe(self):
+        """Instances, distinct configurations and indicators of the last run, for logging"""
+        cache = self.last_cache
+        return {
+            "instances": len(self.strategies),
+            "distinct": self.distinct,
+            "indicators": len(cache.keys()) if cache else None,
+            "indicator_reuses": cache.hits if cache else None,
+        }
+
+
+def params_key(parameters):
+    """Hashable, order-independent form of a parameters dict"""
+    return json.dumps(parameters, sort_keys=True, default=str)
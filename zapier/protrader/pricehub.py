@@ -0,0 +1,162 @@
+import threading
+import time
+import traceback
+from collections import namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+# Immutable view of the latest quotes; replaced (never mutated) on every cycle
+PriceSnapshot = namedtuple("PriceSnapshot", [
+    "version",   # Increments on every published cycle
+    "time",      # Epoch seconds of the cycle
+    "quotes",    # symbol -> quote dict (ltp, change, change_percent, source)
+    "stale",     # frozenset of symbols no source could refresh this cycle
+])
+
+_EMPTY = PriceSnapshot(0, 0.0, MappingProxyType({}), frozenset())
+
+
+class PriceSeries:
+    """Rolling (time, price) window for one symbol, numbered by sequence
+
+    Points live in preallocated numpy rings. Every append gets the next
+    sequence number, so a client that remembers the last number it drew can
+    ask for just the newer points with ``since``.
+    """
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._seq = 0   # Sequence number of the newest point; also the total appended
+        self._lock = threading.Lock()
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def append(self, ts, price):
+        with self._lock:
+            i = self._seq % self.capacity
+            self._times[i] = ts
+            self._prices[i] = price
+            self._seq += 1
+            return self._seq
+
+    def since(self, seq=0):
+        """(times, prices, last_seq) for points after ``seq``, at most one window"""
+        with self._lock:
+            last = self._seq
+            first = max(seq, last - self.capacity, 0)
+            idx = np.arange(first, last) % self.capacity
+            return self._times[idx], self._prices[idx], last
+
+    def window(self):
+        """Everything still in the window: (times, prices, last_seq)"""
+        return self.since(0)
+
+
+class PriceHub:
+    """Single background poller that every dashboard viewer reads from
+
+    ``sources`` are callables taking a list of symbols and returning
+    ``{symbol: quote}`` for the ones they could price. They are tried in
+    order once per cycle, each only for the symbols still missing, so every
+    symbol is fetched at most once per ``interval`` no matter how many
+    callbacks or browser tabs are reading. Symbols nobody could price keep
+    their previous quote and are listed in ``snapshot.stale``.
+
+    Each cycle publishes a new PriceSnapshot by reference swap, so readers
+    never take a lock and never see a half-updated set of quotes. Streaming
+    readers can block in ``wait_for`` until a newer version is published.
+    Every refreshed price is also appended to the symbol's PriceSeries
+    (``history`` points), which charts read incrementally.
+    """
+
+    def __init__(self, sources, symbols, interval=2.0, history=600):
+        self.sources = list(sources)
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.snapshot = _EMPTY
+        self.series = {symbol: PriceSeries(history) for symbol in self.symbols}
+        self._stop = threading.Event()
+        self._published = threading.Condition()
+        self._listeners = []
+        self._thread = None
+
+    def add_listener(self, callback):
+        """Call ``callback(snapshot)`` on the poller thread after every publish"""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start the poller thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="price-hub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def quote(self, symbol):
+        """Latest quote for a symbol, or None before the first successful fetch"""
+        return self.snapshot.quotes.get(symbol)
+
+    def ltp(self, symbol, default=None):
+        quote = self.snapshot.quotes.get(symbol)
+        return default if quote is None else quote["ltp"]
+
+    def wait_for(self, version, timeout=None):
+        """Block until a snapshot newer than ``version`` exists (or timeout); returns the latest"""
+        with self._published:
+            self._published.wait_for(lambda: self.snapshot.version > version, timeout)
+        return self.snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def poll(self):
+        """Fetch every symbol once and publish the result; returns the new snapshot"""
+        fresh = {}
+        missing = list(self.symbols)
+        for source in self.sources:
+            if not missing:
+                break
+            try:
+                fetched = source(missing) or {}
+            except Exception as e:
+                print(f"Price source {getattr(source, '__name__', source)} failed: {e}")
+                continue
+            for symbol in missing:
+                quote = fetched.get(symbol)
+                if quote is not None and quote.get("ltp"):
+                    fresh[symbol] = quote
+            missing = [s for s in missing if s not in fresh]
+
+        now = time.time()
+        for symbol, quote in fresh.items():
+            self.series[symbol].append(now, quote["ltp"])
+
+        previous = self.snapshot
+        quotes = dict(previous.quotes)
+        quotes.update(fresh)
+        snapshot = PriceSnapshot(
+            previous.version + 1, now, MappingProxyType(quotes), frozenset(missing)
+        )
+        with self._published:
+            self.snapshot = snapshot
+            self._published.notify_all()
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception:
+                traceback.print_exc()
+        return snapshot
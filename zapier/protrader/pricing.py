@@ -0,0 +1,169 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Strike spacing for index options; stocks use a ladder based on price
+STRIKE_INTERVALS = {
+    "NIFTY": 50,
+    "BANKNIFTY": 100,
+    "FINNIFTY": 50,
+    "SENSEX": 100,
+    "MIDCPNIFTY": 50
+}
+
+# Underlyings whose ITM/OTM strikes sit two intervals from ATM
+INDEX_UNDERLYINGS = ("NIFTY", "BANKNIFTY", "FINNIFTY", "SENSEX")
+
+# Current realistic IV values for different underlyings
+# (as of May 2024, based on market data)
+IMPLIED_VOLATILITY = {
+    "NIFTY": 0.12,       # 12% IV for Nifty
+    "BANKNIFTY": 0.15,   # 15% IV for Bank Nifty
+    "FINNIFTY": 0.14,    # 14% IV for Fin Nifty
+    "SENSEX": 0.10,      # 10% IV for Sensex
+    "RELIANCE": 0.22,    # 22% IV for Reliance
+    "HDFCBANK": 0.20,    # 20% IV for HDFC Bank
+    "TCS": 0.18,         # 18% IV for TCS
+    "default": 0.25      # 25% IV default for other stocks
+}
+
+# Minimum premium per underlying (for very far OTM options)
+MIN_PREMIUMS = {
+    "NIFTY": 3.0,
+    "BANKNIFTY": 5.0,
+    "FINNIFTY": 3.0,
+    "SENSEX": 5.0,
+    "default": 0.5
+}
+
+
+def strike_interval(symbol, price):
+    """Strike spacing for ``symbol``: the index table, else a ladder on the stock's price"""
+    if symbol in STRIKE_INTERVALS:
+        return STRIKE_INTERVALS[symbol]
+    if price > 5000:
+        return 100
+    if price > 2000:
+        return 50
+    if price > 1000:
+        return 20
+    if price > 500:
+        return 10
+    if price > 200:
+        return 5
+    return 2.5
+
+
+def select_strike(symbol, price, option_type, selection="ATM"):
+    """ATM, ITM or OTM strike for a CALL or PUT on ``symbol`` at ``price``"""
+    interval = strike_interval(symbol, price)
+    atm_strike = round(price / interval) * interval
+    if selection not in ("ITM", "OTM"):
+        return atm_strike
+
+    # ITM calls and OTM puts are below the price; indices go 2 intervals deep
+    steps = 2 if symbol in INDEX_UNDERLYINGS else 1
+    below = (selection == "ITM") == (option_type == "CALL")
+    return atm_strike - interval * steps if below else atm_strike + interval * steps
+
+
+def estimate_premium(symbol, spot, strike, option_type, days_to_expiry, rng=np.random):
+    """Realistic option premium: intrinsic value plus an IV-scaled time value and a random bid/ask offset
+
+    ``option_type`` is "CALL" or "PUT". IV rises in the last week before
+    expiry, and the premium is floored at the underlying's minimum tick.
+    """
+    days_to_expiry = max(1, days_to_expiry)
+    iv = IMPLIED_VOLATILITY.get(symbol, IMPLIED_VOLATILITY["default"])
+
+    # IV tends to rise as expiry approaches
+    if days_to_expiry < 3:
+        iv *= 1.5  # IV spike in last 2 days
+    elif days_to_expiry < 7:
+        iv *= 1.2  # Higher IV in last week
+
+    # Calculate moneyness (how far ITM/OTM)
+    moneyness = abs(spot - strike) / spot
+    if option_type == "CALL":
+        intrinsic = max(0, spot - strike)
+    else:  # PUT
+        intrinsic = max(0, strike - spot)
+
+    # Time value is highest for ATM options and declines for both ITM and OTM
+    time_value_factor = (1 - moneyness * 2.5) if moneyness < 0.4 else 0
+    time_value_factor = max(0, time_value_factor)
+    time_value = spot * iv * time_value_factor * math.sqrt(days_to_expiry / 365.0)
+    premium = intrinsic + time_value
+
+    # Add typical bid-ask spread and some randomness for realism
+    if premium > 0:
+        spread = premium * 0.05  # 5% spread
+        premium = premium + (rng.uniform(-0.5, 0.5) * spread)
+
+    premium = max(premium, MIN_PREMIUMS.get(symbol, MIN_PREMIUMS["default"]))
+    return round(premium, 1) if premium > 100 else round(premium, 2)
+
+
+def resolve_instrument(symbol, signal, current_price, instrument_type="FUTURES", now=None):
+    """Map an underlying signal to the traded contract, its entry price and trade side
+
+    Stocks trade as themselves. Indices can't be traded directly: FUTURES
+    maps to the current month's contract (last Thursday), OPTIONS buys the
+    ATM weekly call on BUY and put on SELL, priced from intrinsic plus a
+    simple time value.
+    """
+    is_index = any(idx in symbol.upper() for idx in ["NIFTY", "BANKNIFTY", "FINNIFTY"])
+    if not is_index:
+        return symbol, current_price, signal
+
+    now = datetime.now() if now is None else now
+    if instrument_type == "FUTURES":
+        # Get current month's expiry (last Thursday of month)
+        if now.month == 12:
+            next_month = 1
+            next_year = now.year + 1
+        else:
+            next_month = now.month + 1
+            next_year = now.year
+
+        last_day = datetime(next_year, next_month, 1) - timedelta(days=1)
+        offset = (last_day.weekday() - 3) % 7  # 3 is Thursday
+        last_thursday = last_day - timedelta(days=offset)
+        expiry_str = last_thursday.strftime("%d%b%y").upper()
+
+        # Format: SYMBOL EXPIRY FUT
+        return f"{symbol} {expiry_str} FUT", current_price, signal  # Use index price for futures
+
+    # OPTIONS - buy calls on BUY signals, puts on SELL signals
+    option_type = "CE" if signal == "BUY" else "PE"
+    interval = STRIKE_INTERVALS.get(symbol, 50)
+    strike_price = round(current_price / interval) * interval
+
+    # Current week's expiry
+    days_to_thursday = (3 - now.weekday()) % 7  # 3 is Thursday
+    if days_to_thursday == 0 and now.hour >= 15:  # After market close on Thursday
+        days_to_thursday = 7  # Use next Thursday
+    expiry_date = now + timedelta(days=days_to_thursday)
+    expiry_str = expiry_date.strftime("%d%b%y").upper()
+
+    # Calculate realistic option premium
+    days_to_expiry = max(1, (expiry_date - now).days + 1)
+    iv_values = {
+        "NIFTY": 0.12,
+        "BANKNIFTY": 0.16,
+        "FINNIFTY": 0.14
+    }
+    iv = iv_values.get(symbol, 0.14)
+
+    if option_type == "CE":
+        intrinsic = max(0, current_price - strike_price)
+    else:  # PE
+        intrinsic = max(0, strike_price - current_price)
+
+    # Simple time value calculation (just for realistic pricing)
+    time_value = current_price * iv * (days_to_expiry / 365) * (1 - abs(strike_price - current_price) / current_price)
+    entry_price = max(intrinsic + time_value, 0.5)  # Minimum 0.5 premium
+
+    # Format: SYMBOL EXPIRY STRIKE CE/PE (always long premium)
+    return f"{symbol} {expiry_str} {int(strike_price)} {option_type}", entry_price, "BUY"
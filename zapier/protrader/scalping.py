@@ -0,0 +1,188 @@
+import math
+import time
+from array import array
+
+import numpy as np
+
+# on_tick results
+HOLD = 0
+OPEN_LONG = 1
+OPEN_SHORT = -1
+CLOSE = 2
+
+
+def _ring(size):
+    """Preallocated ring of doubles (array.array: cheap scalar reads and writes)"""
+    return array("d", bytes(8 * size))
+
+
+class TickScalper:
+    """Futures scalper driven by top-of-book ticks, with a fixed per-tick cost
+
+    Every tick updates three rolling signals held in preallocated rings:
+    the average bid/ask spread and the average book imbalance
+    ``(bid_qty - ask_qty) / (bid_qty + ask_qty)`` over the last ``window``
+    ticks (rings of raw values: the total adds the new value and drops the
+    one leaving, and is re-summed exactly once per window), and the mid-price
+    change over the last ``momentum_ticks`` ticks. When flat, it buys at the
+    ask when the imbalance leans to the bid by ``imbalance_threshold`` and
+    momentum is at least ``momentum_threshold`` ticks up, with the current
+    spread no wider than ``max_spread_ticks``; shorts mirror that. A
+    position exits at ``target_ticks`` profit, ``stop_ticks`` loss or after
+    ``max_hold`` ticks, at the far side of the book.
+
+    ``on_tick`` does scalar arithmetic only: no pandas, no numpy, and no
+    container is created unless a trade closes.
+    """
+
+    def __init__(self, tick_size=0.05, window=50, momentum_ticks=20, imbalance_threshold=0.3,
+                 momentum_threshold=2, max_spread_ticks=2, target_ticks=4, stop_ticks=4, max_hold=500, qty=1):
+        self.tick_size = tick_size
+        self.window = window
+        self.momentum_ticks = momentum_ticks
+        self.imbalance_threshold = imbalance_threshold
+        self.momentum_threshold = momentum_threshold * tick_size
+        self.max_spread = (max_spread_ticks + 0.5) * tick_size
+        self.target = target_ticks * tick_size
+        self.stop = stop_ticks * tick_size
+        self.max_hold = max_hold
+        self.qty = qty
+        self.warmup = max(window, momentum_ticks + 1)
+
+        self._spreads = _ring(window)
+        self._imbalances = _ring(window)
+        self._mids = _ring(momentum_ticks + 1)
+        self.reset()
+
+    def reset(self):
+        for ring in (self._spreads, self._imbalances, self._mids):
+            for i in range(len(ring)):
+                ring[i] = 0.0
+        self.count = 0
+        self._spread_total = 0.0
+        self._imbalance_total = 0.0
+        self.bid = self.ask = 0.0
+        self.avg_spread = self.avg_imbalance = self.momentum = 0.0
+        self.position = 0        # 1 long, -1 short, 0 flat
+        self.entry_price = 0.0
+        self.entry_tick = 0
+        self.realized_pnl = 0.0
+        self.wins = 0
+        self.trades = []         # (entry_tick, exit_tick, side, entry, exit, pnl, reason)
+
+    def on_tick(self, bid, ask, bid_qty, ask_qty):
+        """Process one quote; returns HOLD, OPEN_LONG, OPEN_SHORT or CLOSE"""
+        count = self.count + 1
+        self.count = count
+        self.bid = bid
+        self.ask = ask
+        spread = ask - bid
+        depth = bid_qty + ask_qty
+        imbalance = (bid_qty - ask_qty) / depth if depth > 0 else 0.0
+
+        # Rolling sums: add the new value, drop the one leaving the window
+        window = self.window
+        i = count % window
+        spreads = self._spreads
+        imbalances = self._imbalances
+        self._spread_total += spread - spreads[i]
+        self._imbalance_total += imbalance - imbalances[i]
+        spreads[i] = spread
+        imbalances[i] = imbalance
+        if i == 0:
+            # Re-sum once per window so rounding never accumulates
+            self._spread_total = math.fsum(spreads)
+            self._imbalance_total = math.fsum(imbalances)
+        mids = self._mids
+        span = self.momentum_ticks + 1
+        mid = (bid + ask) * 0.5
+        mids[count % span] = mid
+        if count < self.warmup:
+            return HOLD
+
+        self.avg_spread = avg_spread = self._spread_total / window
+        self.avg_imbalance = avg_imbalance = self._imbalance_total / window
+        self.momentum = momentum = mid - mids[(count - self.momentum_ticks) % span]
+
+        position = self.position
+        if position == 0:
+            if spread > self.max_spread:
+                return HOLD
+            if avg_imbalance >= self.imbalance_threshold and momentum >= self.momentum_threshold:
+                self.position, self.entry_price, self.entry_tick = 1, ask, count
+                return OPEN_LONG
+            if avg_imbalance <= -self.imbalance_threshold and momentum <= -self.momentum_threshold:
+                self.position, self.entry_price, self.entry_tick = -1, bid, count
+                return OPEN_SHORT
+            return HOLD
+
+        # Exit at the side we would trade against
+        exit_price = bid if position == 1 else ask
+        move = (exit_price - self.entry_price) * position
+        if move >= self.target:
+            self._close(exit_price, "TARGET")
+        elif move <= -self.stop:
+            self._close(exit_price, "STOP")
+        elif count - self.entry_tick >= self.max_hold:
+            self._close(exit_price, "TIME")
+        else:
+            return HOLD
+        return CLOSE
+
+    def _close(self, exit_price, reason):
+        pnl = (exit_price - self.entry_price) * self.position * self.qty
+        self.realized_pnl += pnl
+        if pnl > 0:
+            self.wins += 1
+        self.trades.append((self.entry_tick, self.count, self.position, self.entry_price, exit_price, pnl, reason))
+        self.position = 0
+
+    def flatten(self, reason="FLATTEN"):
+        """Close any open position at the last quote"""
+        if self.position:
+            self._close(self.bid if self.position == 1 else self.ask, reason)
+
+    def process(self, bids, asks, bid_qtys, ask_qtys):
+        """Feed a block of ticks (sequences of floats); returns the number of opens and closes"""
+        on_tick = self.on_tick
+        actions = 0
+        for bid, ask, bid_qty, ask_qty in zip(bids, asks, bid_qtys, ask_qtys):
+            if on_tick(bid, ask, bid_qty, ask_qty):
+                actions += 1
+        return actions
+
+    @property
+    def win_rate(self):
+        return self.wins / len(self.trades) * 100 if self.trades else 0.0
+
+
+def simulate_ticks(n, start=22450.0, tick_size=0.05, seed=None):
+    """Synthetic top-of-book ticks (bid, ask, bid_qty, ask_qty) where book imbalance leads the price"""
+    rng = np.random.default_rng(seed)
+    # Imbalance: smoothed noise in (-1, 1)
+    kernel = np.exp(-np.arange(60) / 15.0)
+    imbalance = np.tanh(np.convolve(rng.normal(0, 1, n + 59), kernel / kernel.sum(), "valid") * 3.0)
+    steps = np.rint(rng.normal(0.35 * imbalance, 0.8)).astype(np.int64)
+    bid = np.round(start / tick_size) * tick_size + tick_size * np.cumsum(steps)
+    spread = tick_size * np.where(rng.random(n) < 0.85, 1, 2)
+    depth = rng.integers(50, 500, n).astype(np.float64)
+    return bid, bid + spread, np.round(depth * (1 + imbalance) / 2), np.round(depth * (1 - imbalance) / 2)
+
+
+def benchmark(n=1_000_000, seed=0):
+    """Time TickScalper.on_tick over ``n`` simulated ticks; returns ticks per second"""
+    bid, ask, bid_qty, ask_qty = (a.tolist() for a in simulate_ticks(n, seed=seed))
+    scalper = TickScalper()
+    started = time.perf_counter()
+    scalper.process(bid, ask, bid_qty, ask_qty)
+    elapsed = time.perf_counter() - started
+    rate = n / elapsed
+    print(f"{n:,} ticks in {elapsed:.3f}s: {rate:,.0f} ticks/s ({elapsed / n * 1e6:.2f} us/tick)")
+    print(f"{len(scalper.trades)} trades, win rate {scalper.win_rate:.1f}%, P&L {scalper.realized_pnl:,.2f}")
+    return rate
+
+
+if __name__ == "__main__":
+    import sys
+    rate = benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+    sys.exit(0 if rate >= 50_000 else 1)
@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .plan import StrategyPlan
+from .market_data import OHLCV_COLUMNS
+
+
+# Default scanner universe: the indices and equities quoted on the strategy page
+SCANNER_UNIVERSE = [
+    "NIFTY", "BANKNIFTY", "FINNIFTY", "SENSEX",
+    "RELIANCE", "HDFCBANK", "TCS", "INFY", "TATAMOTORS",
+    "ICICIBANK", "BHARTIARTL", "ADANIENT", "SBIN", "BAJFINANCE"
+]
+
+
+def _scan_symbol_worker(candles_name, times_name, shape, row, length, symbol, strategies, lookback_bars):
+    """Run every strategy on one symbol's candles read from shared memory (process pool worker)"""
+    candles_shm = shared_memory.SharedMemory(name=candles_name)
+    times_shm = shared_memory.SharedMemory(name=times_name)
+    try:
+        n_bars = shape[1]
+        candles = np.ndarray(shape, dtype=np.float64, buffer=candles_shm.buf)[row, n_bars - length:]
+        times = np.ndarray(shape[:2], dtype=np.int64, buffer=times_shm.buf)[row, n_bars - length:]
+
+        # Copy out of the shared buffer before releasing it
+        df = pd.DataFrame(candles.copy(), columns=OHLCV_COLUMNS, index=pd.to_datetime(times.copy(), unit="ns"))
+        df.index.name = "Date"
+    finally:
+        candles_shm.close()
+        times_shm.close()
+
+    if df.empty:
+        return []
+
+    # One plan per symbol: strategies share indicator arrays and identical configs run once
+    signals = StrategyPlan(strategies).run(df)
+    rows = []
+    for key, strategy in strategies.items():
+        if key not in signals:
+            continue
+
+        # Most recent non-neutral signal within the lookback window
+        last_signal, bars_ago = "NEUTRAL", None
+        buys, sells = (a[-lookback_bars:] for a in signals[key])
+        for offset in range(len(buys) - 1, -1, -1):
+            if buys[offset] == 1:
+                last_signal, bars_ago = "BUY", len(buys) - 1 - offset
+                break
+            if sells[offset] == 1:
+                last_signal, bars_ago = "SELL", len(buys) - 1 - offset
+                break
+
+        rows.append({
+            "symbol": symbol,
+            "strategy": key,
+            "strategy_name": strategy.name,
+            "signal": "BUY" if buys[-1] == 1 else "SELL" if sells[-1] == 1 else "NEUTRAL",
+            "last_signal": last_signal,
+            "bars_ago": bars_ago,
+            "close": float(df['Close'].iloc[-1]),
+            "bar_time": df.index[-1]
+        })
+    return rows
+
+
+class StrategyScanner:
+    """Evaluates every registered strategy across a symbol universe in a process pool.
+
+    Candles for all symbols are packed into one shared-memory block per scan, so each
+    worker reads its symbol without the arrays being pickled through the pool. After
+    ``shutdown`` the scanner is closed: a scan still running elsewhere can't start a
+    new pool, and ``scan`` returns None.
+    """
+
+    def __init__(self, strategies, universe=None, max_workers=None, lookback_bars=5):
+        self.strategies = strategies
+        self.universe = list(universe) if universe else list(SCANNER_UNIVERSE)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.lookback_bars = lookback_bars
+        self._executor = None
+        self._closed = False
+        self._lock = threading.Lock()  # Guards _executor/_closed between a scan and shutdown
+        self.last_results = None
+        self.last_scan_seconds = 0.0
+
+    def _get_executor(self):
+        """The process pool, created on first use; None once the scanner is shut down"""
+        with self._lock:
+            if self._closed:
+                return None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def scan(self, candles_by_symbol):
+        """
+        Scan the given candles ({symbol: OHLCV DataFrame}).
+
+        Returns:
+            DataFrame of signals ranked best first, or None if the scanner was shut down
+        """
+        if self._closed:
+            return None
+        start = time.perf_counter()
+        symbols = [s for s in self.universe if candles_by_symbol.get(s) is not None and not candles_by_symbol[s].empty]
+        if not symbols:
+            self.last_results = self._rank([])
+            return self.last_results
+
+        n_bars = max(len(candles_by_symbol[s]) for s in symbols)
+        shape = (len(symbols), n_bars, len(OHLCV_COLUMNS))
+
+        candles_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        times_shm = shared_memory.SharedMemory(create=True, size=shape[0] * shape[1] * 8)
+        try:
+            candles = np.ndarray(shape, dtype=np.float64, buffer=candles_shm.buf)
+            times = np.ndarray(shape[:2], dtype=np.int64, buffer=times_shm.buf)
+            candles.fill(np.nan)
+            times.fill(0)
+
+            # Right-align each symbol so the latest bar is always the last column
+            lengths = []
+            for row, symbol in enumerate(symbols):
+                df = candles_by_symbol[symbol]
+                length = len(df)
+                candles[row, n_bars - length:] = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+                times[row, n_bars - length:] = np.asarray(pd.DatetimeIndex(df.index), dtype="datetime64[ns]").view(np.int64)
+                lengths.append(length)
+
+            executor = self._get_executor()
+            if executor is None:
+                return None
+            futures = [
+                executor.submit(
+                    _scan_symbol_worker, candles_shm.name, times_shm.name, shape,
+                    row, lengths[row], symbol, self.strategies, self.lookback_bars
+                )
+                for row, symbol in enumerate(symbols)
+            ]
+
+            rows = []
+            for future in futures:
+                try:
+                    rows.extend(future.result())
+                except Exception as e:
+                    print(f"Scanner worker failed: {str(e)}")
+        finally:
+            candles_shm.close()
+            candles_shm.unlink()
+            times_shm.close()
+            times_shm.unlink()
+
+        self.last_results = self._rank(rows)
+        self.last_scan_seconds = time.perf_counter() - start
+        return self.last_results
+
+    @staticmethod
+    def _rank(rows):
+        """Rank fresh signals confirmed by several strategies on the same symbol first"""
+        columns = ["symbol", "strategy", "strategy_name", "signal", "last_signal",
+                   "bars_ago", "close", "bar_time", "agreement", "score"]
+        if not rows:
+            return pd.DataFrame(columns=columns)
+
+        table = pd.DataFrame(rows)
+        active = table['last_signal'] != "NEUTRAL"
+
+        # Number of strategies on the symbol pointing the same way
+        table['agreement'] = table.groupby(['symbol', 'last_signal'])['strategy'].transform('count')
+        table.loc[~active, 'agreement'] = 0
+
+        bars_ago = table['bars_ago'].fillna(0).astype(float)
+        table['score'] = np.where(active, table['agreement'] / (1.0 + bars_ago), 0.0)
+
+        table = table.sort_values(['score', 'symbol'], ascending=[False, True]).reset_index(drop=True)
+        return table[columns]
+
+    def shutdown(self):
+        """Close the scanner and its pool; it can't be restarted"""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
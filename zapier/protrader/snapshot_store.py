@@ -0,0 +1,182 @@
+import json
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+
+import numpy as np
+
+from .pricehub import PriceSnapshot, _EMPTY
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS quotes (symbol TEXT PRIMARY KEY, quote TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS series (
+    symbol TEXT NOT NULL, seq INTEGER NOT NULL, time REAL NOT NULL, price REAL NOT NULL,
+    PRIMARY KEY (symbol, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+    # WAL lets any number of readers run while the collector writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SnapshotStore:
+    """Collector side: mirrors a PriceHub (plus extra state) into a SQLite file
+
+    Register ``publish`` as a hub listener in the one process that talks to
+    the brokers. Each publish is a single transaction holding the quotes,
+    the new series points (older ones beyond ``history`` are trimmed), the
+    extra state as JSON and the snapshot version, so readers in other
+    processes always see a consistent cycle.
+
+    Reopening an existing file (a collector restart) continues its
+    numbering: the new hub's versions and series sequence numbers are
+    written after the stored ones, so readers waiting on a version or a
+    seq keep moving and each series stays in time order.
+    """
+
+    def __init__(self, path, history=600):
+        self.path = path
+        self.history = history
+        self._conn = _connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._written = {}  # symbol -> last hub series seq already stored
+        self._lock = threading.Lock()
+        # Stored numbering to continue from; hub versions and seqs restart at 0 in a new process
+        meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        self._version_base = int(meta.get("version", 0))
+        self._seq_base = dict(self._conn.execute("SELECT symbol, MAX(seq) FROM series GROUP BY symbol").fetchall())
+
+    def publish(self, snapshot, series=None, state=None):
+        """Write one hub cycle; ``series`` is the hub's symbol -> PriceSeries map"""
+        points = []
+        for symbol, s in (series or {}).items():
+            times, prices, last = s.since(self._written.get(symbol, 0))
+            first = self._seq_base.get(symbol, 0) + last - len(times) + 1
+            points.extend((symbol, first + i, float(t), float(p))
+                          for i, (t, p) in enumerate(zip(times, prices)))
+            self._written[symbol] = last
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO quotes (symbol, quote) VALUES (?, ?)",
+                    [(symbol, json.dumps(quote, default=str)) for symbol, quote in snapshot.quotes.items()]
+                )
+                conn.executemany("INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?)", points)
+                for symbol, last in self._written.items():
+                    conn.execute("DELETE FROM series WHERE symbol = ? AND seq <= ?",
+                                 (symbol, self._seq_base.get(symbol, 0) + last - self.history))
+                for key, value in (state or {}).items():
+                    conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                                 (key, json.dumps(value, default=str)))
+                conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+                    ("version", self._version_base + snapshot.version),
+                    ("time", snapshot.time),
+                    ("stale", json.dumps(sorted(snapshot.stale))),
+                ])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+
+class _StoredSeries:
+    """PriceSeries-compatible reader over the ``series`` table"""
+
+    def __init__(self, reader, symbol):
+        self._reader = reader
+        self.symbol = symbol
+
+    def since(self, seq=0):
+        rows = self._reader._query(
+            "SELECT seq, time, price FROM series WHERE symbol = ? AND seq > ? ORDER BY seq",
+            (self.symbol, seq)
+        )
+        if not rows:
+            return np.empty(0), np.empty(0), seq
+        data = np.array(rows, dtype=np.float64)
+        return data[:, 1], data[:, 2], int(data[-1, 0])
+
+    def window(self):
+        return self.since(0)
+
+
+class _SeriesMap(dict):
+    def __init__(self, reader):
+        super().__init__()
+        self._reader = reader
+
+    def __missing__(self, symbol):
+        series = self[symbol] = _StoredSeries(self._reader, symbol)
+        return series
+
+
+class SnapshotReader:
+    """Worker side: the PriceHub read interface (snapshot, quote, series, wait_for) over a SnapshotStore file
+
+    Every web worker process opens its own reader; none of them fetch
+    prices. ``snapshot`` re-reads the quotes only when the collector has
+    published a new version, so most calls are a single indexed lookup.
+    """
+
+    def __init__(self, path, poll_interval=0.25):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.series = _SeriesMap(self)
+        self._local = threading.local()
+        self._cached = _EMPTY
+
+    def _query(self, sql, params=()):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+            conn.executescript(_SCHEMA)
+        return conn.execute(sql, params).fetchall()
+
+    def _meta(self):
+        return dict(self._query("SELECT key, value FROM meta"))
+
+    @property
+    def snapshot(self):
+        meta = self._meta()
+        version = int(meta.get("version", 0))
+        cached = self._cached
+        if version == cached.version:
+            return cached
+        quotes = {symbol: json.loads(quote) for symbol, quote in self._query("SELECT symbol, quote FROM quotes")}
+        snapshot = PriceSnapshot(version, float(meta.get("time", 0.0)), MappingProxyType(quotes),
+                                 frozenset(json.loads(meta.get("stale", "[]"))))
+        self._cached = snapshot
+        return snapshot
+
+    def quote(self, symbol):
+        return self.snapshot.quotes.get(symbol)
+
+    def ltp(self, symbol, default=None):
+        quote = self.snapshot.quotes.get(symbol)
+        return default if quote is None else quote["ltp"]
+
+    def state(self):
+        """Extra state written by the collector (positions, funds, ...)"""
+        return {key: json.loads(value) for key, value in self._query("SELECT key, value FROM state")}
+
+    def wait_for(self, version, timeout=None):
+        """Poll until the collector publishes a version newer than ``version`` (or timeout)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.snapshot
+            if snapshot.version > version:
+                return snapshot
+            if deadline is not None and time.monotonic() >= deadline:
+                return snapshot
+            time.sleep(self.poll_interval)
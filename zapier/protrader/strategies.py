@@ -0,0 +1,869 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from .indicators import SessionVWAP, RollingSum, RollingMax, RollingMin, RollingMoments
+from .ml import candle_features, predict_rows, edge_signals, load_model, MLSignalEngine
+from .plan import IndicatorCache, shift, params_key
+
+
+class ProTraderStrategy:
+    """Base class for all trading strategies in ProTrader"""
+    
+    type_name = None  # Key in STRATEGY_TYPES, used by configs and from_dict
+    
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+        self.parameters = {}
+        
+    def add_parameter(self, name, default_value, min_value=None, max_value=None, options=None):
+        """Add a configurable parameter to the strategy"""
+        self.parameters[name] = {
+            'value': default_value,
+            'default': default_value,
+            'min': min_value,
+            'max': max_value,
+            'options': options
+        }
+        
+    def set_parameter(self, name, value):
+        """Set parameter value"""
+        if name in self.parameters:
+            self.parameters[name]['value'] = value
+            # Incremental state was built for the old value
+            self.reset()
+            
+    def get_parameter(self, name):
+        """Get parameter value"""
+        if name in self.parameters:
+            return self.parameters[name]['value']
+        return None
+        
+    def analyze(self, data):
+        """
+        Analyze the data and generate trading signals.
+        Must be implemented by subclasses.
+        
+        Returns:
+            DataFrame with signals added
+        """
+        raise NotImplementedError("Subclass must implement analyze() method")
+        
+    def signals(self, indicators):
+        """
+        Buy/Sell 0/1 arrays for the frame behind an IndicatorCache.
+        Strategies that build their signals from the cache share indicator
+        work with every other strategy in a StrategyPlan; the default just
+        runs analyze().
+        """
+        data = indicators.data
+        df = self.analyze(data)
+        zeros = np.zeros(len(data), dtype=int)
+        if df is None:
+            return zeros, zeros
+        buy = df['Buy_Signal'].to_numpy(dtype=int) if 'Buy_Signal' in df.columns else zeros
+        sell = df['Sell_Signal'].to_numpy(dtype=int) if 'Sell_Signal' in df.columns else zeros
+        return buy, sell
+        
+    def plan_key(self):
+        """Instances with equal keys produce equal signals (StrategyPlan runs them once)"""
+        return (type(self).__name__, params_key({k: v['value'] for k, v in self.parameters.items()}))
+        
+    def reset(self):
+        """Drop incremental state; the next on_bar() starts from scratch"""
+        pass
+        
+    def on_bar(self, ts, open_, high, low, close, volume):
+        """
+        Feed one finished bar (ts in epoch seconds) to the incremental path.
+        Implemented by strategies with O(1) per-bar state; must produce the
+        same signals as analyze() over the same bars.
+        
+        Returns:
+            'BUY', 'SELL', or 'NEUTRAL'
+        """
+        raise NotImplementedError(f"{self.name} has no incremental mode")
+        
+    def get_last_signal(self, data):
+        """
+        Get the latest signal from analyzed data.
+        
+        Returns:
+            'BUY', 'SELL', or 'NEUTRAL'
+        """
+        if data is None or len(data) == 0:
+            return "NEUTRAL"
+            
+        last_row = data.iloc[-1]
+        
+        if 'Buy_Signal' in last_row and last_row['Buy_Signal'] == 1:
+            return "BUY"
+        elif 'Sell_Signal' in last_row and last_row['Sell_Signal'] == 1:
+            return "SELL"
+        
+        return "NEUTRAL"
+    
+    def to_dict(self):
+        """Convert strategy to dictionary for serialization"""
+        return {
+            'type': self.type_name,
+            'name': self.name,
+            'description': self.description,
+            'parameters': {k: v['value'] for k, v in self.parameters.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create strategy instance from dictionary.
+        
+        Called on the base class, the registered class named by data['type']
+        is built. Registered strategies take no constructor arguments; name
+        and description from the dict replace their defaults.
+        """
+        if cls is ProTraderStrategy and data.get('type'):
+            try:
+                strategy_class = STRATEGY_TYPES[data['type']]
+            except KeyError:
+                raise ValueError(f"Unknown strategy type: {data['type']}")
+            return strategy_class.from_dict(data)
+        
+        if cls is ProTraderStrategy:
+            strategy = cls(data['name'], data.get('description', ""))
+        else:
+            strategy = cls()
+            strategy.name = data.get('name', strategy.name)
+            strategy.description = data.get('description', strategy.description)
+            
+        for param_name, param_value in data.get('parameters', {}).items():
+            if param_name in strategy.parameters:
+                strategy.set_parameter(param_name, param_value)
+            else:
+                print(f"Ignoring unknown parameter '{param_name}' for {strategy.name}")
+        return strategy
+
+
+class EMACrossoverStrategy(ProTraderStrategy):
+    """EMA Crossover Strategy - Uses exponential moving average crossovers to generate signals"""
+    
+    type_name = "ema_crossover"
+    
+    def __init__(self):
+        super().__init__("EMA Crossover", "Generates signals when fast EMA crosses slow EMA")
+        self.add_parameter("fast_period", 9, min_value=5, max_value=50)  # Default to 9 EMA
+        self.add_parameter("slow_period", 21, min_value=10, max_value=200)  # Default to 21 EMA
+        self.add_parameter("confirmation_candles", 1, min_value=1, max_value=3)  # Number of candles to confirm signal
+        self.add_parameter("volume_filter", True)  # Use volume filter to avoid false signals
+        
+    def signals(self, indicators):
+        fast_period = int(self.get_parameter("fast_period"))
+        slow_period = int(self.get_parameter("slow_period"))
+        confirmation_candles = int(self.get_parameter("confirmation_candles"))
+        
+        fast = indicators.ema('Close', fast_period)
+        slow = indicators.ema('Close', slow_period)
+        
+        # Volume must be above its 20-period average when the filter is enabled
+        if self.get_parameter("volume_filter"):
+            volume_condition = indicators.column('Volume') > indicators.rolling_mean('Volume', 20)
+        else:
+            volume_condition = np.ones(len(fast), dtype=bool)
+        
+        # Crossover conditions
+        bull_cross = (fast > slow) & (shift(fast, 1) <= shift(slow, 1))
+        bear_cross = (fast < slow) & (shift(fast, 1) >= shift(slow, 1))
+        
+        # 'confirmation_candles' consecutive periods on the new side of the cross
+        for i in range(1, confirmation_candles):
+            bull_cross = bull_cross & (shift(fast, -i) > shift(slow, -i))
+            bear_cross = bear_cross & (shift(fast, -i) < shift(slow, -i))
+        
+        return (bull_cross & volume_condition).astype(int), (bear_cross & volume_condition).astype(int)
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        df = data.copy()
+        indicators = IndicatorCache(df)
+        
+        df['EMA_Fast'] = indicators.ema('Close', int(self.get_parameter("fast_period")))
+        df['EMA_Slow'] = indicators.ema('Close', int(self.get_parameter("slow_period")))
+        if self.get_parameter("volume_filter"):
+            df['Avg_Volume'] = indicators.rolling_mean('Volume', 20)
+        
+        df['Buy_Signal'], df['Sell_Signal'] = self.signals(indicators)
+        return df
+
+
+class ReversalStrategy(ProTraderStrategy):
+    """Reversal Strategy - Uses overbought/oversold conditions to find potential reversals"""
+    
+    type_name = "reversal"
+    
+    def __init__(self):
+        super().__init__("Reversal Strategy", "Identifies potential market reversals using RSI and Bollinger Bands")
+        self.add_parameter("rsi_period", 14, min_value=7, max_value=30)
+        self.add_parameter("rsi_oversold", 30, min_value=10, max_value=40)
+        self.add_parameter("rsi_overbought", 70, min_value=60, max_value=90)
+        self.add_parameter("bb_period", 20, min_value=10, max_value=50)
+        self.add_parameter("bb_std", 2.0, min_value=1.0, max_value=3.0)
+        
+    def _bands(self, indicators):
+        """Bollinger mid/upper/lower, back-filled over the warm-up like the chart shows them"""
+        bb_period = int(self.get_parameter("bb_period"))
+        bb_std = float(self.get_parameter("bb_std"))
+        
+        def compute():
+            bb_mid, bb_std_val, _ = indicators.moments('Close', bb_period)
+            bands = pd.DataFrame({'mid': bb_mid, 'upper': bb_mid + bb_std * bb_std_val,
+                                  'lower': bb_mid - bb_std * bb_std_val}).bfill()
+            return bands['mid'].to_numpy(), bands['upper'].to_numpy(), bands['lower'].to_numpy()
+        return indicators.get(('bollinger', bb_period, bb_std), compute)
+        
+    def signals(self, indicators):
+        rsi_oversold = int(self.get_parameter("rsi_oversold"))
+        rsi_overbought = int(self.get_parameter("rsi_overbought"))
+        
+        close = indicators.column('Close')
+        prev_close = shift(close, 1)
+        rsi = indicators.rsi(int(self.get_parameter("rsi_period")))
+        bb_mid, bb_upper, bb_lower = self._bands(indicators)
+        
+        # Buy signal: RSI oversold + price below lower BB + price starts rising
+        buy = (rsi < rsi_oversold) & (close < bb_lower) & (close > prev_close)
+        
+        # Sell signal: RSI overbought + price above upper BB + price starts falling
+        sell = (rsi > rsi_overbought) & (close > bb_upper) & (close < prev_close)
+        
+        # Buy signal: Price crosses above middle BB after being below lower BB
+        cross_above_mid = (close > bb_mid) & (prev_close <= bb_mid)
+        prev_below_lower = shift(indicators.sliding_min('Close', 5), 3) < shift(bb_lower, 3)
+        buy |= cross_above_mid & prev_below_lower & (rsi < 50)
+        
+        # Sell signal: Price crosses below middle BB after being above upper BB
+        cross_below_mid = (close < bb_mid) & (prev_close >= bb_mid)
+        prev_above_upper = shift(indicators.sliding_max('Close', 5), 3) > shift(bb_upper, 3)
+        sell |= cross_below_mid & prev_above_upper & (rsi > 50)
+        
+        return buy.astype(int), sell.astype(int)
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        df = data.copy()
+        
+        try:
+            indicators = IndicatorCache(df)
+            df['RSI'] = indicators.rsi(int(self.get_parameter("rsi_period")))
+            df['BB_Mid'], df['BB_Upper'], df['BB_Lower'] = self._bands(indicators)
+            df['Buy_Signal'], df['Sell_Signal'] = self.signals(indicators)
+            return df
+            
+        except Exception as e:
+            print(f"Error in ReversalStrategy.analyze: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return data
+
+
+class PriceActionStrategy(ProTraderStrategy):
+    """Price Action Strategy - Uses candlestick patterns and support/resistance levels"""
+    
+    type_name = "price_action"
+    
+    def __init__(self):
+        super().__init__("Price Action", "Identifies trade opportunities based on candlestick patterns")
+        self.add_parameter("engulfing_factor", 1.1, min_value=1.0, max_value=2.0)
+        self.add_parameter("doji_threshold", 0.1, min_value=0.05, max_value=0.5)
+        self.add_parameter("trend_period", 10, min_value=5, max_value=50)
+        
+    def _trend(self, indicators):
+        """Bar-to-bar change of the trend_period moving average (0 during warm-up)"""
+        trend = np.diff(indicators.rolling_mean('Close', int(self.get_parameter("trend_period"))), prepend=np.nan)
+        trend[np.isnan(trend)] = 0
+        return trend
+        
+    def signals(self, indicators):
+        engulfing_factor = float(self.get_parameter("engulfing_factor"))
+        
+        open_ = indicators.column('Open')
+        close = indicators.column('Close')
+        body_size = np.abs(close - open_)
+        is_green = close > open_
+        is_red = close < open_
+        trend = self._trend(indicators)
+        bigger_body = body_size > shift(body_size, 1) * engulfing_factor
+        
+        # Bullish engulfing pattern in downtrend
+        bullish_engulfing = ((trend < 0) & is_green & shift(is_red, 1) & bigger_body &
+                             (open_ < shift(close, 1)) & (close > shift(open_, 1)))
+        
+        # Bearish engulfing pattern in uptrend
+        bearish_engulfing = ((trend > 0) & is_red & shift(is_green, 1) & bigger_body &
+                             (open_ > shift(close, 1)) & (close < shift(open_, 1)))
+        
+        return bullish_engulfing.astype(int), bearish_engulfing.astype(int)
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        df = data.copy()
+        indicators = IndicatorCache(df)
+        
+        # Candle anatomy and trend, kept as columns for the chart
+        df['Body_Size'] = abs(df['Close'] - df['Open'])
+        df['Candle_Range'] = df['High'] - df['Low']
+        df['Body_Percent'] = df['Body_Size'] / df['Candle_Range']
+        df['Is_Green'] = (df['Close'] > df['Open']).astype(int)
+        df['Is_Red'] = (df['Close'] < df['Open']).astype(int)
+        df['Trend'] = self._trend(indicators)
+        df['Uptrend'] = (df['Trend'] > 0).astype(int)
+        df['Downtrend'] = (df['Trend'] < 0).astype(int)
+        
+        df['Buy_Signal'], df['Sell_Signal'] = self.signals(indicators)
+        return df
+        
+
+
+class CombinationStrategy(ProTraderStrategy):
+    """Combination Strategy - Combines multiple strategies with weighted signals"""
+    
+    type_name = "combination"
+    
+    def __init__(self):
+        super().__init__("ProTrader Combined", "Combines multiple strategies for enhanced signal accuracy")
+        self.strategies = {
+            "ema": {"strategy": EMACrossoverStrategy(), "weight": 1.0, "enabled": True},
+            "reversal": {"strategy": ReversalStrategy(), "weight": 1.0, "enabled": True},
+            "price_action": {"strategy": PriceActionStrategy(), "weight": 1.0, "enabled": True}
+        }
+        self.add_parameter("min_confirmation", 2, min_value=1, max_value=3)
+        
+    def set_strategy_enabled(self, strategy_key, enabled):
+        """Enable or disable a sub-strategy"""
+        if strategy_key in self.strategies:
+            self.strategies[strategy_key]["enabled"] = enabled
+            
+    def set_strategy_weight(self, strategy_key, weight):
+        """Set the weight of a sub-strategy"""
+        if strategy_key in self.strategies:
+            self.strategies[strategy_key]["weight"] = weight
+            
+    def to_dict(self):
+        """Strategy dict plus each sub-strategy's weight, enabled flag and parameters"""
+        data = super().to_dict()
+        data['strategies'] = {
+            key: {
+                'weight': info["weight"],
+                'enabled': info["enabled"],
+                'parameters': info["strategy"].to_dict()['parameters']
+            }
+            for key, info in self.strategies.items()
+        }
+        return data
+        
+    @classmethod
+    def from_dict(cls, data):
+        strategy = super().from_dict(data)
+        for key, settings in data.get('strategies', {}).items():
+            if key not in strategy.strategies:
+                print(f"Ignoring unknown sub-strategy '{key}' for {strategy.name}")
+                continue
+            if 'weight' in settings:
+                strategy.set_strategy_weight(key, float(settings['weight']))
+            if 'enabled' in settings:
+                strategy.set_strategy_enabled(key, bool(settings['enabled']))
+            sub = strategy.strategies[key]["strategy"]
+            for param_name, param_value in settings.get('parameters', {}).items():
+                if param_name in sub.parameters:
+                    sub.set_parameter(param_name, param_value)
+                else:
+                    print(f"Ignoring unknown parameter '{param_name}' for {strategy.name} ({key})")
+        return strategy
+        
+    def plan_key(self):
+        subs = tuple((key, info["enabled"], info["weight"], info["strategy"].plan_key())
+                     for key, info in self.strategies.items())
+        return super().plan_key() + (subs,)
+        
+    def _scores(self, indicators, df=None):
+        """Weighted buy/sell scores of the enabled sub-strategies (also written to df per strategy)"""
+        n = len(indicators.data)
+        buy_score = np.zeros(n)
+        sell_score = np.zeros(n)
+        for key, strategy_info in self.strategies.items():
+            if strategy_info["enabled"]:
+                weight = strategy_info["weight"]
+                buy, sell = strategy_info["strategy"].signals(indicators)
+                buy_score += buy * weight
+                sell_score += sell * weight
+                if df is not None:
+                    df[f'{key}_Buy'] = buy
+                    df[f'{key}_Sell'] = sell
+        return buy_score, sell_score
+        
+    def signals(self, indicators, scores=None):
+        buy_score, sell_score = scores if scores is not None else self._scores(indicators)
+        
+        # Final signals need the minimum confirmation
+        min_confirmation = self.get_parameter("min_confirmation")
+        return (buy_score >= min_confirmation).astype(int), (sell_score >= min_confirmation).astype(int)
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        # Sub-strategies share one indicator cache
+        df = data.copy()
+        indicators = IndicatorCache(df)
+        scores = self._scores(indicators, df)
+        df['Combined_Buy_Score'], df['Combined_Sell_Score'] = scores
+        df['Buy_Signal'], df['Sell_Signal'] = self.signals(indicators, scores)
+        return df
+
+
+class VWAPMomentumStrategy(ProTraderStrategy):
+    """VWAP Momentum - Trades moves away from the session VWAP on above-average volume
+    
+    VWAP is the cumulative typical-price VWAP of the current session (reset at
+    09:15 IST). Volume ratio is the bar's volume over the mean of the last
+    ``lookback`` bars. A signal fires on the bar where price first gets
+    ``momentum_threshold`` percent above (BUY) or below (SELL) VWAP with the
+    volume ratio at least ``volume_factor``. analyze() computes all bars with
+    NumPy; on_bar() keeps O(1) state and returns the same signals.
+    """
+    
+    type_name = "vwap_momentum"
+    
+    def __init__(self):
+        super().__init__("VWAP Momentum", "Trades strong moves away from session VWAP confirmed by volume")
+        self.add_parameter("lookback", 20, min_value=5, max_value=100)
+        self.add_parameter("volume_factor", 1.5, min_value=1.0, max_value=5.0)
+        self.add_parameter("momentum_threshold", 0.02, min_value=0.0, max_value=2.0)  # % away from VWAP
+        self.reset()
+        
+    def reset(self):
+        self._vwap = None
+        self._volume_sum = None
+        self._prev_bull = False
+        self._prev_bear = False
+        
+    def _conditions(self, close, vwap, volume_ratio):
+        """Bull/bear setup flags; works on scalars and arrays alike"""
+        threshold = float(self.get_parameter("momentum_threshold"))
+        volume_ok = volume_ratio >= float(self.get_parameter("volume_factor"))
+        distance = (close - vwap) / vwap * 100
+        return volume_ok & (distance >= threshold), volume_ok & (distance <= -threshold)
+        
+    def _volume_ratio(self, indicators):
+        lookback = int(self.get_parameter("lookback"))
+        volume = indicators.column('Volume')
+        avg_volume = indicators.rolling_sum('Volume', lookback) / lookback
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(avg_volume > 0, volume / avg_volume, np.nan)
+        
+    def signals(self, indicators):
+        bull, bear = self._conditions(indicators.column('Close'), indicators.session_vwap(),
+                                      self._volume_ratio(indicators))
+        return (bull & ~shift(bull, 1)).astype(int), (bear & ~shift(bear, 1)).astype(int)
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        df = data.copy()
+        indicators = IndicatorCache(df)
+        df['VWAP'] = indicators.session_vwap()
+        df['Volume_Ratio'] = self._volume_ratio(indicators)
+        df['Buy_Signal'], df['Sell_Signal'] = self.signals(indicators)
+        return df
+        
+    def on_bar(self, ts, open_, high, low, close, volume):
+        if self._vwap is None:
+            lookback = int(self.get_parameter("lookback"))
+            self._vwap = SessionVWAP()
+            self._volume_sum = RollingSum(lookback)
+            
+        vwap = self._vwap.update(ts, high, low, close, volume)
+        avg_volume = self._volume_sum.update(volume) / self._volume_sum.window
+        volume_ratio = float(volume) / avg_volume if avg_volume > 0 else np.nan
+        
+        bull, bear = self._conditions(float(close), vwap, volume_ratio)
+        signal = "BUY" if bull and not self._prev_bull else "SELL" if bear and not self._prev_bear else "NEUTRAL"
+        self._prev_bull, self._prev_bear = bool(bull), bool(bear)
+        return signal
+
+
+class MeanReversionStrategy(ProTraderStrategy):
+    """Mean Reversion - Fades stretched moves back toward the short-term mean
+    
+    The z-score of the close over ``mean_period`` bars comes from the shared
+    rolling-moments kernel (mean, std and z in one pass). A BUY fires when z
+    first drops below -``std_dev`` while price holds above the
+    ``ma_period`` moving average (a dip in an uptrend); a SELL when z first
+    rises above +``std_dev`` below that average. on_bar() gives the same
+    signals with O(1) state.
+    """
+    
+    type_name = "mean_reversion"
+    
+    def __init__(self):
+        super().__init__("Mean Reversion", "Fades z-score extremes back toward the mean, with the trend")
+        self.add_parameter("ma_period", 50, min_value=10, max_value=200)
+        self.add_parameter("std_dev", 2.0, min_value=1.0, max_value=4.0)
+        self.add_parameter("mean_period", 20, min_value=5, max_value=100)
+        self.reset()
+        
+    def reset(self):
+        self._moments = None
+        self._trend_sum = None
+        self._prev_bull = False
+        self._prev_bear = False
+        
+    def _conditions(self, close, z, trend_ma):
+        """Bull/bear setup flags; works on scalars and arrays alike"""
+        threshold = float(self.get_parameter("std_dev"))
+        return (z < -threshold) & (close > trend_ma), (z > threshold) & (close < trend_ma)
+        
+    def signals(self, indicators):
+        ma_period = int(self.get_parameter("ma_period"))
+        _, _, z = indicators.moments('Close', int(self.get_parameter("mean_period")))
+        trend_ma = indicators.rolling_sum('Close', ma_period) / ma_period
+        
+        bull, bear = self._conditions(indicators.column('Close'), z, trend_ma)
+        return (bull & ~shift(bull, 1)).astype(int), (bear & ~shift(bear, 1)).astype(int)
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        df = data.copy()
+        indicators = IndicatorCache(df)
+        ma_period = int(self.get_parameter("ma_period"))
+        
+        df['Mean'], df['Std'], df['Z_Score'] = indicators.moments('Close', int(self.get_parameter("mean_period")))
+        df['Trend_MA'] = indicators.rolling_sum('Close', ma_period) / ma_period
+        df['Buy_Signal'], df['Sell_Signal'] = self.signals(indicators)
+        return df
+        
+    def on_bar(self, ts, open_, high, low, close, volume):
+        if self._moments is None:
+            self._moments = RollingMoments(int(self.get_parameter("mean_period")))
+            self._trend_sum = RollingSum(int(self.get_parameter("ma_period")))
+            
+        close = float(close)
+        _, _, z = self._moments.update(close)
+        trend_ma = self._trend_sum.update(close) / self._trend_sum.window
+        
+        bull, bear = self._conditions(close, z, trend_ma)
+        signal = "BUY" if bull and not self._prev_bull else "SELL" if bear and not self._prev_bear else "NEUTRAL"
+        self._prev_bull, self._prev_bear = bool(bull), bool(bear)
+        return signal
+
+
+def _run_lengths(flags):
+    """Length of the run of consecutive True values ending at each position"""
+    counts = np.cumsum(flags)
+    return counts - np.maximum.accumulate(np.where(flags, 0, counts))
+
+
+class BreakoutStrategy(ProTraderStrategy):
+    """Breakout Trading - Trades closes beyond the prior N-bar range on heavy volume
+    
+    The channel is the highest high / lowest low of the previous
+    ``breakout_period`` bars. A BUY (SELL) fires on the bar that completes
+    ``confirmation_candles`` consecutive closes above (below) the channel,
+    provided the first breakout bar traded at least ``volume_multiplier``
+    times the average volume of the bars before it. analyze() uses an O(n)
+    vectorized sliding max/min; on_bar() keeps monotonic deques (amortized
+    O(1) per bar), so one instance per symbol can follow hundreds of
+    1-minute streams live. Both paths give the same signals.
+    """
+    
+    type_name = "breakout"
+    
+    def __init__(self):
+        super().__init__("Breakout Trading", "Trades confirmed breakouts of the recent high/low range on volume")
+        self.add_parameter("breakout_period", 20, min_value=5, max_value=200)
+        self.add_parameter("confirmation_candles", 3, min_value=1, max_value=5)
+        self.add_parameter("volume_multiplier", 2.0, min_value=1.0, max_value=5.0)
+        self.reset()
+        
+    def reset(self):
+        self._highs = None
+        self._lows = None
+        self._volume_sum = None
+        self._prev_volume_sum = np.nan
+        self._run_up = self._run_down = 0
+        self._volume_up = self._volume_down = False
+        
+    def _channel(self, indicators):
+        """Highest high / lowest low of the *previous* breakout_period bars"""
+        period = int(self.get_parameter("breakout_period"))
+        return shift(indicators.sliding_max('High', period), 1), shift(indicators.sliding_min('Low', period), 1)
+        
+    def signals(self, indicators):
+        period = int(self.get_parameter("breakout_period"))
+        confirmation = int(self.get_parameter("confirmation_candles"))
+        multiplier = float(self.get_parameter("volume_multiplier"))
+        
+        close = indicators.column('Close')
+        volume = indicators.column('Volume')
+        upper, lower = self._channel(indicators)
+        avg_volume = shift(indicators.rolling_sum('Volume', period), 1) / period
+        volume_ok = volume >= multiplier * avg_volume
+        
+        run_up = _run_lengths(close > upper)
+        run_down = _run_lengths(close < lower)
+        
+        # Volume is judged on the first bar of the run
+        first_ok = shift(volume_ok, confirmation - 1)
+        return ((run_up == confirmation) & first_ok).astype(int), ((run_down == confirmation) & first_ok).astype(int)
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        df = data.copy()
+        indicators = IndicatorCache(df)
+        df['Breakout_High'], df['Breakout_Low'] = self._channel(indicators)
+        df['Buy_Signal'], df['Sell_Signal'] = self.signals(indicators)
+        return df
+        
+    def on_bar(self, ts, open_, high, low, close, volume):
+        if self._highs is None:
+            period = int(self.get_parameter("breakout_period"))
+            self._highs = RollingMax(period)
+            self._lows = RollingMin(period)
+            self._volume_sum = RollingSum(period)
+            
+        confirmation = int(self.get_parameter("confirmation_candles"))
+        multiplier = float(self.get_parameter("volume_multiplier"))
+        close = float(close)
+        volume = float(volume)
+        
+        # Channel from the previous bars, read before this bar enters the windows
+        upper = self._highs.value
+        lower = self._lows.value
+        volume_ok = volume >= multiplier * (self._prev_volume_sum / self._volume_sum.window)
+        
+        self._highs.push(high)
+        self._lows.push(low)
+        self._prev_volume_sum = self._volume_sum.update(volume)
+        
+        self._run_up = self._run_up + 1 if close > upper else 0
+        self._run_down = self._run_down + 1 if close < lower else 0
+        if self._run_up == 1:
+            self._volume_up = volume_ok
+        if self._run_down == 1:
+            self._volume_down = volume_ok
+            
+        if self._run_up == confirmation and self._volume_up:
+            return "BUY"
+        if self._run_down == confirmation and self._volume_down:
+            return "SELL"
+        return "NEUTRAL"
+
+
+class MLStrategy(ProTraderStrategy):
+    """ML Strategy - Trades a classifier's probability of the next move being up
+    
+    Features are the last ``lags`` log returns plus the EMA, RSI and
+    Bollinger columns the rule strategies use (protrader.ml.candle_features).
+    The model at ``model_path`` (.npz from train_ml_model.py, a pickled
+    sklearn classifier or an .onnx file) gives P(close higher
+    ``prediction_period`` bars ahead); a BUY (SELL) fires on the bar it
+    first reaches ``confidence_threshold`` (1 - threshold). analyze() scores
+    all bars in one batched predict; on_bar() updates a FeatureCache in O(1).
+    Use protrader.ml.MLSignalEngine to score many symbols per bar at once.
+    """
+    
+    type_name = "ml"
+    
+    def __init__(self):
+        super().__init__("ML Strategy", "Trades model-predicted direction above a confidence threshold")
+        self.add_parameter("model_path", "ml_model.npz")
+        self.add_parameter("prediction_period", 5, min_value=1, max_value=50)  # Label horizon used in training
+        self.add_parameter("confidence_threshold", 0.6, min_value=0.5, max_value=0.95)
+        self.add_parameter("lags", 5, min_value=1, max_value=20)
+        self._model = None
+        self._model_path = None
+        self.reset()
+        
+    def reset(self):
+        self._engine = None
+        
+    def set_model(self, model):
+        """Use an in-memory model (anything with predict(X) -> P(up)) until model_path changes"""
+        self._model = model
+        self._model_path = self.get_parameter("model_path")
+        self.reset()
+        
+    def get_model(self):
+        """The model, loaded once per model_path; None if it cannot be loaded"""
+        path = self.get_parameter("model_path")
+        if path == self._model_path:
+            return self._model
+        self._model_path = path
+        try:
+            self._model = load_model(path)
+        except Exception as e:
+            print(f"Error loading ML model {path}: {str(e)}")
+            self._model = None
+        return self._model
+        
+    def plan_key(self):
+        # Same parameters with a different in-memory model are different configurations
+        return super().plan_key() + (id(self._model) if self._model_path == self.get_parameter("model_path") else None,)
+        
+    def _proba(self, indicators):
+        """Model P(up) per bar, or None without a model"""
+        model = self.get_model()
+        if model is None:
+            return None
+        lags = int(self.get_parameter("lags"))
+        features = indicators.get(('ml_features', lags), lambda: candle_features(indicators.column('Close'), lags))
+        return predict_rows(model, features)
+        
+    def signals(self, indicators):
+        proba = self._proba(indicators)
+        if proba is None:
+            zeros = np.zeros(len(indicators.data), dtype=int)
+            return zeros, zeros
+        return edge_signals(proba, float(self.get_parameter("confidence_threshold")))
+        
+    def analyze(self, data):
+        if data is None or len(data) == 0:
+            return None
+            
+        df = data.copy()
+        proba = self._proba(IndicatorCache(df))
+        df['ML_Proba'] = np.nan if proba is None else proba
+        if proba is None:
+            df['Buy_Signal'] = 0
+            df['Sell_Signal'] = 0
+        else:
+            df['Buy_Signal'], df['Sell_Signal'] = edge_signals(proba, float(self.get_parameter("confidence_threshold")))
+        return df
+        
+    def on_bar(self, ts, open_, high, low, close, volume):
+        if self._engine is None:
+            model = self.get_model()
+            if model is None:
+                return "NEUTRAL"
+            self._engine = MLSignalEngine(model, [None], float(self.get_parameter("confidence_threshold")),
+                                          lags=int(self.get_parameter("lags")))
+        return self._engine.on_bar([float(close)])[None]
+
+
+# Strategy type name -> class; configs and from_dict build strategies through it
+STRATEGY_TYPES = {
+    cls.type_name: cls for cls in (
+        EMACrossoverStrategy, ReversalStrategy, PriceActionStrategy, CombinationStrategy,
+        VWAPMomentumStrategy, BreakoutStrategy, MeanReversionStrategy, MLStrategy
+    )
+}
+
+
+# Optional strategy configs loaded by the strategy page (see load_strategy_config)
+STRATEGY_CONFIG_FILES = ("strategies.json", "strategies.toml")
+
+
+def register_strategy(cls):
+    """Make a ProTraderStrategy subclass (no-argument constructor, ``type_name`` set) loadable from configs"""
+    if not cls.type_name:
+        raise ValueError(f"{cls.__name__} has no type_name")
+    STRATEGY_TYPES[cls.type_name] = cls
+    return cls
+
+
+def create_strategy(type_name, name=None, parameters=None):
+    """Build a registered strategy by type name, optionally renamed and with parameters set"""
+    data = {'type': type_name, 'parameters': parameters or {}}
+    if name:
+        data['name'] = name
+    return ProTraderStrategy.from_dict(data)
+
+
+def load_strategy_config(path):
+    """
+    Load strategy instances from a JSON or TOML file.
+    
+    The file holds a list of {type, name, description, parameters} entries,
+    under a top-level "strategies" key (TOML: [[strategies]] tables) or, in
+    JSON, as a bare list. Several instances of one type may be loaded with
+    different names and parameters.
+    
+    Returns:
+        dict of name -> strategy, in file order
+    """
+    if path.lower().endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, "r") as f:
+            data = json.load(f)
+    
+    entries = data.get("strategies", []) if isinstance(data, dict) else data
+    strategies = {}
+    for entry in entries:
+        if not entry.get('type'):
+            raise ValueError(f"Strategy entry without a type in {path}: {entry}")
+        strategy = ProTraderStrategy.from_dict(entry)
+        if strategy.name in strategies:
+            raise ValueError(f"Duplicate strategy name in {path}: {strategy.name}")
+        strategies[strategy.name] = strategy
+    return strategies
+
+
+def _toml_key(key):
+    key = str(key)
+    return key if key and all(c.isalnum() or c in "_-" for c in key) and key.isascii() else json.dumps(key)
+
+
+def _toml_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))  # inf and nan are valid TOML floats
+    if isinstance(value, str):
+        return json.dumps(value)  # JSON string escapes are valid in TOML basic strings
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_toml_value(v) for v in value) + "]"
+    raise ValueError(f"Can't write {value!r} to TOML")
+
+
+def _toml_table(table, path, header):
+    """Lines of one TOML table: its scalar keys, then each nested dict as a [path.key] sub-table"""
+    lines = [header]
+    nested = []
+    for key, value in table.items():
+        if isinstance(value, dict):
+            nested.append((key, value))
+        elif value is not None:  # TOML has no null; a missing key loads as the default
+            lines.append(f"{_toml_key(key)} = {_toml_value(value)}")
+    for key, value in nested:
+        sub_path = f"{path}.{_toml_key(key)}"
+        lines.extend([""] + _toml_table(value, sub_path, f"[{sub_path}]"))
+    return lines
+
+
+def save_strategy_config(strategies, path):
+    """Write strategies ({name: strategy} or a list) as a config load_strategy_config reads back; TOML for .toml paths"""
+    if isinstance(strategies, dict):
+        strategies = strategies.values()
+    entries = [s.to_dict() for s in strategies]
+    with open(path, "w") as f:
+        if path.lower().endswith(".toml"):
+            f.write("\n\n".join("\n".join(_toml_table(entry, "strategies", "[[strategies]]"))
+                                for entry in entries) + "\n")
+        else:
+            json.dump({"strategies": entries}, f, indent=4)
@@ -0,0 +1,77 @@
+import json
+import time
+
+QUOTE_FIELDS = ("ltp", "change", "change_percent")
+
+
+def price_deltas(hub, extra=None, heartbeat=15.0, since=0):
+    """Yield one delta dict per hub update, containing only what changed
+
+    Each delta holds ``version``, ``time`` and the ``quotes`` whose fields
+    moved since the previous delta. ``extra`` is an optional callable
+    returning a dict of other state (positions, funds); each of its keys is
+    sent only when its value changed. Cycles where nothing changed are
+    skipped; ``None`` is yielded after ``heartbeat`` seconds without a
+    delta so callers can keep the connection alive.
+    """
+    sent_quotes = {}
+    sent_extra = {}
+    version = since
+    last_sent = time.monotonic()
+    while True:
+        snapshot = hub.wait_for(version, timeout=heartbeat)
+        if time.monotonic() - last_sent >= heartbeat:
+            last_sent = time.monotonic()
+            yield None
+        if snapshot.version <= version:
+            continue
+        version = snapshot.version
+
+        quotes = {}
+        for symbol, quote in snapshot.quotes.items():
+            fields = {k: quote.get(k) for k in QUOTE_FIELDS}
+            if sent_quotes.get(symbol) != fields:
+                sent_quotes[symbol] = fields
+                quotes[symbol] = fields
+
+        delta = {"version": version, "time": snapshot.time}
+        if quotes:
+            delta["quotes"] = quotes
+        if extra is not None:
+            for key, value in (extra() or {}).items():
+                encoded = json.dumps(value, sort_keys=True, default=str)
+                if sent_extra.get(key) != encoded:
+                    sent_extra[key] = encoded
+                    delta[key] = value
+        if len(delta) > 2:
+            last_sent = time.monotonic()
+            yield delta
+
+
+def sse_events(hub, extra=None, heartbeat=15.0, since=0):
+    """Server-Sent Events framing of ``price_deltas``"""
+    # Tell EventSource to reconnect quickly if the connection drops
+    yield "retry: 2000\n\n"
+    for delta in price_deltas(hub, extra, heartbeat, since):
+        if delta is None:
+            yield ": keepalive\n\n"
+        else:
+            yield f"id: {delta['version']}\ndata: {json.dumps(delta, default=str)}\n\n"
+
+
+def register_sse_route(server, hub, path="/stream/prices", extra=None):
+    """Expose ``sse_events`` on a Flask server (e.g. a Dash app's ``app.server``)"""
+    from flask import Response, request, stream_with_context
+
+    def stream():
+        # A reconnecting browser sends the last id it saw; resume there unless the hub restarted
+        last_id = request.headers.get("Last-Event-ID", "")
+        since = int(last_id) if last_id.isdigit() and int(last_id) <= hub.snapshot.version else 0
+        return Response(
+            stream_with_context(sse_events(hub, extra, since=since)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    server.add_url_rule(path, endpoint=f"sse{path.replace('/', '_')}", view_func=stream)
+    return path
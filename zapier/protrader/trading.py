@@ -0,0 +1,712 @@
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import namedtuple
+from collections.abc import Sequence
+from concurrent.futures import Future
+from itertools import islice
+from datetime import datetime
+from types import MappingProxyType
+
+from .fills import FillSimulator, bar_close
+from .metrics import PerformanceAccumulator
+from .equity import EquityCurveRecorder
+from .trailing import TrailingStopBook
+
+
+# Read-only trade record handed to the UI, metrics and auto-trading code
+TradeView = namedtuple("TradeView", [
+    "trade_id", "symbol", "trade_type", "entry_price", "qty", "entry_time",
+    "stop_loss", "initial_stop_loss", "target", "risk_reward", "trailing_activated",
+    "exit_price", "exit_time", "status", "pnl", "pnl_percent", "group_id"
+])
+
+
+# Consistent point-in-time view of the whole book, replaced atomically on every write
+TradeBookSnapshot = namedtuple("TradeBookSnapshot", [
+    "version", "initial_balance", "virtual_balance", "open_trades", "closed_trades",
+    "open_by_id", "open_by_symbol", "metrics"
+])
+
+
+class ClosedTrades(Sequence):
+    """The first ``count`` views of the writer's append-only closed-trade list
+
+    Publishing a close is O(1): snapshots share the one list and each one
+    sees only the views that existed when it was taken.
+    """
+
+    __slots__ = ("_views", "_count")
+
+    def __init__(self, views=(), count=0):
+        self._views = views
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return islice(self._views, self._count)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._views[i] for i in range(*index.indices(self._count)))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("closed trade index out of range")
+        return self._views[index]
+
+    def __repr__(self):
+        return f"ClosedTrades({self._count} trades)"
+
+
+class VirtualTrade:
+    """Represents a virtual trade with entry/exit info and performance metrics"""
+    
+    def __init__(self, symbol, trade_type, entry_price, qty, entry_time, stop_loss=None, target=None, risk_reward=None,
+                 trade_id=None, group_id=None):
+        self.trade_id = trade_id or uuid.uuid4().hex[:12]  # Stable ID, survives list reordering and reloads
+        self.group_id = group_id  # Shared by linked legs (e.g. both sides of a strangle)
+        self.symbol = symbol
+        self.trade_type = trade_type  # 'BUY' or 'SELL'
+        self.entry_price = entry_price
+        self.qty = qty
+        self.entry_time = entry_time
+        self.stop_loss = stop_loss
+        self.initial_stop_loss = stop_loss  # Keep original stop-loss for reference
+        self.target = target
+        self.risk_reward = risk_reward
+        
+        # Trailing stop-loss settings
+        self.enable_trailing_sl = True
+        self.trailing_sl_trigger = 0.5  # Trigger trailing SL after 50% of target is achieved
+        self.trailing_sl_step = 0.25    # Step size for trailing is 25% of profit
+        self.max_price_seen = entry_price if trade_type == "BUY" else None
+        self.min_price_seen = entry_price if trade_type == "SELL" else None
+        self.trailing_activated = False
+        
+        # Exit information - to be filled later
+        self.exit_price = None
+        self.exit_time = None
+        self.status = "OPEN"  # OPEN, CLOSED, SL_HIT, TARGET_HIT, TRAILING_SL_HIT
+        self.pnl = 0.0
+        self.pnl_percent = 0.0
+        
+    def to_view(self):
+        """Return an immutable copy of the trade for readers outside the writer thread"""
+        return TradeView(
+            self.trade_id, self.symbol, self.trade_type, self.entry_price, self.qty, self.entry_time,
+            self.stop_loss, self.initial_stop_loss, self.target, self.risk_reward, self.trailing_activated,
+            self.exit_price, self.exit_time, self.status, self.pnl, self.pnl_percent, self.group_id
+        )
+        
+    def update_trailing_stop_loss(self, current_price):
+        """Update trailing stop-loss based on current price movement"""
+        if not self.enable_trailing_sl or self.stop_loss is None or self.target is None:
+            return False
+            
+        # Calculate profit thresholds
+        if self.trade_type == "BUY":
+            # Update max price seen
+            if self.max_price_seen is None or current_price > self.max_price_seen:
+                self.max_price_seen = current_price
+            
+            # Calculate current profit
+            current_profit = current_price - self.entry_price
+            target_profit = self.target - self.entry_price
+            
+            # Check if we've reached the trailing SL trigger threshold
+            if current_profit >= (target_profit * self.trailing_sl_trigger):
+                self.trailing_activated = True
+                
+                # Calculate new stop-loss (lock in profits)
+                price_movement = self.max_price_seen - self.entry_price
+                step_back = price_movement * self.trailing_sl_step
+                new_stop_loss = self.max_price_seen - step_back
+                
+                # Only update if new stop-loss is higher than the current one
+                if new_stop_loss > self.stop_loss:
+                    old_sl = self.stop_loss
+                    self.stop_loss = new_stop_loss
+                    return True, old_sl, new_stop_loss
+                    
+        elif self.trade_type == "SELL":
+            # Update min price seen
+            if self.min_price_seen is None or current_price < self.min_price_seen:
+                self.min_price_seen = current_price
+            
+            # Calculate current profit
+            current_profit = self.entry_price - current_price
+            target_profit = self.entry_price - self.target
+            
+            # Check if we've reached the trailing SL trigger threshold
+            if current_profit >= (target_profit * self.trailing_sl_trigger):
+                self.trailing_activated = True
+                
+                # Calculate new stop-loss (lock in profits)
+                price_movement = self.entry_price - self.min_price_seen
+                step_back = price_movement * self.trailing_sl_step
+                new_stop_loss = self.min_price_seen + step_back
+                
+                # Only update if new stop-loss is lower than the current one
+                if new_stop_loss < self.stop_loss:
+                    old_sl = self.stop_loss
+                    self.stop_loss = new_stop_loss
+                    return True, old_sl, new_stop_loss
+            
+        return False, None, None
+    
+    def close_trade(self, exit_price, exit_time, status="CLOSED"):
+        """Close the trade with exit information"""
+        self.exit_price = exit_price
+        self.exit_time = exit_time
+        self.status = status
+        
+        # Calculate P&L
+        if self.trade_type == "BUY":
+            self.pnl = (exit_price - self.entry_price) * self.qty
+            self.pnl_percent = ((exit_price / self.entry_price) - 1) * 100
+        else:  # SELL
+            self.pnl = (self.entry_price - exit_price) * self.qty
+            self.pnl_percent = ((self.entry_price / exit_price) - 1) * 100
+            
+    def to_dict(self):
+        """Convert trade to dictionary for serialization"""
+        return {
+            'trade_id': self.trade_id,
+            'symbol': self.symbol,
+            'trade_type': self.trade_type,
+            'entry_price': self.entry_price,
+            'qty': self.qty,
+            'entry_time': self.entry_time.isoformat() if self.entry_time else None,
+            'stop_loss': self.stop_loss,
+            'target': self.target,
+            'risk_reward': self.risk_reward,
+            'exit_price': self.exit_price,
+            'exit_time': self.exit_time.isoformat() if self.exit_time else None,
+            'status': self.status,
+            'pnl': self.pnl,
+            'pnl_percent': self.pnl_percent,
+            'group_id': self.group_id
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create trade instance from dictionary"""
+        trade = cls(
+            data['symbol'],
+            data['trade_type'],
+            data['entry_price'],
+            data['qty'],
+            datetime.fromisoformat(data['entry_time']) if data['entry_time'] else None,
+            data.get('stop_loss'),
+            data.get('target'),
+            data.get('risk_reward'),
+            trade_id=data.get('trade_id'),
+            group_id=data.get('group_id')
+        )
+        
+        if data.get('exit_price'):
+            trade.exit_price = data['exit_price']
+            trade.exit_time = datetime.fromisoformat(data['exit_time']) if data.get('exit_time') else None
+            trade.status = data.get('status', 'CLOSED')
+            trade.pnl = data.get('pnl', 0)
+            trade.pnl_percent = data.get('pnl_percent', 0)
+            
+        return trade
+
+
+class TradeManager:
+    """Manages virtual trades and portfolio performance
+
+    All mutations run on a single writer thread fed by a command queue, so the
+    market-data worker, the auto-trader and the Tk thread never interleave
+    inside a write. After each write an immutable TradeBookSnapshot is
+    published; readers take ``self.snapshot`` (or ``open_trades`` /
+    ``closed_trades``) without locking and always see a consistent book.
+    """
+    
+    def __init__(self, initial_balance=1000000):
+        self.initial_balance = initial_balance
+        self._virtual_balance = initial_balance
+        self._clear_book()
+        self._version = 0
+        self.snapshot = TradeBookSnapshot(0, initial_balance, initial_balance, (), ClosedTrades(),
+                                          MappingProxyType({}), MappingProxyType({}),
+                                          MappingProxyType(self._metrics_dict()))
+        self._listeners = []
+        self._last_prices = {}  # symbol -> last price seen by update_trades
+        self.equity_curve = EquityCurveRecorder()
+        # Prices passed to update_trades may be last prices, (o, h, l, c) bars or tick arrays
+        self.fill_simulator = FillSimulator(mode="ohlc", path="auto")
+        
+        # Load existing trades from file if available
+        self.load_trades()
+        self._publish(self._open_by_symbol, closed_changed=True)
+        
+        # Single writer thread
+        self._commands = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="TradeManagerWriter", daemon=True)
+        self._writer.start()
+    
+    @property
+    def open_trades(self):
+        """Open trades from the latest snapshot (tuple of TradeView)"""
+        return self.snapshot.open_trades
+    
+    @property
+    def closed_trades(self):
+        """Closed trades from the latest snapshot (ClosedTrades, a read-only sequence of TradeView)"""
+        return self.snapshot.closed_trades
+    
+    @property
+    def virtual_balance(self):
+        return self.snapshot.virtual_balance
+    
+    def add_listener(self, callback):
+        """Register callback(snapshot), invoked on the writer thread after every publish"""
+        self._listeners.append(callback)
+    
+    def _mark_to_market(self):
+        """Cash plus the value of open trades at the last known prices (writer thread only)"""
+        equity = self._virtual_balance
+        for trade in self._open_by_id.values():
+            price = self._last_prices.get(trade.symbol, trade.entry_price)
+            if trade.trade_type == "BUY":
+                unrealized = (price - trade.entry_price) * trade.qty
+            else:  # SELL
+                unrealized = (trade.entry_price - price) * trade.qty
+            equity += trade.entry_price * trade.qty + unrealized
+        return equity
+    
+    def get_trade(self, trade_id):
+        """Find a trade view by ID, open or closed"""
+        trade = self.snapshot.open_by_id.get(trade_id)
+        if trade is None:
+            trade = self._closed_by_id.get(trade_id)
+        return trade
+    
+    def get_open_trades(self, symbol):
+        """Open trade views for an exact trading symbol"""
+        return self.snapshot.open_by_symbol.get(symbol, ())
+    
+    def get_group(self, group_id):
+        """Views of every leg booked under ``group_id``, open or closed"""
+        views = (self.get_trade(trade_id) for trade_id in tuple(self._groups.get(group_id, ())))
+        return tuple(view for view in views if view is not None)
+    
+    def get_group_pnl(self, group_id, prices=None):
+        """Combined P&L of a group: realized on closed legs plus unrealized at ``prices`` (default: last prices)"""
+        prices = self._last_prices if prices is None else prices
+        total = 0.0
+        for view in self.get_group(group_id):
+            if view.status != "OPEN":
+                total += view.pnl
+                continue
+            price = prices.get(view.symbol, view.entry_price)
+            if view.trade_type == "BUY":
+                total += (price - view.entry_price) * view.qty
+            else:  # SELL
+                total += (view.entry_price - price) * view.qty
+        return total
+    
+    def _clear_book(self):
+        """Reset the writer-side indexes (writer thread or __init__ only)"""
+        self._open_by_id = {}        # trade_id -> VirtualTrade, insertion ordered
+        self._open_by_symbol = {}    # symbol -> {trade_id: VirtualTrade}
+        self._open_views = {}        # trade_id -> TradeView
+        self._symbol_views = {}      # symbol -> tuple of TradeView
+        self._open_changed = True    # An open trade was added, removed or re-viewed since the last publish
+        self._stop_books = {}        # symbol -> TrailingStopBook (SL/target/trailing arrays)
+        self._closed_trades = []
+        # Append-only between resets, so readers can use them without a lock
+        self._closed_views = []      # TradeView per closed trade, shared by every snapshot's ClosedTrades
+        self._closed_by_id = {}
+        self._groups = {}            # group_id -> list of trade IDs, also append-only
+        # Realized performance, updated once per close
+        self.performance = PerformanceAccumulator(self.initial_balance)
+        self._rr_sum = 0.0
+        self._rr_count = 0
+    
+    def _add_group(self, trade):
+        if trade.group_id is not None:
+            ids = self._groups.setdefault(trade.group_id, [])
+            if trade.trade_id not in ids:
+                ids.append(trade.trade_id)
+    
+    def _add_open(self, trade):
+        self._open_by_id[trade.trade_id] = trade
+        self._add_group(trade)
+        self._open_by_symbol.setdefault(trade.symbol, {})[trade.trade_id] = trade
+        self._open_views[trade.trade_id] = trade.to_view()
+        self._open_changed = True
+        self._stop_books.setdefault(trade.symbol, TrailingStopBook()).add(trade)
+    
+    def _remove_open(self, trade):
+        del self._open_by_id[trade.trade_id]
+        del self._open_views[trade.trade_id]
+        self._open_changed = True
+        by_symbol = self._open_by_symbol[trade.symbol]
+        del by_symbol[trade.trade_id]
+        book = self._stop_books[trade.symbol]
+        book.remove(trade.trade_id)
+        if not by_symbol:
+            del self._open_by_symbol[trade.symbol]
+            del self._stop_books[trade.symbol]
+    
+    def _add_closed(self, trade):
+        view = trade.to_view()
+        self._closed_trades.append(trade)
+        self._closed_views.append(view)
+        self._closed_by_id[trade.trade_id] = view
+        self._add_group(trade)
+        self.performance.record(trade.pnl)
+        if trade.risk_reward:
+            self._rr_sum += trade.risk_reward
+            self._rr_count += 1
+        return view
+    
+    def _metrics_dict(self):
+        """Build the metrics published with each snapshot"""
+        metrics = self.performance.summary()
+        metrics["avg_risk_reward"] = self._rr_sum / max(1, self._rr_count)
+        metrics["balance_change"] = ((self._virtual_balance / self.initial_balance) - 1) * 100
+        return metrics
+    
+    def _writer_loop(self):
+        """Apply queued commands one at a time, until stop()"""
+        while True:
+            command = self._commands.get()
+            if command is None:
+                break
+            fn, args, kwargs, future = command
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                print(f"Error in trade writer: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                future.set_exception(e)
+    
+    def _submit(self, fn, *args, **kwargs):
+        """Run fn on the writer thread and wait for its result (inline once stopped)"""
+        if threading.current_thread() is self._writer or not self._writer.is_alive():
+            return fn(*args, **kwargs)
+        future = Future()
+        self._commands.put((fn, args, kwargs, future))
+        return future.result()
+    
+    def stop(self):
+        """Write trades and the open equity bars to disk and stop the writer (at shutdown)"""
+        if not self._writer.is_alive():
+            return
+        self._submit(self._flush)
+        self._commands.put(None)
+        self._writer.join(timeout=5)
+    
+    def _flush(self):
+        self.save_trades()
+        self.equity_curve.flush()
+    
+    def _publish(self, touched_symbols=(), closed_changed=False):
+        """Publish a new immutable snapshot of the book (writer thread only)
+
+        Parts that did not change since the last publish are reused: the
+        open book is only copied after an open trade changed, the symbol
+        index after one of its symbols was touched and the metrics after a
+        close or a balance change. Closed trades are never copied.
+        """
+        previous = self.snapshot
+        # Only the symbols written to since the last publish are re-indexed
+        for symbol in touched_symbols:
+            trades = self._open_by_symbol.get(symbol)
+            if trades:
+                self._symbol_views[symbol] = tuple(self._open_views[trade_id] for trade_id in trades)
+            else:
+                self._symbol_views.pop(symbol, None)
+        if self._open_changed:
+            open_trades = tuple(self._open_views.values())
+            open_by_id = MappingProxyType(dict(self._open_views))
+            self._open_changed = False
+        else:
+            open_trades, open_by_id = previous.open_trades, previous.open_by_id
+        open_by_symbol = MappingProxyType(dict(self._symbol_views)) if touched_symbols else previous.open_by_symbol
+        if closed_changed or self._virtual_balance != previous.virtual_balance \
+                or self.initial_balance != previous.initial_balance:
+            metrics = MappingProxyType(self._metrics_dict())
+        else:
+            metrics = previous.metrics
+        self._version += 1
+        self.snapshot = TradeBookSnapshot(
+            self._version,
+            self.initial_balance,
+            self._virtual_balance,
+            open_trades,
+            ClosedTrades(self._closed_views, len(self._closed_views)),
+            open_by_id,
+            open_by_symbol,
+            metrics
+        )
+        for callback in self._listeners:
+            try:
+                callback(self.snapshot)
+            except Exception as e:
+                print(f"Error in trade listener: {str(e)}")
+    
+    def create_trade(self, symbol, trade_type, entry_price, qty, stop_loss=None, target=None):
+        """Create a new virtual trade"""
+        return self._submit(self._create_trade, symbol, trade_type, entry_price, qty, stop_loss, target)
+    
+    def _create_trade(self, symbol, trade_type, entry_price, qty, stop_loss=None, target=None):
+        ok, result = self._open_trade(symbol, trade_type, entry_price, qty, stop_loss, target)
+        if not ok:
+            return False, result
+        
+        # Publish and save trades
+        self._publish((symbol,))
+        self.save_trades()
+        
+        return True, self._open_views[result.trade_id]
+    
+    def _open_trade(self, symbol, trade_type, entry_price, qty, stop_loss=None, target=None, group_id=None):
+        """Validate and book a trade without publishing; returns (ok, VirtualTrade or message)"""
+        # Validate inputs
+        if not symbol or not trade_type or not entry_price or not qty:
+            return False, "Missing required parameters"
+        
+        if trade_type not in ["BUY", "SELL"]:
+            return False, "Invalid trade type. Must be 'BUY' or 'SELL'"
+            
+        # Check if we have enough balance
+        trade_value = entry_price * qty
+        if trade_value > self._virtual_balance:
+            return False, f"Insufficient balance. Required: {trade_value}, Available: {self._virtual_balance}"
+            
+        # Calculate risk/reward if both stop loss and target are provided
+        risk_reward = None
+        if stop_loss is not None and target is not None:
+            if trade_type == "BUY":
+                risk = entry_price - stop_loss
+                reward = target - entry_price
+            else:  # SELL
+                risk = stop_loss - entry_price
+                reward = entry_price - target
+                
+            if risk > 0:
+                risk_reward = reward / risk
+        
+        # Create the trade
+        trade = VirtualTrade(
+            symbol=symbol,
+            trade_type=trade_type,
+            entry_price=entry_price,
+            qty=qty,
+            entry_time=datetime.now(),
+            stop_loss=stop_loss,
+            target=target,
+            risk_reward=risk_reward,
+            group_id=group_id
+        )
+        
+        # Update balance
+        self._virtual_balance -= trade_value
+        
+        # Add to open trades
+        self._add_open(trade)
+        return True, trade
+    
+    def close_trade(self, trade_id, exit_price, status="CLOSED"):
+        """Close an open trade by ID at the specified market price"""
+        return self._submit(self._close_trade, trade_id, exit_price, status)
+    
+    def _close_trade(self, trade_id, exit_price, status="CLOSED"):
+        trade = self._settle_trade(trade_id, exit_price, status)
+        if trade is None:
+            print(f"Trade {trade_id} is not open")
+            return False, None
+        
+        self._publish((trade.symbol,), closed_changed=True)
+        self.save_trades()
+        self.equity_curve.record(self._mark_to_market())
+        return True, self._closed_by_id[trade.trade_id]
+    
+    def _settle_trade(self, trade_id, exit_price, status="CLOSED"):
+        """Close and settle a trade without publishing; returns the VirtualTrade or None"""
+        trade = self._open_by_id.get(trade_id)
+        if trade is None:
+            return None
+        
+        trade.close_trade(exit_price, datetime.now(), status)
+        self._remove_open(trade)
+        self._add_closed(trade)
+        
+        # Return the margin plus realized P&L
+        self._virtual_balance += trade.entry_price * trade.qty + trade.pnl
+        return trade
+    
+    def execute_batch(self, orders):
+        """Apply many opens/closes as one write: one publish, one save, one equity sample
+        
+        Each order is ("open", symbol, trade_type, price, qty[, group_id]) or
+        ("close", trade_id, price, status). Opens that share a group_id are
+        linked legs (see get_group). Returns one (ok, TradeView or message)
+        per order, in order.
+        """
+        return self._submit(self._execute_batch, list(orders))
+    
+    def _execute_batch(self, orders):
+        results = []
+        touched = set()
+        closed_any = False
+        for order in orders:
+            if order[0] == "open":
+                _, symbol, trade_type, price, qty = order[:5]
+                group_id = order[5] if len(order) > 5 else None
+                ok, result = self._open_trade(symbol, trade_type, price, qty, group_id=group_id)
+                if ok:
+                    touched.add(symbol)
+                    result = self._open_views[result.trade_id]
+                results.append((ok, result))
+            else:
+                _, trade_id, price, status = order
+                trade = self._settle_trade(trade_id, price, status)
+                if trade is None:
+                    results.append((False, f"Trade {trade_id} is not open"))
+                    continue
+                touched.add(trade.symbol)
+                closed_any = True
+                results.append((True, self._closed_by_id[trade_id]))
+        
+        if touched:
+            self._publish(touched, closed_changed=closed_any)
+            self.save_trades()
+            if closed_any:
+                self.equity_curve.record(self._mark_to_market())
+        return results
+    
+    def update_trades(self, current_prices):
+        """Update trades based on current prices, checking for stop loss and target hits
+
+        Values in current_prices may be a last price, an (o, h, l, c) bar or
+        a tick array; fills are priced by self.fill_simulator.
+        """
+        return self._submit(self._update_trades, dict(current_prices))
+    
+    def _update_trades(self, current_prices):
+        updates = []
+        touched = set()
+        self._last_prices.update(
+            (symbol, bar_close(bar)) for symbol, bar in current_prices.items() if bar is not None
+        )
+        
+        closed_any = False
+        
+        # Only symbols that have a price are visited; each is one vectorized update
+        for symbol, bar in current_prices.items():
+            book = self._stop_books.get(symbol)
+            if bar is None or not book or not self._last_prices.get(symbol):
+                continue
+            result = book.update(bar, self.fill_simulator)
+            
+            # Trailing stops that tightened
+            for trade_id, old_sl, new_sl in zip(result.moved_ids, result.old_stops, result.new_stops):
+                trade = self._open_by_id[trade_id]
+                trade.stop_loss = float(new_sl)
+                trade.trailing_activated = True
+                self._open_views[trade_id] = trade.to_view()
+                self._open_changed = True
+                touched.add(symbol)
+                updates.append({
+                    "trade": self._open_views[trade_id],
+                    "event": "TRAILING_SL_MOVED",
+                    "old_stop_loss": float(old_sl)
+                })
+            
+            # Close trades directly - no confirmation for automatic closures
+            for trade_id, status, exit_price in zip(result.exit_ids, result.exit_status, result.exit_prices):
+                trade = self._open_by_id[trade_id]
+                trade.close_trade(float(exit_price), datetime.now(), status)  # SL_HIT, TRAILING_SL_HIT or TARGET_HIT
+                self._remove_open(trade)
+                touched.add(symbol)
+                closed_any = True
+                
+                # Return the margin plus realized P&L
+                self._virtual_balance += trade.entry_price * trade.qty + trade.pnl
+                
+                updates.append({
+                    "trade": self._add_closed(trade),
+                    "event": status
+                })
+        
+        if touched:
+            self._publish(touched, closed_changed=closed_any)
+        if closed_any:
+            # Stop moves alone are not worth a disk write on every tick
+            self.save_trades()
+        
+        # One equity sample per price snapshot
+        self.equity_curve.record(self._mark_to_market())
+        
+        return updates
+    
+    def get_performance_metrics(self):
+        """Return the performance metrics published with the latest snapshot"""
+        return dict(self.snapshot.metrics)
+    
+    def reset_account(self, initial_balance=1000000):
+        """Reset the account with a new initial balance"""
+        return self._submit(self._reset_account, initial_balance)
+    
+    def _reset_account(self, initial_balance=1000000):
+        self.initial_balance = initial_balance
+        self._virtual_balance = initial_balance
+        touched = list(self._symbol_views)
+        self._clear_book()
+        self._last_prices = {}
+        self._publish(touched, closed_changed=True)
+        self.save_trades()
+    
+    def save_trades(self):
+        """Save the latest snapshot to a file"""
+        try:
+            snapshot = self.snapshot
+            data = {
+                "initial_balance": snapshot.initial_balance,
+                "virtual_balance": snapshot.virtual_balance,
+                "open_trades": [t.to_dict() for t in self._open_by_id.values()],
+                "closed_trades": [t.to_dict() for t in self._closed_trades]
+            }
+            
+            with open("trades.json", "w") as f:
+                json.dump(data, f, indent=4)
+                
+        except Exception as e:
+            print(f"Error saving trades: {str(e)}")
+    
+    def load_trades(self):
+        """Load trades from a file"""
+        try:
+            if os.path.exists("trades.json"):
+                with open("trades.json", "r") as f:
+                    data = json.load(f)
+                    
+                self.initial_balance = data.get("initial_balance", 1000000)
+                self._virtual_balance = data.get("virtual_balance", self.initial_balance)
+                
+                self._clear_book()
+                
+                # Load open trades
+                for trade_data in data.get("open_trades", []):
+                    self._add_open(VirtualTrade.from_dict(trade_data))
+                    
+                # Load closed trades
+                for trade_data in data.get("closed_trades", []):
+                    self._add_closed(VirtualTrade.from_dict(trade_data))
+                    
+        except Exception as e:
+            print(f"Error loading trades: {str(e)}")
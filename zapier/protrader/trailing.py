@@ -0,0 +1,157 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .fills import FillSimulator, bar_close
+
+# Result of one price update; every field is a numpy array (possibly empty)
+StopUpdate = namedtuple("StopUpdate", [
+    "moved_ids", "old_stops", "new_stops",   # Trailing stops that tightened
+    "exit_ids", "exit_status", "exit_prices" # Trades whose stop or target was hit
+])
+
+_EMPTY_IDS = np.empty(0, dtype=object)
+_EMPTY_FLOATS = np.empty(0, dtype=np.float64)
+_LAST_PRICE_FILLS = FillSimulator(mode="last")
+
+
+class TrailingStopBook:
+    """Stop-loss, target and trailing state for all open trades on one symbol
+
+    Each field is a column array indexed by slot; trades are added at the end
+    and removed by swapping the last slot into the hole, so both are O(1).
+    ``update(bar)`` evaluates every trade with a handful of NumPy operations.
+
+    Trailing rule (same as ``VirtualTrade.update_trailing_stop_loss``): once
+    the current favourable move reaches ``trigger`` x the distance to target,
+    the stop trails to ``entry + best_move * (1 - step)`` on the trade's side,
+    and only ever tightens.
+
+    Exits are priced by a FillSimulator: first against the stops in force
+    when the bar opened (so wicks and gaps count), then against the trailed
+    stops at the bar's last price.
+    """
+
+    def __init__(self, capacity=16):
+        self._ids = np.empty(capacity, dtype=object)
+        self._side = np.zeros(capacity)          # +1 BUY, -1 SELL
+        self._entry = np.zeros(capacity)
+        self._stop = np.full(capacity, np.nan)   # NaN = no stop
+        self._target = np.full(capacity, np.nan) # NaN = no target
+        self._best = np.zeros(capacity)          # Best favourable move seen
+        self._trigger = np.zeros(capacity)
+        self._step = np.zeros(capacity)
+        self._enabled = np.zeros(capacity, dtype=bool)
+        self._activated = np.zeros(capacity, dtype=bool)
+        self._slots = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, trade_id):
+        return trade_id in self._slots
+
+    def _columns(self):
+        return [self._ids, self._side, self._entry, self._stop, self._target, self._best,
+                self._trigger, self._step, self._enabled, self._activated]
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        names = ["_ids", "_side", "_entry", "_stop", "_target", "_best",
+                 "_trigger", "_step", "_enabled", "_activated"]
+        for name in names:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def add(self, trade):
+        """Track a VirtualTrade (or anything with the same attributes)"""
+        if self._size == len(self._ids):
+            self._grow()
+        i = self._size
+        side = 1.0 if trade.trade_type == "BUY" else -1.0
+        self._ids[i] = trade.trade_id
+        self._side[i] = side
+        self._entry[i] = trade.entry_price
+        self._stop[i] = np.nan if trade.stop_loss is None else trade.stop_loss
+        self._target[i] = np.nan if trade.target is None else trade.target
+        self._best[i] = 0.0
+        self._trigger[i] = trade.trailing_sl_trigger
+        self._step[i] = trade.trailing_sl_step
+        self._enabled[i] = (trade.enable_trailing_sl and trade.stop_loss is not None
+                            and trade.target is not None)
+        self._activated[i] = trade.trailing_activated
+        self._slots[trade.trade_id] = i
+        self._size += 1
+
+    def remove(self, trade_id):
+        """Stop tracking a trade (swap-remove)"""
+        i = self._slots.pop(trade_id, None)
+        if i is None:
+            return
+        last = self._size - 1
+        if i != last:
+            for column in self._columns():
+                column[i] = column[last]
+            self._slots[self._ids[i]] = i
+        self._ids[last] = None
+        self._size = last
+
+    def stop_loss(self, trade_id):
+        """Current stop for a trade, or None"""
+        i = self._slots.get(trade_id)
+        if i is None or np.isnan(self._stop[i]):
+            return None
+        return float(self._stop[i])
+
+    def update(self, bar, fills=None):
+        """Apply one price, (o, h, l, c) bar or tick array to every trade; returns a StopUpdate"""
+        n = self._size
+        if n == 0:
+            return StopUpdate(_EMPTY_IDS, _EMPTY_FLOATS, _EMPTY_FLOATS, _EMPTY_IDS, _EMPTY_IDS, _EMPTY_FLOATS)
+        fills = fills or _LAST_PRICE_FILLS
+        price = bar_close(bar)
+
+        side = self._side[:n]
+        entry = self._entry[:n]
+        stop = self._stop[:n]
+        target = self._target[:n]
+        best = self._best[:n]
+
+        # Intrabar exits against the stops in force at bar open
+        early_hit, early_price, early_stop = fills.resolve(side, stop, target, bar)
+        early_hit = np.broadcast_to(early_hit, (n,))
+
+        # Favourable move in price units, positive when in profit on either side
+        move = side * (price - entry)
+        np.maximum(best, move, out=best)
+
+        # Trail where the current move has reached the trigger threshold
+        armed = ~early_hit & self._enabled[:n] & (move >= side * (target - entry) * self._trigger[:n])
+        self._activated[:n] |= armed
+        candidate = entry + side * best * (1.0 - self._step[:n])
+        moved = armed & (side * (candidate - stop) > 0)
+
+        moved_idx = np.flatnonzero(moved)
+        old_stops = stop[moved_idx].copy()
+        stop[moved_idx] = candidate[moved_idx]
+
+        # Trailed stops checked at the last price
+        late_hit, _, late_stop = _LAST_PRICE_FILLS.resolve(side, stop, target, price)
+
+        hit = early_hit | late_hit
+        is_stop = np.where(early_hit, early_stop, late_stop)
+        exit_prices = np.where(early_hit, early_price, np.where(late_stop, fills.slip(price, side), price))
+
+        exit_idx = np.flatnonzero(hit)
+        exit_status = np.where(
+            ~is_stop[exit_idx], "TARGET_HIT",
+            np.where(self._activated[:n][exit_idx], "TRAILING_SL_HIT", "SL_HIT")
+        ).astype(object)
+
+        return StopUpdate(
+            self._ids[moved_idx], old_stops, stop[moved_idx].copy(),
+            self._ids[exit_idx], exit_status, exit_prices[exit_idx]
+        )
@@ -1,34 +1,226 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
 import threading
 import time
 from datetime import datetime, timedelta
-from fyers_apiv3 import fyersModel
-import json
 import os
 import random
-import math
-import hashlib
-import requests
+from collections import deque
+from protrader.brokers import BrokerError, FyersBroker
+# Headless core: the page is a client of these (re-exported for `strategy.X` imports)
+from protrader.strategies import (ProTraderStrategy, EMACrossoverStrategy, ReversalStrategy, PriceActionStrategy,
+                                  CombinationStrategy, VWAPMomentumStrategy, MeanReversionStrategy, BreakoutStrategy,
+                                  MLStrategy, STRATEGY_TYPES, STRATEGY_CONFIG_FILES, register_strategy,
+                                  create_strategy, load_strategy_config, save_strategy_config)
+from protrader.market_data import (MarketData, OHLCV_COLUMNS, TIMEFRAME_SECONDS, seconds_until_bar_close,
+                                  closed_bars)
+from protrader.scanner import StrategyScanner, SCANNER_UNIVERSE
+from protrader.autotrade import AutoTradingEngine, AutoTradeSymbolContext
+from protrader.trading import VirtualTrade, TradeManager, TradeView, TradeBookSnapshot
+from protrader.pricing import select_strike, estimate_premium, resolve_instrument
+
+# matplotlib is imported on the first chart (load_matplotlib), not at startup
+plt = FigureCanvasTkAgg = mdates = None
+
+
+def load_matplotlib():
+    """Import pyplot, the Tk canvas and date formatting into module globals on first use"""
+    global plt, FigureCanvasTkAgg, mdates
+    if plt is None:
+        import matplotlib.pyplot as pyplot
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_class
+        import matplotlib.dates as dates
+        plt, FigureCanvasTkAgg, mdates = pyplot, canvas_class, dates
+    return plt
+
+class UIUpdateBus:
+    """Coalesces widget updates posted from background threads and applies them
+    on the Tk thread in a single `after` callback at a fixed frame rate.
+
+    Writes are keyed per (widget, property): a newer `configure(text=...)` for the
+    same label replaces the pending one, so only the latest value is drawn.
+    `after` callbacks are keyed per callback. Any other method (e.g. a tree's
+    `insert`) is not idempotent, so every such call is queued and applied in order.
+    """
+
+    CONFIGURE_METHODS = ("configure", "config")
+
+    def __init__(self, fps=20):
+        self.interval_ms = max(1, int(1000 / fps))
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._root = None
+        self._running = False
+
+        # Queue metrics
+        self._submitted = 0
+        self._coalesced = 0
+        self._applied = 0
+        self._flushes = 0
+        self._max_depth = 0
+        self._last_flush_ms = 0.0
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self, root):
+        """Start the flush loop. Must be called from the Tk thread."""
+        self._root = root
+        if not self._running:
+            self._running = True
+            root.after(self.interval_ms, self._flush)
+
+    def stop(self):
+        """Stop the flush loop and drop anything still pending"""
+        self._running = False
+        with self._lock:
+            self._pending.clear()
+
+    def submit(self, widget, method_name, *args, **kwargs):
+        """Queue a widget method call; safe to call from any thread"""
+        if widget is None:
+            return
+
+        with self._lock:
+            self._submitted += 1
+
+            if method_name in self.CONFIGURE_METHODS and not args:
+                # One entry per property so unrelated options are never dropped
+                for option, value in kwargs.items():
+                    key = (id(widget), "configure", option)
+                    if key in self._pending:
+                        self._coalesced += 1
+                    self._pending[key] = (widget, "configure", (), {option: value})
+            elif method_name == "after":
+                key = (id(widget), method_name, self._callable_key(args))
+                if key in self._pending:
+                    self._coalesced += 1
+                self._pending[key] = (widget, method_name, args, kwargs)
+            else:
+                # Unique per call, so two inserts with the same arguments both happen
+                self._pending[(id(widget), method_name, self._submitted)] = (widget, method_name, args, kwargs)
+
+            depth = len(self._pending)
+            if depth > self._max_depth:
+                self._max_depth = depth
+
+    @staticmethod
+    def _callable_key(args):
+        """Identify callbacks (e.g. `after(0, fn)`) so different callbacks never collapse"""
+        key = []
+        for arg in args:
+            if callable(arg):
+                # Bound methods are recreated on every attribute access, so key on func + instance
+                func = getattr(arg, "__func__", arg)
+                owner = getattr(arg, "__self__", None)
+                key.append((id(func), id(owner)))
+        return tuple(key)
+
+    def _flush(self):
+        """Apply all pending updates. Runs on the Tk thread."""
+        if not self._running:
+            return
+
+        start = time.perf_counter()
+
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+
+        # Merge property writes per widget into one configure call
+        configure_calls = {}
+        other_calls = []
+        for (widget_id, method_name, _), (widget, _, args, kwargs) in pending.items():
+            if method_name == "configure":
+                entry = configure_calls.setdefault(widget_id, (widget, {}))
+                entry[1].update(kwargs)
+            else:
+                other_calls.append((widget, method_name, args, kwargs))
+
+        applied = 0
+        for widget, kwargs in configure_calls.values():
+            applied += self._apply(widget, "configure", (), kwargs)
+        for widget, method_name, args, kwargs in other_calls:
+            if method_name == "after" and args:
+                # The bus already runs on the Tk thread, so run the callback directly
+                if len(args) > 1:
+                    applied += self._apply_callback(args[1], args[2:])
+            else:
+                applied += self._apply(widget, method_name, args, kwargs)
+
+        self._applied += applied
+        self._flushes += 1
+        self._last_flush_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            self._root.after(self.interval_ms, self._flush)
+        except Exception as e:
+            self._running = False
+            if "application has been destroyed" not in str(e):
+                print(f"UI update bus stopped: {e}")
+
+    @staticmethod
+    def _apply(widget, method_name, args, kwargs):
+        try:
+            if not widget.winfo_exists():
+                return 0
+            getattr(widget, method_name)(*args, **kwargs)
+            return 1
+        except Exception as e:
+            # Don't print errors when application is closing
+            if "application has been destroyed" not in str(e):
+                print(f"UI update error: {e}")
+            return 0
+
+    @staticmethod
+    def _apply_callback(callback, args):
+        try:
+            callback(*args)
+            return 1
+        except Exception as e:
+            if "application has been destroyed" not in str(e):
+                print(f"UI update error: {e}")
+            return 0
+
+    def get_metrics(self):
+        """Return queue depth and throughput counters"""
+        with self._lock:
+            depth = len(self._pending)
+        return {
+            "queue_depth": depth,
+            "max_queue_depth": self._max_depth,
+            "submitted": self._submitted,
+            "coalesced": self._coalesced,
+            "applied": self._applied,
+            "flushes": self._flushes,
+            "last_flush_ms": self._last_flush_ms,
+            "interval_ms": self.interval_ms
+        }
+
+
+# Shared bus used by safe_widget_update
+ui_update_bus = UIUpdateBus(fps=20)
+
 
 # Add a thread-safe widget update mechanism
 def safe_widget_update(widget, method_name, *args, **kwargs):
     """Thread-safe way to update a widget"""
     if widget is None:
         return None
-        
+
+    # Coalesce through the shared bus once the page has started it
+    if ui_update_bus.running:
+        ui_update_bus.submit(widget, method_name, *args, **kwargs)
+        return None
+
     try:
         if not widget.winfo_exists():
             return None
     except Exception:
         return None
-        
+
     try:
         method = getattr(widget, method_name)
         return widget.after(0, lambda: method(*args, **kwargs))
@@ -38,865 +230,13 @@ def safe_widget_update(widget, method_name, *args, **kwargs):
             print(f"UI update error: {e}")
     return None
 
-class ProTraderStrategy:
-    """Base class for all trading strategies in ProTrader"""
-    
-    def __init__(self, name, description):
-        self.name = name
-        self.description = description
-        self.parameters = {}
-        
-    def add_parameter(self, name, default_value, min_value=None, max_value=None, options=None):
-        """Add a configurable parameter to the strategy"""
-        self.parameters[name] = {
-            'value': default_value,
-            'default': default_value,
-            'min': min_value,
-            'max': max_value,
-            'options': options
-        }
-        
-    def set_parameter(self, name, value):
-        """Set parameter value"""
-        if name in self.parameters:
-            self.parameters[name]['value'] = value
-            
-    def get_parameter(self, name):
-        """Get parameter value"""
-        if name in self.parameters:
-            return self.parameters[name]['value']
-        return None
-        
-    def analyze(self, data):
-        """
-        Analyze the data and generate trading signals.
-        Must be implemented by subclasses.
-        
-        Returns:
-            DataFrame with signals added
-        """
-        raise NotImplementedError("Subclass must implement analyze() method")
-        
-    def get_last_signal(self, data):
-        """
-        Get the latest signal from analyzed data.
-        
-        Returns:
-            'BUY', 'SELL', or 'NEUTRAL'
-        """
-        if data is None or len(data) == 0:
-            return "NEUTRAL"
-            
-        last_row = data.iloc[-1]
-        
-        if 'Buy_Signal' in last_row and last_row['Buy_Signal'] == 1:
-            return "BUY"
-        elif 'Sell_Signal' in last_row and last_row['Sell_Signal'] == 1:
-            return "SELL"
-        
-        return "NEUTRAL"
-    
-    def to_dict(self):
-        """Convert strategy to dictionary for serialization"""
-        return {
-            'name': self.name,
-            'description': self.description,
-            'parameters': {k: v['value'] for k, v in self.parameters.items()}
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        """Create strategy instance from dictionary"""
-        strategy = cls(data['name'], data['description'])
-        for param_name, param_value in data.get('parameters', {}).items():
-            if param_name in strategy.parameters:
-                strategy.set_parameter(param_name, param_value)
-        return strategy
-
-
-class EMACrossoverStrategy(ProTraderStrategy):
-    """EMA Crossover Strategy - Uses exponential moving average crossovers to generate signals"""
-    
-    def __init__(self):
-        super().__init__("EMA Crossover", "Generates signals when fast EMA crosses slow EMA")
-        self.add_parameter("fast_period", 9, min_value=5, max_value=50)  # Default to 9 EMA
-        self.add_parameter("slow_period", 21, min_value=10, max_value=200)  # Default to 21 EMA
-        self.add_parameter("confirmation_candles", 1, min_value=1, max_value=3)  # Number of candles to confirm signal
-        self.add_parameter("volume_filter", True)  # Use volume filter to avoid false signals
-        
-    def analyze(self, data):
-        if data is None or len(data) == 0:
-            return None
-            
-        df = data.copy()
-        
-        # Calculate EMAs
-        fast_period = int(self.get_parameter("fast_period"))
-        slow_period = int(self.get_parameter("slow_period"))
-        confirmation_candles = int(self.get_parameter("confirmation_candles"))
-        use_volume_filter = self.get_parameter("volume_filter")
-        
-        df['EMA_Fast'] = df['Close'].ewm(span=fast_period, adjust=False).mean()
-        df['EMA_Slow'] = df['Close'].ewm(span=slow_period, adjust=False).mean()
-        
-        # Generate signals
-        df['Buy_Signal'] = 0
-        df['Sell_Signal'] = 0
-        
-        # Calculate volume filter if enabled
-        if use_volume_filter:
-            # Calculate average volume over the last 20 periods
-            df['Avg_Volume'] = df['Volume'].rolling(window=20).mean()
-            # Volume must be above average for signal confirmation
-            volume_condition = df['Volume'] > df['Avg_Volume']
-        else:
-            # If volume filter is disabled, always satisfy this condition
-            volume_condition = pd.Series(True, index=df.index)
-        
-        # Pre-calculate crossover conditions
-        bull_cross = (df['EMA_Fast'] > df['EMA_Slow']) & (df['EMA_Fast'].shift(1) <= df['EMA_Slow'].shift(1))
-        bear_cross = (df['EMA_Fast'] < df['EMA_Slow']) & (df['EMA_Fast'].shift(1) >= df['EMA_Slow'].shift(1))
-        
-        # Apply confirmation filters
-        if confirmation_candles > 1:
-            # For bull crossover, we want 'confirmation_candles' consecutive periods of Fast EMA > Slow EMA
-            for i in range(1, confirmation_candles):
-                bull_cross = bull_cross & (df['EMA_Fast'].shift(-i) > df['EMA_Slow'].shift(-i))
-            
-            # For bear crossover, we want 'confirmation_candles' consecutive periods of Fast EMA < Slow EMA
-            for i in range(1, confirmation_candles):
-                bear_cross = bear_cross & (df['EMA_Fast'].shift(-i) < df['EMA_Slow'].shift(-i))
-        
-        # Apply signals with volume filter
-        df.loc[bull_cross & volume_condition, 'Buy_Signal'] = 1
-        df.loc[bear_cross & volume_condition, 'Sell_Signal'] = 1
-        
-        return df
-
-
-class ReversalStrategy(ProTraderStrategy):
-    """Reversal Strategy - Uses overbought/oversold conditions to find potential reversals"""
-    
-    def __init__(self):
-        super().__init__("Reversal Strategy", "Identifies potential market reversals using RSI and Bollinger Bands")
-        self.add_parameter("rsi_period", 14, min_value=7, max_value=30)
-        self.add_parameter("rsi_oversold", 30, min_value=10, max_value=40)
-        self.add_parameter("rsi_overbought", 70, min_value=60, max_value=90)
-        self.add_parameter("bb_period", 20, min_value=10, max_value=50)
-        self.add_parameter("bb_std", 2.0, min_value=1.0, max_value=3.0)
-        
-    def analyze(self, data):
-        if data is None or len(data) == 0:
-            return None
-            
-        df = data.copy()
-        
-        # Get parameters
-        rsi_period = int(self.get_parameter("rsi_period"))
-        rsi_oversold = int(self.get_parameter("rsi_oversold"))
-        rsi_overbought = int(self.get_parameter("rsi_overbought"))
-        bb_period = int(self.get_parameter("bb_period"))
-        bb_std = float(self.get_parameter("bb_std"))
-        
-        try:
-            # Calculate RSI
-            delta = df['Close'].diff()
-            gain = delta.where(delta > 0, 0).fillna(0)
-            loss = -delta.where(delta < 0, 0).fillna(0)
-            
-            avg_gain = gain.rolling(window=rsi_period).mean()
-            avg_loss = loss.rolling(window=rsi_period).mean()
-            
-            # Handle division by zero
-            rs = avg_gain / avg_loss.replace(0, 0.00001)
-            df['RSI'] = 100 - (100 / (1 + rs))
-            
-            # Fix RSI NaN values
-            df['RSI'] = df['RSI'].fillna(50)
-            
-            # Calculate Bollinger Bands
-            df['BB_Mid'] = df['Close'].rolling(window=bb_period).mean()
-            bb_std_val = df['Close'].rolling(window=bb_period).std()
-            df['BB_Upper'] = df['BB_Mid'] + bb_std * bb_std_val
-            df['BB_Lower'] = df['BB_Mid'] - bb_std * bb_std_val
-            
-            # Fill NaN values with appropriate values using modern methods
-            df['BB_Mid'] = df['BB_Mid'].bfill()
-            df['BB_Upper'] = df['BB_Upper'].bfill()
-            df['BB_Lower'] = df['BB_Lower'].bfill()
-            
-            # Generate signals
-            df['Buy_Signal'] = 0
-            df['Sell_Signal'] = 0
-            
-            # Buy signal: RSI oversold + price below lower BB + price starts rising
-            df.loc[(df['RSI'] < rsi_oversold) & 
-                  (df['Close'] < df['BB_Lower']) & 
-                  (df['Close'] > df['Close'].shift(1)), 'Buy_Signal'] = 1
-            
-            # Sell signal: RSI overbought + price above upper BB + price starts falling
-            df.loc[(df['RSI'] > rsi_overbought) & 
-                  (df['Close'] > df['BB_Upper']) & 
-                  (df['Close'] < df['Close'].shift(1)), 'Sell_Signal'] = 1
-            
-            # Add some more signals for demonstration purposes
-            # Buy signal: Price crosses above middle BB after being below lower BB
-            cross_above_mid = (df['Close'] > df['BB_Mid']) & (df['Close'].shift(1) <= df['BB_Mid'])
-            prev_below_lower = df['Close'].shift(3).rolling(window=5).min() < df['BB_Lower'].shift(3)
-            df.loc[cross_above_mid & prev_below_lower & (df['RSI'] < 50), 'Buy_Signal'] = 1
-            
-            # Sell signal: Price crosses below middle BB after being above upper BB
-            cross_below_mid = (df['Close'] < df['BB_Mid']) & (df['Close'].shift(1) >= df['BB_Mid'])
-            prev_above_upper = df['Close'].shift(3).rolling(window=5).max() > df['BB_Upper'].shift(3)
-            df.loc[cross_below_mid & prev_above_upper & (df['RSI'] > 50), 'Sell_Signal'] = 1
-            
-            return df
-            
-        except Exception as e:
-            print(f"Error in ReversalStrategy.analyze: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return data
-
-
-class PriceActionStrategy(ProTraderStrategy):
-    """Price Action Strategy - Uses candlestick patterns and support/resistance levels"""
-    
-    def __init__(self):
-        super().__init__("Price Action", "Identifies trade opportunities based on candlestick patterns")
-        self.add_parameter("engulfing_factor", 1.1, min_value=1.0, max_value=2.0)
-        self.add_parameter("doji_threshold", 0.1, min_value=0.05, max_value=0.5)
-        self.add_parameter("trend_period", 10, min_value=5, max_value=50)
-        
-    def analyze(self, data):
-        if data is None or len(data) == 0:
-            return None
-            
-        df = data.copy()
-        
-        # Get parameters
-        engulfing_factor = float(self.get_parameter("engulfing_factor"))
-        doji_threshold = float(self.get_parameter("doji_threshold"))
-        trend_period = int(self.get_parameter("trend_period"))
-        
-        # Calculate body size and trends
-        df['Body_Size'] = abs(df['Close'] - df['Open'])
-        df['Candle_Range'] = df['High'] - df['Low']
-        df['Body_Percent'] = df['Body_Size'] / df['Candle_Range']
-        df['Is_Green'] = (df['Close'] > df['Open']).astype(int)
-        df['Is_Red'] = (df['Close'] < df['Open']).astype(int)
-        
-        # Simple trend identification
-        df['Trend'] = df['Close'].rolling(window=trend_period).mean().diff().fillna(0)
-        df['Uptrend'] = (df['Trend'] > 0).astype(int)
-        df['Downtrend'] = (df['Trend'] < 0).astype(int)
-        
-        # Generate signals
-        df['Buy_Signal'] = 0
-        df['Sell_Signal'] = 0
-        
-        # Bullish engulfing pattern in downtrend
-        bullish_engulfing = (
-            (df['Downtrend'] == 1) &
-            (df['Is_Green'] == 1) &
-            (df['Is_Red'].shift(1) == 1) &
-            (df['Body_Size'] > df['Body_Size'].shift(1) * engulfing_factor) &
-            (df['Open'] < df['Close'].shift(1)) &
-            (df['Close'] > df['Open'].shift(1))
-        )
-        
-        # Bearish engulfing pattern in uptrend
-        bearish_engulfing = (
-            (df['Uptrend'] == 1) &
-            (df['Is_Red'] == 1) &
-            (df['Is_Green'].shift(1) == 1) &
-            (df['Body_Size'] > df['Body_Size'].shift(1) * engulfing_factor) &
-            (df['Open'] > df['Close'].shift(1)) &
-            (df['Close'] < df['Open'].shift(1))
-        )
-        
-        # Doji after trend (indecision)
-        doji = (df['Body_Percent'] < doji_threshold)
-        
-        # Set signals
-        df.loc[bullish_engulfing, 'Buy_Signal'] = 1
-        df.loc[bearish_engulfing, 'Sell_Signal'] = 1
-        
-        return df
-        
-
-class CombinationStrategy(ProTraderStrategy):
-    """Combination Strategy - Combines multiple strategies with weighted signals"""
-    
-    def __init__(self):
-        super().__init__("ProTrader Combined", "Combines multiple strategies for enhanced signal accuracy")
-        self.strategies = {
-            "ema": {"strategy": EMACrossoverStrategy(), "weight": 1.0, "enabled": True},
-            "reversal": {"strategy": ReversalStrategy(), "weight": 1.0, "enabled": True},
-            "price_action": {"strategy": PriceActionStrategy(), "weight": 1.0, "enabled": True}
-        }
-        self.add_parameter("min_confirmation", 2, min_value=1, max_value=3)
-        
-    def set_strategy_enabled(self, strategy_key, enabled):
-        """Enable or disable a sub-strategy"""
-        if strategy_key in self.strategies:
-            self.strategies[strategy_key]["enabled"] = enabled
-            
-    def set_strategy_weight(self, strategy_key, weight):
-        """Set the weight of a sub-strategy"""
-        if strategy_key in self.strategies:
-            self.strategies[strategy_key]["weight"] = weight
-            
-    def analyze(self, data):
-        if data is None or len(data) == 0:
-            return None
-            
-        # Analyze with each strategy
-        df = data.copy()
-        
-        # Initialize signal columns
-        df['Combined_Buy_Score'] = 0.0
-        df['Combined_Sell_Score'] = 0.0
-        df['Buy_Signal'] = 0
-        df['Sell_Signal'] = 0
-        
-        # Apply each strategy if enabled
-        for key, strategy_info in self.strategies.items():
-            if strategy_info["enabled"]:
-                strategy = strategy_info["strategy"]
-                weight = strategy_info["weight"]
-                
-                # Get strategy signals
-                strategy_df = strategy.analyze(data)
-                
-                if strategy_df is not None:
-                    # Add weighted signals
-                    if 'Buy_Signal' in strategy_df.columns:
-                        df[f'{key}_Buy'] = strategy_df['Buy_Signal']
-                        df['Combined_Buy_Score'] += df[f'{key}_Buy'] * weight
-                    
-                    if 'Sell_Signal' in strategy_df.columns:
-                        df[f'{key}_Sell'] = strategy_df['Sell_Signal']
-                        df['Combined_Sell_Score'] += df[f'{key}_Sell'] * weight
-        
-        # Get minimum confirmation required
-        min_confirmation = self.get_parameter("min_confirmation")
-        
-        # Set final signals based on minimum confirmation
-        df.loc[df['Combined_Buy_Score'] >= min_confirmation, 'Buy_Signal'] = 1
-        df.loc[df['Combined_Sell_Score'] >= min_confirmation, 'Sell_Signal'] = 1
-        
-        return df
-
-
-class VirtualTrade:
-    """Represents a virtual trade with entry/exit info and performance metrics"""
-    
-    def __init__(self, symbol, trade_type, entry_price, qty, entry_time, stop_loss=None, target=None, risk_reward=None):
-        self.symbol = symbol
-        self.trade_type = trade_type  # 'BUY' or 'SELL'
-        self.entry_price = entry_price
-        self.qty = qty
-        self.entry_time = entry_time
-        self.stop_loss = stop_loss
-        self.initial_stop_loss = stop_loss  # Keep original stop-loss for reference
-        self.target = target
-        self.risk_reward = risk_reward
-        
-        # Trailing stop-loss settings
-        self.enable_trailing_sl = True
-        self.trailing_sl_trigger = 0.5  # Trigger trailing SL after 50% of target is achieved
-        self.trailing_sl_step = 0.25    # Step size for trailing is 25% of profit
-        self.max_price_seen = entry_price if trade_type == "BUY" else None
-        self.min_price_seen = entry_price if trade_type == "SELL" else None
-        self.trailing_activated = False
-        
-        # Exit information - to be filled later
-        self.exit_price = None
-        self.exit_time = None
-        self.status = "OPEN"  # OPEN, CLOSED, SL_HIT, TARGET_HIT, TRAILING_SL_HIT
-        self.pnl = 0.0
-        self.pnl_percent = 0.0
-        
-    def update_trailing_stop_loss(self, current_price):
-        """Update trailing stop-loss based on current price movement"""
-        if not self.enable_trailing_sl or self.stop_loss is None or self.target is None:
-            return False
-            
-        # Calculate profit thresholds
-        if self.trade_type == "BUY":
-            # Update max price seen
-            if self.max_price_seen is None or current_price > self.max_price_seen:
-                self.max_price_seen = current_price
-            
-            # Calculate current profit
-            current_profit = current_price - self.entry_price
-            target_profit = self.target - self.entry_price
-            
-            # Check if we've reached the trailing SL trigger threshold
-            if current_profit >= (target_profit * self.trailing_sl_trigger):
-                self.trailing_activated = True
-                
-                # Calculate new stop-loss (lock in profits)
-                price_movement = self.max_price_seen - self.entry_price
-                step_back = price_movement * self.trailing_sl_step
-                new_stop_loss = self.max_price_seen - step_back
-                
-                # Only update if new stop-loss is higher than the current one
-                if new_stop_loss > self.stop_loss:
-                    old_sl = self.stop_loss
-                    self.stop_loss = new_stop_loss
-                    return True, old_sl, new_stop_loss
-                    
-        elif self.trade_type == "SELL":
-            # Update min price seen
-            if self.min_price_seen is None or current_price < self.min_price_seen:
-                self.min_price_seen = current_price
-            
-            # Calculate current profit
-            current_profit = self.entry_price - current_price
-            target_profit = self.entry_price - self.target
-            
-            # Check if we've reached the trailing SL trigger threshold
-            if current_profit >= (target_profit * self.trailing_sl_trigger):
-                self.trailing_activated = True
-                
-                # Calculate new stop-loss (lock in profits)
-                price_movement = self.entry_price - self.min_price_seen
-                step_back = price_movement * self.trailing_sl_step
-                new_stop_loss = self.entry_price - step_back
-                
-                # Only update if new stop-loss is higher than the current one
-                if new_stop_loss > self.stop_loss:
-                    old_sl = self.stop_loss
-                    self.stop_loss = new_stop_loss
-                    return True, old_sl, new_stop_loss
-            
-        return False, None, None
-    
-    def close_trade(self, exit_price, exit_time, status="CLOSED"):
-        """Close the trade with exit information"""
-        self.exit_price = exit_price
-        self.exit_time = exit_time
-        self.status = status
-        
-        # Calculate P&L
-        if self.trade_type == "BUY":
-            self.pnl = (exit_price - self.entry_price) * self.qty
-            self.pnl_percent = ((exit_price / self.entry_price) - 1) * 100
-        else:  # SELL
-            self.pnl = (self.entry_price - exit_price) * self.qty
-            self.pnl_percent = ((self.entry_price / exit_price) - 1) * 100
-            
-    def to_dict(self):
-        """Convert trade to dictionary for serialization"""
-        return {
-            'symbol': self.symbol,
-            'trade_type': self.trade_type,
-            'entry_price': self.entry_price,
-            'qty': self.qty,
-            'entry_time': self.entry_time.isoformat() if self.entry_time else None,
-            'stop_loss': self.stop_loss,
-            'target': self.target,
-            'risk_reward': self.risk_reward,
-            'exit_price': self.exit_price,
-            'exit_time': self.exit_time.isoformat() if self.exit_time else None,
-            'status': self.status,
-            'pnl': self.pnl,
-            'pnl_percent': self.pnl_percent
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        """Create trade instance from dictionary"""
-        trade = cls(
-            data['symbol'],
-            data['trade_type'],
-            data['entry_price'],
-            data['qty'],
-            datetime.fromisoformat(data['entry_time']) if data['entry_time'] else None,
-            data.get('stop_loss'),
-            data.get('target'),
-            data.get('risk_reward')
-        )
-        
-        if data.get('exit_price'):
-            trade.exit_price = data['exit_price']
-            trade.exit_time = datetime.fromisoformat(data['exit_time']) if data.get('exit_time') else None
-            trade.status = data.get('status', 'CLOSED')
-            trade.pnl = data.get('pnl', 0)
-            trade.pnl_percent = data.get('pnl_percent', 0)
-            
-        return trade
-
-
-class TradeManager:
-    """Manages virtual trades and portfolio performance"""
-    
-    def __init__(self, initial_balance=1000000):
-        self.initial_balance = initial_balance
-        self.virtual_balance = initial_balance
-        self.open_trades = []
-        self.closed_trades = []
-        
-        # Load existing trades from file if available
-        self.load_trades()
-    
-    def create_trade(self, symbol, trade_type, entry_price, qty, stop_loss=None, target=None):
-        """Create a new virtual trade"""
-        # Validate inputs
-        if not symbol or not trade_type or not entry_price or not qty:
-            return False, "Missing required parameters"
-        
-        if trade_type not in ["BUY", "SELL"]:
-            return False, "Invalid trade type. Must be 'BUY' or 'SELL'"
-            
-        # Check if we have enough balance
-        trade_value = entry_price * qty
-        if trade_value > self.virtual_balance:
-            return False, f"Insufficient balance. Required: {trade_value}, Available: {self.virtual_balance}"
-            
-        # Calculate risk/reward if both stop loss and target are provided
-        risk_reward = None
-        if stop_loss is not None and target is not None:
-            if trade_type == "BUY":
-                risk = entry_price - stop_loss
-                reward = target - entry_price
-            else:  # SELL
-                risk = stop_loss - entry_price
-                reward = entry_price - target
-                
-            if risk > 0:
-                risk_reward = reward / risk
-        
-        # Create the trade
-        trade = VirtualTrade(
-            symbol=symbol,
-            trade_type=trade_type,
-            entry_price=entry_price,
-            qty=qty,
-            entry_time=datetime.now(),
-            stop_loss=stop_loss,
-            target=target,
-            risk_reward=risk_reward
-        )
-        
-        # Update balance
-        self.virtual_balance -= trade_value
-        
-        # Add to open trades
-        self.open_trades.append(trade)
-        
-        # Save trades
-        self.save_trades()
-        
-        return True, trade
-    
-    def close_trade(self, trade_index, exit_price):
-        """Close a trade at the specified market price"""
-        try:
-            if trade_index < 0 or trade_index >= len(self.open_trades):
-                print(f"Invalid trade index: {trade_index}")
-                return False, None
-                
-            # Get the trade to close
-            trade = self.open_trades[trade_index]
-            
-            # Confirm with user before closing
-            popup = ctk.CTkToplevel()
-            popup.title("Confirm Close Trade")
-            popup.geometry("400x300")
-            popup.grab_set()  # Make it modal
-            
-            # Create content frame
-            frame = ctk.CTkFrame(popup)
-            frame.pack(fill="both", expand=True, padx=20, pady=20)
-            
-            # Header
-            ctk.CTkLabel(
-                frame,
-                text="Confirm Close Trade",
-                font=("Arial Bold", 18)
-            ).pack(pady=(0, 15))
-            
-            # Create a line to separate header from content
-            separator = ctk.CTkFrame(frame, height=2, fg_color="#555555")
-            separator.pack(fill="x", padx=10, pady=10)
-            
-            # Trade details
-            ctk.CTkLabel(
-                frame,
-                text=f"Symbol: {trade.symbol}",
-                font=("Arial", 14),
-                anchor="w"
-            ).pack(fill="x", pady=2)
-            
-            type_color = "#4CAF50" if trade.trade_type == "BUY" else "#F44336"
-            ctk.CTkLabel(
-                frame,
-                text=f"Type: {trade.trade_type}",
-                font=("Arial", 14),
-                text_color=type_color,
-                anchor="w"
-            ).pack(fill="x", pady=2)
-            
-            ctk.CTkLabel(
-                frame,
-                text=f"Entry Price: ₹{trade.entry_price:.2f}",
-                font=("Arial", 14),
-                anchor="w"
-            ).pack(fill="x", pady=2)
-            
-            ctk.CTkLabel(
-                frame,
-                text=f"Exit Price: ₹{exit_price:.2f}",
-                font=("Arial Bold", 14),
-                anchor="w"
-            ).pack(fill="x", pady=2)
-            
-            # Calculate P&L
-            if trade.trade_type == "BUY":
-                pnl = (exit_price - trade.entry_price) * trade.qty
-                pnl_pct = ((exit_price / trade.entry_price) - 1) * 100
-            else:  # SELL
-                pnl = (trade.entry_price - exit_price) * trade.qty
-                pnl_pct = ((trade.entry_price / exit_price) - 1) * 100
-                
-            # Format P&L text and color
-            pnl_text = f"₹{pnl:.2f} ({pnl_pct:.2f}%)"
-            pnl_color = "#4CAF50" if pnl >= 0 else "#F44336"
-            
-            # PnL display
-            ctk.CTkLabel(
-                frame,
-                text=f"Profit/Loss: {pnl_text}",
-                font=("Arial Bold", 14),
-                text_color=pnl_color,
-                anchor="w"
-            ).pack(fill="x", pady=10)
-            
-            # Buttons
-            button_frame = ctk.CTkFrame(frame, fg_color="transparent")
-            button_frame.pack(fill="x", pady=10)
-            
-            # Function to execute the trade close
-            def execute_close():
-                # Actually close the trade without showing another confirmation dialog
-                # Get the trade again to be safe
-                if trade_index < len(self.open_trades):
-                    trade_to_close = self.open_trades[trade_index]
-                    
-                    # Record the trade details before closing
-                    trade_to_close.exit_price = exit_price
-                    trade_to_close.exit_time = datetime.now()
-                    trade_to_close.status = "CLOSED"
-                    
-                    # Calculate P&L
-                    if trade_to_close.trade_type == "BUY":
-                        trade_to_close.pnl = (exit_price - trade_to_close.entry_price) * trade_to_close.qty
-                        trade_to_close.pnl_percent = ((exit_price / trade_to_close.entry_price) - 1) * 100
-                    else:  # SELL
-                        trade_to_close.pnl = (trade_to_close.entry_price - exit_price) * trade_to_close.qty
-                        trade_to_close.pnl_percent = ((trade_to_close.entry_price / exit_price) - 1) * 100
-                    
-                    # Add to closed trades
-                    self.closed_trades.append(trade_to_close)
-                    
-                    # Remove from open trades
-                    self.open_trades.pop(trade_index)
-                    
-                    # Update virtual balance
-                    self.virtual_balance += (trade_to_close.qty * exit_price)
-                    
-                    # Save trades
-                    self.save_trades()
-                    
-                    # Update UI elements if method exists in the parent class
-                    if hasattr(self, 'update_trades_list'):
-                        self.update_trades_list()
-                    
-                    if hasattr(self, 'update_balance_display'):
-                        self.update_balance_display()
-                    
-                    # Also set any trade results message if available
-                    if hasattr(self, 'trade_results_text'):
-                        self.trade_results_text.delete("1.0", "end")
-                        self.trade_results_text.insert("1.0", f"✅ Trade closed successfully!\n\n")
-                        self.trade_results_text.insert("end", f"Symbol: {trade_to_close.symbol}\n")
-                        self.trade_results_text.insert("end", f"Profit/Loss: {pnl_text}\n")
-                
-                # Close the popup
-                popup.destroy()
-            
-            # Cancel function
-            def cancel_close():
-                popup.destroy()
-            
-            # Close button
-            ctk.CTkButton(
-                button_frame,
-                text="Close Trade",
-                command=execute_close,
-                font=("Arial Bold", 14),
-                fg_color="#F44336",  # Red
-                hover_color="#d32f2f",
-                width=150
-            ).pack(side="right", padx=5)
-            
-            # Cancel button
-            ctk.CTkButton(
-                button_frame,
-                text="Cancel",
-                command=cancel_close,
-                font=("Arial", 14),
-                fg_color="#555555",
-                width=100
-            ).pack(side="right", padx=5)
-            
-            return True, None
-            
-        except Exception as e:
-            print(f"Error closing trade: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return False, None
-    
-    def update_trades(self, current_prices):
-        """Update trades based on current prices, checking for stop loss and target hits"""
-        updates = []
-        
-        for i in range(len(self.open_trades) - 1, -1, -1):
-            trade = self.open_trades[i]
-            
-            # Get current price for this symbol
-            current_price = current_prices.get(trade.symbol)
-            if not current_price:
-                continue
-                
-            status = None
-            
-            # Check stop loss
-            if trade.stop_loss is not None:
-                if ((trade.trade_type == "BUY" and current_price <= trade.stop_loss) or 
-                   (trade.trade_type == "SELL" and current_price >= trade.stop_loss)):
-                    status = "SL_HIT"
-            
-            # Check target
-            if status is None and trade.target is not None:
-                if ((trade.trade_type == "BUY" and current_price >= trade.target) or 
-                   (trade.trade_type == "SELL" and current_price <= trade.target)):
-                    status = "TARGET_HIT"
-            
-            # Close trade if stop loss or target hit
-            if status:
-                # Clone trade info before closing it
-                trade_symbol = trade.symbol
-                trade_type = trade.trade_type
-                trade_entry_price = trade.entry_price
-                trade_qty = trade.qty
-                
-                # We don't use a confirmation popup for automatic closures
-                # So directly close the trade
-                if i < len(self.open_trades):  # Ensure index is still valid
-                    trade_to_close = self.open_trades[i]
-                    
-                    # Record the trade details before closing
-                    trade_to_close.exit_price = current_price
-                    trade_to_close.exit_time = datetime.now()
-                    trade_to_close.status = status  # SL_HIT or TARGET_HIT
-                    
-                    # Calculate P&L
-                    if trade_to_close.trade_type == "BUY":
-                        trade_to_close.pnl = (current_price - trade_to_close.entry_price) * trade_to_close.qty
-                        trade_to_close.pnl_percent = ((current_price / trade_to_close.entry_price) - 1) * 100
-                    else:  # SELL
-                        trade_to_close.pnl = (trade_to_close.entry_price - current_price) * trade_to_close.qty
-                        trade_to_close.pnl_percent = ((trade_to_close.entry_price / current_price) - 1) * 100
-                    
-                    # Add to closed trades
-                    self.closed_trades.append(trade_to_close)
-                    
-                    # Remove from open trades
-                    self.open_trades.pop(i)
-                    
-                    # Update virtual balance
-                    self.virtual_balance += (trade_to_close.qty * current_price)
-                    
-                    # Save trades
-                    self.save_trades()
-                    
-                    # Add to updates
-                    updates.append({
-                        "trade": trade_to_close,
-                        "event": status
-                    })
-        
-        return updates
-    
-    def get_performance_metrics(self):
-        """Calculate various performance metrics"""
-        metrics = {
-            "total_trades": len(self.closed_trades),
-            "winning_trades": len([t for t in self.closed_trades if t.pnl > 0]),
-            "losing_trades": len([t for t in self.closed_trades if t.pnl < 0]),
-            "total_pnl": sum(t.pnl for t in self.closed_trades),
-            "max_profit_trade": max([t.pnl for t in self.closed_trades] or [0]),
-            "max_loss_trade": min([t.pnl for t in self.closed_trades] or [0]),
-            "avg_risk_reward": sum(t.risk_reward for t in self.closed_trades if t.risk_reward) / max(1, len([t for t in self.closed_trades if t.risk_reward])),
-            "balance_change": ((self.virtual_balance / self.initial_balance) - 1) * 100
-        }
-        
-        # Calculate win rate
-        metrics["win_rate"] = (metrics["winning_trades"] / max(1, metrics["total_trades"])) * 100
-        
-        return metrics
-    
-    def reset_account(self, initial_balance=1000000):
-        """Reset the account with a new initial balance"""
-        self.initial_balance = initial_balance
-        self.virtual_balance = initial_balance
-        self.open_trades = []
-        self.closed_trades = []
-        self.save_trades()
-    
-    def save_trades(self):
-        """Save trades to a file"""
-        try:
-            data = {
-                "initial_balance": self.initial_balance,
-                "virtual_balance": self.virtual_balance,
-                "open_trades": [t.to_dict() for t in self.open_trades],
-                "closed_trades": [t.to_dict() for t in self.closed_trades]
-            }
-            
-            with open("trades.json", "w") as f:
-                json.dump(data, f, indent=4)
-                
-        except Exception as e:
-            print(f"Error saving trades: {str(e)}")
-    
-    def load_trades(self):
-        """Load trades from a file"""
-        try:
-            if os.path.exists("trades.json"):
-                with open("trades.json", "r") as f:
-                    data = json.load(f)
-                    
-                self.initial_balance = data.get("initial_balance", 1000000)
-                self.virtual_balance = data.get("virtual_balance", self.initial_balance)
-                
-                # Load open trades
-                self.open_trades = []
-                for trade_data in data.get("open_trades", []):
-                    self.open_trades.append(VirtualTrade.from_dict(trade_data))
-                    
-                # Load closed trades
-                self.closed_trades = []
-                for trade_data in data.get("closed_trades", []):
-                    self.closed_trades.append(VirtualTrade.from_dict(trade_data))
-                    
-        except Exception as e:
-            print(f"Error loading trades: {str(e)}")
+# Performance tab range -> (lookback seconds or None for all, equity curve resolution)
+EQUITY_RANGES = {
+    "Last Hour": (3600, "raw"),
+    "Today": (86400, "minute"),
+    "Last 30 Days": (30 * 86400, "day"),
+    "All Time": (None, "day")
+}
 
 
 class StrategyPage:
@@ -908,57 +248,25 @@ class StrategyPage:
         # Flag to control background thread
         self.running = True
         
-        # IMPORTANT: Force BANKNIFTY price to latest value
-        self.force_latest_prices = {
-            "BANKNIFTY": 55503.20,
-            "NSE:NIFTYBANK-INDEX": 55503.20,
-            "NIFTY": 25018.0,
-            "FINNIFTY": 23835.0
-        }
-        
-        # Market data cache to ensure consistency
-        self.market_data_cache = {
-            "last_update_time": None,
-            "prices": self.force_latest_prices.copy(),  # Initialize with forced prices
-            "historical_data": {},
-            "cache_ttl_seconds": 15 * 60  # Cache valid for 15 minutes
-        }
-        
-        # Try to create the Fyers API client
+        # Try to create the Fyers broker adapter (shares the pooled HTTP session)
         try:
             if self.client_id and self.access_token:
                 print(f"Initializing Fyers API with client_id: {self.client_id} (token length: {len(self.access_token) if self.access_token else 0})")
-                # Create the API client object properly
-                self.fyers = fyersModel.FyersModel(client_id=self.client_id, is_async=False, token=self.access_token, log_path=os.getcwd())
+                self.broker = FyersBroker(self.client_id, self.access_token)
                 print("Fyers API client initialized")
-                
-                # Test the connection immediately
-                try:
-                    profile_response = self.fyers.get_profile()
-                    print(f"Initial API profile response: {profile_response}")
-                    if isinstance(profile_response, dict) and profile_response.get('s') == 'ok':
-                        print(f"Connected as: {profile_response.get('data', {}).get('name', 'Unknown')}")
-                    else:
-                        print("API connection issue detected - token may be invalid")
-                        # Try to use APIv3 directly for better logging
-                        try:
-                            session = fyersModel.SessionModel(
-                                client_id=self.client_id,
-                                redirect_uri="https://trade.fyers.in/api-login/redirect-uri/index.html",
-                                response_type="code",
-                                grant_type="authorization_code"
-                            )
-                            print("Created session model with APIv3")
-                        except Exception as session_err:
-                            print(f"Error creating session model: {session_err}")
-                except Exception as test_err:
-                    print(f"Error testing API connection: {test_err}")
+                # The connection is probed in the background by initial_api_check
             else:
-                self.fyers = None
+                self.broker = None
                 print("No API credentials provided")
         except Exception as e:
             print(f"Error initializing Fyers API: {str(e)}")
-            self.fyers = None
+            self.broker = None
+        
+        # Data layer: candles, live prices and their caches (prices forced to latest until quoted)
+        self.market_data = MarketData(self.broker)
+        self.force_latest_prices = self.market_data.force_latest_prices
+        self.market_data_cache = self.market_data.cache
+        self.live_price_cache = self.market_data.live_price_cache
         
         # Initialize UI variables
         self.selected_strategy = None
@@ -980,11 +288,26 @@ class StrategyPage:
         # Initialize auto-trading attributes
         self.auto_trading_active = False
         self.auto_trading_thread = None
+        self.auto_trading_engine = None
         self.auto_trade_history = []
+        self.auto_trade_messages = deque()
+        
+        # Multi-strategy scanner state
+        self.scanner = None
+        self.scanner_active = False
+        self.scanner_thread = None
+        self.scanner_wake = threading.Event()  # Set to end the scanner thread's wait for the next bar
+        self.scanner_results = None
         
         # Create the page
         self.create_page()
         
+        # Start the coalescing UI update loop before any background thread posts to it
+        ui_update_bus.start(self.main_frame)
+        
+        # Save trades and the open equity bars when the page's window closes
+        self.main_frame.bind("<Destroy>", self.on_destroy, add="+")
+        
         # Start market data thread
         self.start_market_data_thread()
         
@@ -992,6 +315,22 @@ class StrategyPage:
         self.api_check_timer = None
         self.initial_api_check()
     
+    def on_destroy(self, event):
+        """Close handler: <Destroy> also fires for child widgets, so only act on the page's frame"""
+        if event.widget is self.main_frame:
+            self.shutdown()
+    
+    def shutdown(self):
+        """Stop background work and flush the trade book (trades.json and equity bars) to disk"""
+        if getattr(self, '_shut_down', False):
+            return
+        self._shut_down = True
+        self.running = False
+        self.stop_auto_trading()
+        self.stop_scanner()
+        ui_update_bus.stop()
+        self.trade_manager.stop()
+    
     def initial_api_check(self):
         """Initial API connection check and schedule periodic checks"""
         # Test connection in a separate thread
@@ -1042,25 +381,24 @@ class StrategyPage:
     def check_api_connection(self):
         """Test the API connection and get user profile if available"""
         try:
-            if self.fyers:
+            if self.broker:
                 print("Checking API connection...")
                 # Try to get user profile to verify connection
-                response = self.fyers.get_profile()
-                if isinstance(response, dict) and response.get("s") == "ok":
+                try:
+                    profile = self.broker.get_profile()
                     print("API connection successful!")
-                    print(f"Connected as: {response.get('data', {}).get('name', 'Unknown')}")
+                    print(f"Connected as: {profile.get('name', 'Unknown')}")
                     return True
-                else:
-                    print(f"API connection issue: {response}")
+                except BrokerError as e:
+                    print(f"API connection issue: {e}")
                     # If we get an auth error, try to validate the token another way
-                    if isinstance(response, dict) and response.get("code") in [-401, -402, -403, -404, -405]:
+                    if isinstance(e.payload, dict) and e.payload.get("code") in [-401, -402, -403, -404, -405]:
                         # Try a lighter endpoint
                         try:
-                            fund_response = self.fyers.funds()
-                            if isinstance(fund_response, dict) and fund_response.get('s') == 'ok':
-                                print("Funds API check succeeded despite profile API error")
-                                return True
-                        except:
+                            self.broker.get_funds()
+                            print("Funds API check succeeded despite profile API error")
+                            return True
+                        except BrokerError:
                             pass
             return False
         except Exception as e:
@@ -1083,7 +421,7 @@ class StrategyPage:
         self.content_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
         # Create tabbed interface
-        self.tab_view = ctk.CTkTabview(self.content_frame)
+        self.tab_view = ctk.CTkTabview(self.content_frame, command=self.on_tab_changed)
         self.tab_view.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Create tabs
@@ -1101,6 +439,11 @@ class StrategyPage:
         # Set default tab
         self.tab_view.set("Strategy Setup")
     
+    def on_tab_changed(self):
+        """Refresh the performance tab as soon as it is shown (its chart is built then)"""
+        if self.tab_view.get() == "Performance":
+            self.update_performance_tab()
+    
     def create_strategy_tab(self):
         # Create frames
         controls_frame = ctk.CTkFrame(self.strategy_tab)
@@ -1295,6 +638,34 @@ class StrategyPage:
         # Remove duplicate AUTO TRADING button
         # The button in create_trade_controls will be used instead
         
+        # Scanner mode switch (all strategies across the scanner universe)
+        scanner_frame = ctk.CTkFrame(auto_trade_frame, fg_color="transparent")
+        scanner_frame.pack(fill="x", padx=5, pady=5)
+        
+        ctk.CTkLabel(
+            scanner_frame,
+            text="Scanner Mode:",
+            font=("Arial", 12),
+            width=120
+        ).pack(side="left", padx=5)
+        
+        self.scanner_enabled = ctk.BooleanVar(value=False)
+        ctk.CTkSwitch(
+            scanner_frame,
+            text="",
+            variable=self.scanner_enabled,
+            command=self.toggle_scanner,
+            width=50
+        ).pack(side="left", padx=10)
+        
+        self.scanner_status = ctk.CTkLabel(
+            scanner_frame,
+            text="OFF",
+            font=("Arial Bold", 12),
+            text_color="#9E9E9E"
+        )
+        self.scanner_status.pack(side="right", padx=5)
+        
         # Action buttons
         action_frame = ctk.CTkFrame(controls_frame)
         action_frame.pack(fill="x", padx=5, pady=(20, 5))
@@ -1424,37 +795,41 @@ class StrategyPage:
             self.auto_trade_status.configure(text="ERROR", text_color="#F44336")
     
     def start_auto_trading(self):
-        """Start auto-trading thread"""
+        """Start the signal-driven auto-trading engine"""
         try:
             # Update status
             self.auto_trading_active = True
             
-            # Start auto-trading thread if not already running
-            if not self.auto_trading_thread or not self.auto_trading_thread.is_alive():
-                def auto_trading_worker():
-                    """Worker function for auto-trading thread"""
-                    try:
-                        while self.auto_trading_active:
-                            # Generate trade
-                            self.generate_auto_trade()
-                            
-                            # Sleep for a random interval (10-30 seconds)
-                            # This makes the trading look more realistic
-                            sleep_time = random.uniform(10, 30)
-                            time.sleep(sleep_time)
-                    except Exception as e:
-                        print(f"Error in auto-trading thread: {str(e)}")
-                        import traceback
-                        traceback.print_exc()
-                
-                # Create and start thread
-                self.auto_trading_thread = threading.Thread(
-                    target=auto_trading_worker,
-                    daemon=True
-                )
-                self.auto_trading_thread.start()
-                
-                print("Auto-trading started successfully")
+            if self.auto_trading_engine and self.auto_trading_engine.active:
+                return
+            
+            # Snapshot UI settings on the Tk thread; the engine never reads widgets
+            if hasattr(self, 'instrument_type_var'):
+                instrument_type = self.instrument_type_var.get()
+            else:
+                # Default to FUTURES if not specified
+                instrument_type = "FUTURES"
+            timeframe = self.timeframe
+            
+            self.auto_trading_engine = AutoTradingEngine(
+                trade_manager=self.trade_manager,
+                data_provider=lambda symbol, tf: self.fetch_historical_data(symbol, tf, use_cache=False),
+                strategy=self.selected_strategy,
+                symbols=["BANKNIFTY", "NIFTY", "FINNIFTY", "RELIANCE", "INFY", "TCS"],
+                timeframe=timeframe,
+                max_open_trades=5,
+                max_trades_per_symbol=1,
+                trade_size=10000,
+                sl_percent=0.015,  # 1.5%
+                target_percent=0.03,  # 3.0%
+                instrument_resolver=lambda symbol, signal, price: self.resolve_auto_trade_instrument(
+                    symbol, signal, price, instrument_type),
+                on_trade=self.on_auto_trade
+            )
+            self.auto_trading_engine.start()
+            self.auto_trading_thread = self.auto_trading_engine.thread
+            
+            print(f"Auto-trading started: {self.selected_strategy.name} on {timeframe} bar closes")
             
         except Exception as e:
             print(f"Error starting auto-trading: {str(e)}")
@@ -1470,6 +845,8 @@ class StrategyPage:
         try:
             # Update status
             self.auto_trading_active = False
+            if self.auto_trading_engine:
+                self.auto_trading_engine.stop()
             
             print("Auto-trading stopped")
             
@@ -1478,263 +855,125 @@ class StrategyPage:
             import traceback
             traceback.print_exc()
     
-    def generate_auto_trade(self):
-        """Generate a trade based on selected strategy"""
+    def resolve_auto_trade_instrument(self, symbol, signal, current_price, instrument_type="FUTURES"):
+        """Map an underlying signal to the traded contract, its entry price and trade side"""
+        return resolve_instrument(symbol, signal, current_price, instrument_type)
+    
+    def on_auto_trade(self, context, trade):
+        """Record an engine trade and refresh the UI (called from the engine thread)"""
+        self.auto_trade_history.append({
+            "symbol": trade.symbol,
+            "type": trade.trade_type,
+            "price": trade.entry_price,
+            "time": datetime.now(),
+            "strategy": context.strategy.name
+        })
+        self.auto_trade_messages.append(
+            f"✅ AUTO TRADE: {trade.trade_type} {trade.qty} {trade.symbol} @ ₹{trade.entry_price:.2f}\n" +
+            f"   Stop Loss: ₹{trade.stop_loss:.2f}, Target: ₹{trade.target:.2f}\n\n"
+        )
+        
+        safe_widget_update(self.main_frame, "after", 0, self.show_auto_trade_messages)
+        safe_widget_update(self.main_frame, "after", 0, self.update_trades_list)
+    
+    def show_auto_trade_messages(self):
+        """Drain queued auto-trade messages into the results box (Tk thread)"""
+        while self.auto_trade_messages:
+            message = self.auto_trade_messages.popleft()
+            if hasattr(self, 'results_text'):
+                self.results_text.insert("1.0", message)
+    
+    def toggle_scanner(self):
+        """Toggle scanner mode on/off"""
+        if self.scanner_enabled.get():
+            self.start_scanner()
+            self.scanner_status.configure(text="SCANNING", text_color="#4CAF50")
+        else:
+            self.stop_scanner()
+            self.scanner_status.configure(text="OFF", text_color="#9E9E9E")
+    
+    def start_scanner(self):
+        """Start scanning all strategies across the universe at every bar close"""
+        if self.scanner_active and self.scanner_thread and self.scanner_thread.is_alive():
+            return
+        if self.scanner is None:
+            self.scanner = StrategyScanner(self.strategies)
+        self.scanner_active = True
+        
+        # A fresh event per thread, so a stopped thread still winding down never picks up again
+        wake = self.scanner_wake = threading.Event()
+        
+        def scanner_worker():
+            # Scan immediately, then once per bar close
+            while not wake.is_set() and self.running:
+                self.run_scan()
+                if wake.wait(seconds_until_bar_close(self.timeframe) + 1):
+                    break
+        
+        self.scanner_thread = threading.Thread(target=scanner_worker, daemon=True)
+        self.scanner_thread.start()
+        print(f"Scanner started on {len(self.scanner.universe)} symbols with {self.scanner.max_workers} workers")
+    
+    def stop_scanner(self, timeout=10.0):
+        """Stop scanner mode, let an in-flight scan finish (up to ``timeout`` s) and release the worker pool"""
+        self.scanner_active = False
+        self.scanner_wake.set()
+        thread = self.scanner_thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        if self.scanner is not None:
+            # A scan that outlived the join can't start a new pool on a shut-down scanner
+            self.scanner.shutdown()
+            self.scanner = None
+        print("Scanner stopped")
+    
+    def run_scan(self):
+        """Fetch fresh candles for the universe and rank signals from every strategy"""
         try:
-            # Skip if no trade manager or not active
-            if not hasattr(self, 'trade_manager') or not self.auto_trading_active:
-                return
-                
-            # Get current symbol or use default
-            symbol = getattr(self, 'selected_symbol', "BANKNIFTY")
-            if not symbol or not isinstance(symbol, str):
-                symbol = "BANKNIFTY"
-                
-            # Check if this is an index (NIFTY, BANKNIFTY, FINNIFTY)
-            is_index = any(idx in symbol.upper() for idx in ["NIFTY", "BANKNIFTY", "FINNIFTY"])
-            
-            # Get strategy name if available
-            strategy_name = getattr(self, 'selected_strategy', None)
-            if hasattr(strategy_name, 'name'):
-                strategy_name = strategy_name.name
-            else:
-                strategy_name = "Auto Trading"
-            
-            # Trade parameters - hardcoded for simplicity
-            max_trades = 5
-            trade_size = 10000
-            sl_percent = 0.015  # 1.5%
-            target_percent = 0.03  # 3.0%
-            
-            # Check if we already have maximum trades
-            if len(self.trade_manager.open_trades) >= max_trades:
-                print(f"Maximum trades ({max_trades}) already reached. Skipping auto-trade.")
-                return
-                
-            # Check if we have sufficient balance
-            if self.trade_manager.virtual_balance < trade_size:
-                print(f"Insufficient balance for auto-trade. Required: {trade_size}, Available: {self.trade_manager.virtual_balance}")
-                return
-                
-            # Choose a random symbol
-            all_symbols = ["BANKNIFTY", "NIFTY", "FINNIFTY", "RELIANCE", "INFY", "TCS"]
-            symbol = random.choice(all_symbols)
-            
-            # Determine trade type based on current price action (50% buy/sell for simplicity)
-            trade_type = "BUY" if random.random() < 0.5 else "SELL"
-            
-            # Get current price for the symbol
-            self.selected_symbol = symbol
-            current_price = self.update_current_price()
-            
-            if not current_price:
-                print(f"Unable to get current price for {symbol}. Skipping auto-trade.")
-                return
-                
-            # Important Fix: For indices, we need to create either futures or options contracts
-            # We can't trade indices directly
-            
-            # Check if this is an index (NIFTY, BANKNIFTY, FINNIFTY)
-            is_index = any(idx in symbol.upper() for idx in ["NIFTY", "BANKNIFTY", "FINNIFTY"])
-            
-            # Determine the instrument type - first check if we have this information from the UI
-            if hasattr(self, 'instrument_type_var'):
-                instrument_type = self.instrument_type_var.get()
-            else:
-                # Default to FUTURES if not specified
-                instrument_type = "FUTURES"
-                
-            # Create the full symbol with appropriate suffix for indices
-            if is_index:
-                if instrument_type == "FUTURES":
-                    # Get current month's expiry (last Thursday of month)
-                    now = datetime.now()
-                    if now.month == 12:
-                        next_month = 1
-                        next_year = now.year + 1
-                    else:
-                        next_month = now.month + 1
-                        next_year = now.year
-                    
-                    last_day = datetime(next_year, next_month, 1) - timedelta(days=1)
-                    offset = (last_day.weekday() - 3) % 7  # 3 is Thursday
-                    last_thursday = last_day - timedelta(days=offset)
-                    expiry_str = last_thursday.strftime("%d%b%y").upper()
-                    
-                    # Format: SYMBOL EXPIRY FUT
-                    full_symbol = f"{symbol} {expiry_str} FUT"
-                    entry_price = current_price  # Use index price for futures
-                else:
-                    # OPTIONS - Use the option type from UI if available
-                    if hasattr(self, 'option_type_var'):
-                        option_type = "CE" if self.option_type_var.get() == "CALL" else "PE"
-                    else:
-                        option_type = "CE" if trade_type == "BUY" else "PE"  # Default based on trade type
-                    
-                    # Get strike price from UI if available
-                    if hasattr(self, 'strike_price_label'):
-                        strike_text = self.strike_price_label.cget("text")
-                        if strike_text != "Calculating..." and strike_text != "Error":
-                            strike_price = float(strike_text.replace('₹', ''))
-                        else:
-                            # Calculate appropriate strike price (use common strike intervals)
-                            strike_intervals = {
-                                "NIFTY": 50,
-                                "BANKNIFTY": 100,
-                                "FINNIFTY": 50
-                            }
-                            
-                            interval = strike_intervals.get(symbol, 50)
-                            strike_price = round(current_price / interval) * interval
-                    else:
-                        # Calculate appropriate strike price (use common strike intervals)
-                        strike_intervals = {
-                            "NIFTY": 50,
-                            "BANKNIFTY": 100,
-                            "FINNIFTY": 50
-                        }
-                        
-                        interval = strike_intervals.get(symbol, 50)
-                        strike_price = round(current_price / interval) * interval
-                    
-                    # Get expiry date from UI if available
-                    if hasattr(self, 'expiry_var'):
-                        try:
-                            expiry_date = datetime.strptime(self.expiry_var.get(), "%d-%b-%Y")
-                            expiry_str = expiry_date.strftime("%d%b%y").upper()
-                        except:
-                            # Use current week's expiry as fallback
-                            now = datetime.now()
-                            days_to_thursday = (3 - now.weekday()) % 7  # 3 is Thursday
-                            if days_to_thursday == 0 and now.hour >= 15:  # After market close on Thursday
-                                days_to_thursday = 7  # Use next Thursday
-                            
-                            expiry_date = now + timedelta(days=days_to_thursday)
-                            expiry_str = expiry_date.strftime("%d%b%y").upper()
-                    else:
-                        # Use current week's expiry
-                        now = datetime.now()
-                        days_to_thursday = (3 - now.weekday()) % 7  # 3 is Thursday
-                        if days_to_thursday == 0 and now.hour >= 15:  # After market close on Thursday
-                            days_to_thursday = 7  # Use next Thursday
-                        
-                        expiry_date = now + timedelta(days=days_to_thursday)
-                        expiry_str = expiry_date.strftime("%d%b%y").upper()
-                    
-                    # Format: SYMBOL EXPIRY STRIKE CE/PE
-                    full_symbol = f"{symbol} {expiry_str} {int(strike_price)} {option_type}"
-                    
-                    # Get option premium from UI if available
-                    if hasattr(self, 'premium_label'):
-                        premium_text = self.premium_label.cget("text")
-                        if premium_text != "Calculating..." and premium_text != "Error":
-                            entry_price = float(premium_text.replace('₹', ''))
-                        else:
-                            # Calculate realistic option premium
-                            days_to_expiry = max(1, (expiry_date - datetime.now()).days + 1)
-                            
-                            # Different IV values based on symbol
-                            iv_values = {
-                                "NIFTY": 0.12,
-                                "BANKNIFTY": 0.16,
-                                "FINNIFTY": 0.14
-                            }
-                            iv = iv_values.get(symbol, 0.14)
-                            
-                            # Calculate intrinsic value
-                            if option_type == "CE":
-                                intrinsic = max(0, current_price - strike_price)
-                            else:  # PE
-                                intrinsic = max(0, strike_price - current_price)
-                            
-                            # Simple time value calculation (just for realistic pricing)
-                            time_value = current_price * iv * (days_to_expiry / 365) * (1 - abs(strike_price - current_price) / current_price)
-                            
-                            # Set option premium
-                            entry_price = max(intrinsic + time_value, 0.5)  # Minimum 0.5 premium
-                    else:
-                        # Calculate realistic option premium
-                        days_to_expiry = max(1, (expiry_date - datetime.now()).days + 1)
-                        
-                        # Different IV values based on symbol
-                        iv_values = {
-                            "NIFTY": 0.12,
-                            "BANKNIFTY": 0.16,
-                            "FINNIFTY": 0.14
-                        }
-                        iv = iv_values.get(symbol, 0.14)
-                        
-                        # Calculate intrinsic value
-                        if option_type == "CE":
-                            intrinsic = max(0, current_price - strike_price)
-                        else:  # PE
-                            intrinsic = max(0, strike_price - current_price)
-                        
-                        # Simple time value calculation (just for realistic pricing)
-                        time_value = current_price * iv * (days_to_expiry / 365) * (1 - abs(strike_price - current_price) / current_price)
-                        
-                        # Set option premium
-                        entry_price = max(intrinsic + time_value, 0.5)  # Minimum 0.5 premium
-            else:
-                # For stocks, we'll use the stock symbol directly
-                full_symbol = symbol
-                entry_price = current_price
-            
-            # Determine quantity based on price and trade size
-            qty = max(1, int(trade_size / entry_price))
-            
-            # Calculate stop loss and target
-            if trade_type == "BUY":
-                stop_loss = entry_price * (1 - sl_percent)
-                target = entry_price * (1 + target_percent)
-            else:  # SELL
-                stop_loss = entry_price * (1 + sl_percent)
-                target = entry_price * (1 - target_percent)
-                
-            # Create the trade
-            success, trade = self.trade_manager.create_trade(
-                symbol=full_symbol,
-                trade_type=trade_type,
-                entry_price=entry_price,
-                qty=qty,
-                stop_loss=stop_loss,
-                target=target
-            )
-            
-            if success:
-                print(f"Auto-trade created: {full_symbol} {trade_type} at {entry_price}")
-                
-                # Record this trade
-                if not hasattr(self, 'auto_trade_history'):
-                    self.auto_trade_history = []
-                    
-                self.auto_trade_history.append({
-                    "symbol": full_symbol,
-                    "type": trade_type,
-                    "price": entry_price,
-                    "time": datetime.now(),
-                    "strategy": strategy_name
-                })
-                
-                # Add trade info to results text area
-                if hasattr(self, 'results_text'):
-                    self.results_text.insert(
-                        "1.0", 
-                        f"✅ AUTO TRADE: {trade_type} {qty} {full_symbol} @ ₹{entry_price:.2f}\n" +
-                        f"   Stop Loss: ₹{stop_loss:.2f}, Target: ₹{target:.2f}\n\n"
-                    )
-                
-                # Update trades list if method exists
-                if hasattr(self, 'update_trades_list'):
-                    self.update_trades_list()
-                
-            else:
-                print(f"Failed to create auto-trade: {trade}")
-                
+            scanner = self.scanner
+            if scanner is None:
+                return None
+            
+            timeframe = self.timeframe
+            # Closed bars only: the newest candle is still forming right after a bar close
+            candles = {
+                symbol: closed_bars(self.fetch_historical_data(symbol, timeframe, use_cache=False), timeframe)
+                for symbol in scanner.universe
+            }
+            results = scanner.scan(candles)
+            if results is None:
+                return None  # Stopped mid-scan
+            self.scanner_results = results
+            print(f"Scanner finished in {scanner.last_scan_seconds:.2f}s")
+            
+            safe_widget_update(self.main_frame, "after", 0, self.show_scanner_results)
+            return self.scanner_results
         except Exception as e:
-            print(f"Error generating auto-trade: {str(e)}")
+            print(f"Error running scanner: {str(e)}")
             import traceback
             traceback.print_exc()
+            return None
+    
+    def show_scanner_results(self, max_rows=15):
+        """Show the ranked scanner table in the results box"""
+        results = self.scanner_results
+        if results is None or not hasattr(self, 'results_text'):
+            return
+        
+        self.results_text.delete("1.0", "end")
+        self.results_text.insert("1.0", f"Scanner ({self.timeframe}) - {datetime.now().strftime('%H:%M:%S')}\n\n")
+        
+        active = results[results['score'] > 0]
+        if active.empty:
+            self.results_text.insert("end", "No signals in the universe.\n")
+            return
+        
+        for _, row in active.head(max_rows).iterrows():
+            self.results_text.insert(
+                "end",
+                f"{row['symbol']:<11} {row['last_signal']:<4} {row['strategy_name']:<20} "
+                f"{int(row['bars_ago'])} bars ago  x{int(row['agreement'])}  @ {row['close']:.2f}\n"
+            )
     
     def update_timeframe(self):
         """Update the selected timeframe and refresh data"""
@@ -1897,67 +1136,16 @@ class StrategyPage:
                 
             # Return the price
             return price
-                
-        except Exception as e:
-            print(f"Error updating current price: {str(e)}")
-            if hasattr(self, 'current_price_label'):
-                safe_widget_update(self.current_price_label, "configure", text="Error updating price")
-            return None
-            
-    def fetch_live_price(self, symbol):
-        """Attempt to fetch live price data from public sources"""
-        try:
-            # For BANKNIFTY, NIFTY, etc. (Indian indices)
-            if symbol in ["BANKNIFTY", "NIFTY", "FINNIFTY"] or any(s in symbol for s in ["BANKNIFTY", "NIFTY", "FINNIFTY"]):
-                # Try NSE API (simplified for demo)
-                current_time = datetime.now()
-                
-                # Don't query too frequently to avoid rate limits
-                last_fetch_time = self.market_data_cache.get("last_fetch_time")
-                if last_fetch_time and (current_time - last_fetch_time).total_seconds() < 60:
-                    print("Using cached data (last fetch was less than 60s ago)")
-                    return None
-                    
-                # If market is closed on weekends, use the fallback pricing
-                if current_time.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-                    print("Weekend - market closed. Using fallback price.")
-                    return None
-                    
-                # If outside of market hours (9:15 AM - 3:30 PM IST), use fallback
-                india_time = current_time  # Simplified - would need proper timezone handling
-                market_start = india_time.replace(hour=9, minute=15, second=0, microsecond=0)
-                market_end = india_time.replace(hour=15, minute=30, second=0, microsecond=0)
-                
-                if india_time < market_start or india_time > market_end:
-                    print("Outside market hours. Using fallback price.")
-                    return None
-                
-                try:
-                    # For BANKNIFTY specific data
-                    if "BANKNIFTY" in symbol:
-                        # Here we would make an API call to fetch real-time data
-                        # For now, using the current value from the web search
-                        price = 55503.20  # Latest BANKNIFTY price from web search
-                        self.market_data_cache["last_fetch_time"] = current_time
-                        return price
-                    elif "NIFTY" in symbol and not "BANKNIFTY" in symbol and not "FINNIFTY" in symbol:
-                        # For NIFTY 50
-                        price = 25018.0
-                        self.market_data_cache["last_fetch_time"] = current_time
-                        return price
-                    elif "FINNIFTY" in symbol:
-                        # For FINNIFTY
-                        price = 23835.0
-                        self.market_data_cache["last_fetch_time"] = current_time
-                        return price
-                except Exception as e:
-                    print(f"API request failed: {str(e)}")
-                    return None
-            
-            return None
+                
         except Exception as e:
-            print(f"Error fetching live price: {str(e)}")
+            print(f"Error updating current price: {str(e)}")
+            if hasattr(self, 'current_price_label'):
+                safe_widget_update(self.current_price_label, "configure", text="Error updating price")
             return None
+            
+    def fetch_live_price(self, symbol):
+        """Attempt to fetch live price data from the broker, then public sources"""
+        return self.market_data.fetch_live_price(symbol)
     
     def set_may22_expiry(self):
         """Set the expiry date to May 22 for options"""
@@ -2271,22 +1459,21 @@ class StrategyPage:
     
     def setup_strategies(self):
         """Initialize available trading strategies"""
-        # Create strategy instances
-        ema_strategy = EMACrossoverStrategy()
-        reversal_strategy = ReversalStrategy()
-        price_action_strategy = PriceActionStrategy()
-        combination_strategy = CombinationStrategy()
-        
-        # Add to strategies dictionary
-        self.strategies = {
-            "ema_crossover": ema_strategy,
-            "reversal": reversal_strategy,
-            "price_action": price_action_strategy,
-            "combination": combination_strategy
-        }
+        # One default instance of every registered strategy, keyed by type name
+        self.strategies = {type_name: cls() for type_name, cls in STRATEGY_TYPES.items()}
+        
+        # Extra configured instances, keyed by their names
+        for path in STRATEGY_CONFIG_FILES:
+            if os.path.exists(path):
+                try:
+                    configured = load_strategy_config(path)
+                    self.strategies.update(configured)
+                    print(f"Loaded {len(configured)} strategies from {path}")
+                except Exception as e:
+                    print(f"Error loading strategy config {path}: {str(e)}")
         
         # Set default selected strategy
-        self.selected_strategy = ema_strategy
+        self.selected_strategy = self.strategies["ema_crossover"]
         
         print(f"Strategies set up. Default: {self.selected_strategy.name}")
         
@@ -2453,6 +1640,15 @@ class StrategyPage:
         last_signal = self.selected_strategy.get_last_signal(self.analyzed_data)
         self.results_text.insert("end", f"Current Signal: {last_signal}\n\n")
         
+        # Backtest the signals with the same fill model as paper trading
+        try:
+            trades, summary = self.trade_manager.fill_simulator.backtest(self.analyzed_data)
+            self.results_text.insert("end", f"Backtest (next-bar entry, 1.5% SL / 3% target):\n")
+            self.results_text.insert("end", f"Trades: {summary['total_trades']}  Win Rate: {summary['win_rate']:.1f}%\n")
+            self.results_text.insert("end", f"P&L/unit: {summary['total_pnl']:.2f}  Profit Factor: {summary['profit_factor']:.2f}\n\n")
+        except Exception as e:
+            print(f"Error backtesting signals: {str(e)}")
+        
         # Insert recent data
         self.results_text.insert("end", "Recent Data:\n")
         for idx, row in last_rows.iterrows():
@@ -2480,6 +1676,8 @@ class StrategyPage:
             return
             
         try:
+            load_matplotlib()
+            
             # Create a figure and set of subplots
             fig = plt.figure(figsize=(10, 8))
             
@@ -2578,334 +1776,13 @@ class StrategyPage:
             )
             error_label.pack(expand=True)
         
-    def fetch_historical_data(self, symbol, timeframe, periods=100):
+    def fetch_historical_data(self, symbol, timeframe, periods=100, use_cache=True):
         """Fetch historical data from Fyers API or fall back to generated data if API is unavailable"""
-        print(f"Fetching historical data for {symbol}, timeframe: {timeframe}")
-        
-        # Create a cache key for this specific request
-        cache_key = f"{symbol}_{timeframe}_{periods}"
-        
-        # Check if we have valid cached data
-        if cache_key in self.market_data_cache["historical_data"]:
-            cached_data = self.market_data_cache["historical_data"][cache_key]
-            cache_time = self.market_data_cache["last_update_time"] 
-            
-            if cache_time:
-                # Check if cache is still valid (within TTL)
-                elapsed_seconds = (datetime.now() - cache_time).total_seconds()
-                if elapsed_seconds < self.market_data_cache["cache_ttl_seconds"]:
-                    print(f"Using cached historical data for {symbol} (cached {elapsed_seconds:.0f} seconds ago)")
-                    return cached_data
-                else:
-                    print(f"Cache expired for {symbol} (cached {elapsed_seconds:.0f} seconds ago)")
-        
-        # Cache miss or expired - need to fetch new data
-        historical_data = None
-        
-        # Try to get data from the API first
-        if self.fyers and self.access_token:
-            try:
-                # Map the internal timeframe to Fyers API timeframe
-                timeframe_map = {
-                    "1M": "1",     # 1 minute
-                    "5M": "5",     # 5 minutes
-                    "15M": "15",   # 15 minutes
-                    "1H": "60",    # 1 hour
-                    "1D": "1D"     # 1 day
-                }
-                
-                fyers_tf = timeframe_map.get(timeframe, "15")  # Default to 15 min
-                
-                # Format the symbol properly for the API if needed
-                api_symbol = symbol
-                if "NSE:" not in symbol and "BSE:" not in symbol:
-                    # Add NSE: prefix if not already there
-                    if "-INDEX" not in symbol and "-EQ" not in symbol:
-                        if symbol in ["NIFTY", "NIFTY50"]:
-                            api_symbol = "NSE:NIFTY50-INDEX"
-                        elif symbol == "BANKNIFTY":
-                            api_symbol = "NSE:NIFTYBANK-INDEX"
-                        elif symbol == "FINNIFTY":
-                            api_symbol = "NSE:FINNIFTY-INDEX"
-                        elif symbol == "SENSEX":
-                            api_symbol = "BSE:SENSEX-INDEX"
-                        else:
-                            api_symbol = f"NSE:{symbol}-EQ"
-                
-                # Calculate the date range
-                end_date = datetime.now()
-                
-                # Determine range based on timeframe and periods
-                if timeframe == "1D":
-                    days_to_subtract = periods + 10  # Add buffer days for non-trading days
-                    start_date = end_date - timedelta(days=days_to_subtract)
-                else:
-                    # For intraday, fetch a reasonable amount of data
-                    if periods <= 100:
-                        days_to_subtract = 7  # One week should be enough for most intraday periods
-                    else:
-                        days_to_subtract = 30  # For larger periods, fetch a month
-                    
-                    start_date = end_date - timedelta(days=days_to_subtract)
-                
-                # Format dates for the API
-                from_date = start_date.strftime("%Y-%m-%d")
-                to_date = end_date.strftime("%Y-%m-%d")
-                
-                print(f"Requesting data for {api_symbol} from {from_date} to {to_date} with timeframe {fyers_tf}")
-                
-                # Prepare the data request
-                data_params = {
-                    "symbol": api_symbol,
-                    "resolution": fyers_tf,
-                    "date_format": "1",  # UNIX timestamp
-                    "range_from": from_date,
-                    "range_to": to_date,
-                    "cont_flag": "1"
-                }
-                
-                # Make the API request
-                hist_data = self.fyers.history(data_params)
-                
-                # Check if the request was successful
-                if isinstance(hist_data, dict) and hist_data.get('s') == 'ok' and 'candles' in hist_data:
-                    print("Successfully retrieved historical data from API")
-                    
-                    # Convert API response to DataFrame
-                    candles = hist_data['candles']
-                    if candles and len(candles) > 0:
-                        # Create DataFrame from candles
-                        # Fyers API returns [timestamp, open, high, low, close, volume]
-                        df = pd.DataFrame(candles, columns=["Timestamp", "Open", "High", "Low", "Close", "Volume"])
-                        
-                        # Convert timestamp to datetime
-                        df['Date'] = pd.to_datetime(df['Timestamp'], unit='s')
-                        df.set_index('Date', inplace=True)
-                        df.drop('Timestamp', axis=1, inplace=True)
-                        
-                        # Limit to the requested number of periods
-                        if len(df) > periods:
-                            df = df.tail(periods)
-                            
-                        print(f"Retrieved {len(df)} candles of historical data")
-                        
-                        # Successfully fetched data, store in cache
-                        historical_data = df
-                    else:
-                        print("API returned empty candles, falling back to generated data")
-                else:
-                    error_msg = hist_data.get('message', 'Unknown error') if isinstance(hist_data, dict) else str(hist_data)
-                    print(f"API error: {error_msg}, falling back to generated data")
-            
-            except Exception as e:
-                print(f"Error fetching data from API: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                print("Falling back to generated data")
-        else:
-            print("Fyers API client not available, using generated data")
-        
-        # If API failed or not available, generate data
-        if historical_data is None:
-            # Use stable seed based on symbol and timeframe for consistency
-            seed = int(hashlib.md5(f"{symbol}_{timeframe}".encode()).hexdigest(), 16) % 10000
-            historical_data = self.generate_realistic_data(symbol, timeframe, periods, seed=seed)
-        
-        # Update cache
-        self.market_data_cache["historical_data"][cache_key] = historical_data
-        self.market_data_cache["last_update_time"] = datetime.now()
-        
-        return historical_data
+        return self.market_data.fetch_historical_data(symbol, timeframe, periods, use_cache)
         
     def generate_realistic_data(self, symbol, timeframe, periods=100, seed=None):
         """Generate realistic market data for demonstration"""
-        print(f"Generating realistic data for {symbol}")
-        
-        # Create a dataframe with realistic market data
-        try:
-            import pandas as pd
-            import numpy as np
-            from datetime import datetime, timedelta
-            
-            # Create date range with current dates (not future dates)
-            end_date = datetime.now()
-            
-            # Determine time delta based on timeframe
-            if timeframe == "1D":
-                delta = timedelta(days=1)
-            elif timeframe == "1H":
-                delta = timedelta(hours=1)
-            elif timeframe == "15M":
-                delta = timedelta(minutes=15)
-            elif timeframe == "5M":
-                delta = timedelta(minutes=5)
-            else:  # Default to 1 minute
-                delta = timedelta(minutes=1)
-                
-            # Create dates - going backward from current date
-            dates = [end_date - delta * i for i in range(periods)]
-            dates.reverse()  # Oldest to newest
-            
-            # Get realistic base price based on symbol
-            if "NIFTY" in symbol and "50" in symbol:
-                base_price = 25018.0  # Current value for Nifty50
-                volatility = 0.004
-            elif "NIFTY" in symbol:
-                base_price = 25018.0  # Default Nifty
-                volatility = 0.004
-            elif "BANKNIFTY" in symbol:
-                base_price = 51585.0  # Current value
-                volatility = 0.006
-            elif "FINNIFTY" in symbol:
-                base_price = 23835.0  # Current value
-                volatility = 0.005
-            elif "SENSEX" in symbol:
-                base_price = 81910.0  # Current value
-                volatility = 0.004
-            elif "RELIANCE" in symbol:
-                base_price = 2990.05
-                volatility = 0.007
-            elif "HDFCBANK" in symbol:
-                base_price = 1710.45
-                volatility = 0.006
-            elif "TCS" in symbol:
-                base_price = 4027.80
-                volatility = 0.005
-            elif "INFY" in symbol:
-                base_price = 1555.35
-                volatility = 0.006
-            elif "ADANIENT" in symbol:
-                base_price = 3043.15
-                volatility = 0.008
-            elif "SBIN" in symbol:
-                base_price = 812.70
-                volatility = 0.006
-            elif "BAJFINANCE" in symbol:
-                base_price = 7069.80
-                volatility = 0.007
-            else:
-                base_price = 1000.0
-                volatility = 0.008
-            
-            # Add some randomness to starting price to make it look different each time
-            base_price = base_price * (1 + np.random.normal(0, 0.02))
-                
-            # Generate price data with realistic patterns
-            # Generate price series with multiple components
-            np.random.seed(seed)  # Use random seed each time
-            
-            # Start with the base price
-            prices = []
-            current_price = base_price
-            
-            # Components for realistic price movement
-            # 1. Long-term trend (slow moving)
-            trend = np.random.choice([1, -1])  # Uptrend or downtrend
-            trend_strength = np.random.uniform(0.0001, 0.0003)
-            
-            # 2. Medium-term cycles (medium moving)
-            cycle_period = np.random.randint(20, 40)
-            cycle_amplitude = volatility * 0.8
-            
-            # 3. Short-term fluctuations (fast moving)
-            noise_level = volatility * 0.5
-            
-            # 4. Occasional jumps (rare but significant)
-            jump_probability = 0.03
-            jump_size_range = (volatility * 3, volatility * 6)
-            
-            # Generate price path
-            for i in range(periods):
-                # Apply trend component
-                trend_component = trend * trend_strength * current_price
-                
-                # Apply cycle component
-                cycle_component = cycle_amplitude * current_price * np.sin(2 * np.pi * i / cycle_period)
-                
-                # Apply random noise
-                noise_component = np.random.normal(0, noise_level) * current_price
-                
-                # Apply occasional jump
-                jump_component = 0
-                if np.random.random() < jump_probability:
-                    jump_size = np.random.uniform(*jump_size_range) * current_price
-                    jump_component = jump_size * np.random.choice([1, -1])
-                
-                # Calculate price change
-                price_change = trend_component + cycle_component + noise_component + jump_component
-                
-                # Update current price
-                current_price = max(current_price + price_change, base_price * 0.7)  # Prevent negative or extremely low prices
-                prices.append(current_price)
-            
-            # Create OHLC data
-            data = []
-            for i in range(periods):
-                close = prices[i]
-                
-                # High and low based on close with realistic ranges
-                high_range = close * np.random.uniform(0.001, 0.006)
-                low_range = close * np.random.uniform(0.001, 0.006)
-                
-                high = close + high_range
-                low = max(close - low_range, close * 0.995)  # Ensure low doesn't go too far below close
-                
-                # Open price based on previous close and current close
-                if i > 0:
-                    prev_close = prices[i-1]
-                    # Open is typically between previous close and current close
-                    weight = np.random.uniform(0.3, 0.7)
-                    open_price = prev_close + weight * (close - prev_close)
-                    
-                    # Sometimes open can be outside the prev_close to close range
-                    if np.random.random() < 0.2:
-                        if close > prev_close:
-                            open_price = prev_close - np.random.uniform(0, 0.4) * (close - prev_close)
-                        else:
-                            open_price = prev_close + np.random.uniform(0, 0.4) * (prev_close - close)
-                else:
-                    # First candle
-                    open_price = close * (1 + np.random.normal(0, volatility * 0.3))
-                
-                # Adjust high and low to ensure they contain open and close
-                high = max(high, open_price, close)
-                low = min(low, open_price, close)
-                
-                # Volume with occasional spikes
-                base_volume = np.random.normal(1000000, 300000)
-                if np.random.random() < 0.1:  # 10% chance of volume spike
-                    volume = base_volume * np.random.uniform(1.5, 3.0)
-                else:
-                    volume = base_volume
-                
-                # Higher volume on big price moves
-                price_change_pct = abs((close - prices[i-1])/prices[i-1]) if i > 0 else 0
-                volume = int(volume * (1 + price_change_pct * 10))
-                
-                data.append([dates[i], open_price, high, low, close, volume])
-            
-            # Create dataframe
-            df = pd.DataFrame(data, columns=["Date", "Open", "High", "Low", "Close", "Volume"])
-            df.set_index("Date", inplace=True)
-            
-            # Add some realistic market characteristics
-            # 1. Gap openings (especially for daily data)
-            if timeframe == "1D" and periods > 30:
-                gap_indices = np.random.choice(range(1, periods), size=int(periods * 0.1), replace=False)
-                for idx in gap_indices:
-                    gap_size = np.random.uniform(0.005, 0.015) * df.iloc[idx]["Close"]
-                    gap_direction = np.random.choice([1, -1])
-                    df.iloc[idx, df.columns.get_loc("Open")] += gap_size * gap_direction
-                    df.iloc[idx, df.columns.get_loc("High")] = max(df.iloc[idx]["High"], df.iloc[idx]["Open"])
-                    df.iloc[idx, df.columns.get_loc("Low")] = min(df.iloc[idx]["Low"], df.iloc[idx]["Open"])
-            
-            return df
-            
-        except Exception as e:
-            print(f"Error generating data: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None
+        return self.market_data.generate_realistic_data(symbol, timeframe, periods, seed)
 
     def update_trade_symbol(self, symbol):
         """Update the trade symbol and update related UI elements"""
@@ -3025,69 +1902,8 @@ class StrategyPage:
             option_type = self.option_type_var.get()
             strike_selection = self.strike_selection_var.get()
             
-            # Calculate ATM strike (round to nearest strike price interval)
-            # Use correct intervals for each symbol
-            strike_intervals = {
-                "NIFTY": 50,
-                "BANKNIFTY": 100,
-                "FINNIFTY": 50,
-                "SENSEX": 100,
-                "MIDCPNIFTY": 50,
-                # For individual stocks, use smaller intervals based on price range
-                "default_stock": 5
-            }
-            
             symbol = self.trade_symbol_var.get()
-            
-            # Get the appropriate interval based on symbol
-            if symbol in strike_intervals:
-                interval = strike_intervals[symbol]
-            elif current_price > 5000:
-                interval = 100
-            elif current_price > 2000:
-                interval = 50
-            elif current_price > 1000:
-                interval = 20
-            elif current_price > 500:
-                interval = 10
-            elif current_price > 200:
-                interval = 5
-            else:
-                interval = 2.5
-            
-            # Round to nearest interval
-            atm_strike = round(current_price / interval) * interval
-            
-            # Calculate strike based on selection (ATM/ITM/OTM)
-            strike_price = atm_strike
-            
-            if strike_selection == "ITM":
-                # For CALL, ITM is below current price
-                # For PUT, ITM is above current price
-                if option_type == "CALL":
-                    # For high-value indices, go 2 intervals deep for ITM
-                    if symbol in ["NIFTY", "BANKNIFTY", "FINNIFTY", "SENSEX"]:
-                        strike_price = atm_strike - (interval * 2)
-                    else:
-                        strike_price = atm_strike - interval
-                else:  # PUT
-                    if symbol in ["NIFTY", "BANKNIFTY", "FINNIFTY", "SENSEX"]:
-                        strike_price = atm_strike + (interval * 2)
-                    else:
-                        strike_price = atm_strike + interval
-            elif strike_selection == "OTM":
-                # For CALL, OTM is above current price
-                # For PUT, OTM is below current price
-                if option_type == "CALL":
-                    if symbol in ["NIFTY", "BANKNIFTY", "FINNIFTY", "SENSEX"]:
-                        strike_price = atm_strike + (interval * 2)
-                    else:
-                        strike_price = atm_strike + interval
-                else:  # PUT
-                    if symbol in ["NIFTY", "BANKNIFTY", "FINNIFTY", "SENSEX"]:
-                        strike_price = atm_strike - (interval * 2)
-                    else:
-                        strike_price = atm_strike - interval
+            strike_price = select_strike(symbol, current_price, option_type, strike_selection)
             
             # Update strike price display
             if hasattr(self, 'strike_price_label'):
@@ -3136,80 +1952,8 @@ class StrategyPage:
             days_to_expiry = (expiry_date - datetime.now()).days + 1
             days_to_expiry = max(1, days_to_expiry)  # Ensure at least 1 day
             
-            # Get the symbol to determine appropriate IV
             symbol = self.trade_symbol_var.get()
-            
-            # Current realistic IV values for different underlyings 
-            # (as of May 2024, based on market data)
-            iv_values = {
-                "NIFTY": 0.12,       # 12% IV for Nifty
-                "BANKNIFTY": 0.15,   # 15% IV for Bank Nifty
-                "FINNIFTY": 0.14,    # 14% IV for Fin Nifty
-                "SENSEX": 0.10,      # 10% IV for Sensex
-                "RELIANCE": 0.22,    # 22% IV for Reliance
-                "HDFCBANK": 0.20,    # 20% IV for HDFC Bank
-                "TCS": 0.18,         # 18% IV for TCS
-                "default": 0.25      # 25% IV default for other stocks
-            }
-            
-            # Get IV for the selected symbol
-            iv = iv_values.get(symbol, iv_values["default"])
-            
-            # Adjust IV based on days to expiry (IV tends to rise as expiry approaches)
-            if days_to_expiry < 3:
-                iv_multiplier = 1.5  # IV spike in last 2 days
-            elif days_to_expiry < 7:
-                iv_multiplier = 1.2  # Higher IV in last week
-            else:
-                iv_multiplier = 1.0
-                
-            iv = iv * iv_multiplier
-            
-            # Calculate moneyness (how far ITM/OTM)
-            moneyness = abs(current_price - strike_price) / current_price
-            
-            # Calculate intrinsic value
-            if option_type == "CALL":
-                intrinsic = max(0, current_price - strike_price)
-            else:  # PUT
-                intrinsic = max(0, strike_price - current_price)
-                
-            # Simplified Black-Scholes approximation for time value
-            # Time value is highest for ATM options and declines for both ITM and OTM
-            time_value_factor = (1 - moneyness * 2.5) if moneyness < 0.4 else 0
-            time_value_factor = max(0, time_value_factor)
-            
-            # Annualized time to expiry (in years)
-            t = days_to_expiry / 365.0
-            
-            # Time value calculation based on IV, time, and underlying price
-            time_value = current_price * iv * time_value_factor * math.sqrt(t)
-            
-            # Total premium
-            premium = intrinsic + time_value
-            
-            # Add typical bid-ask spread and some randomness for realism
-            if premium > 0:
-                spread = premium * 0.05  # 5% spread
-                premium = premium + (np.random.uniform(-0.5, 0.5) * spread)
-            
-            # Apply minimum premium based on the symbol (for very far OTM options)
-            min_premiums = {
-                "NIFTY": 3.0,
-                "BANKNIFTY": 5.0,
-                "FINNIFTY": 3.0,
-                "SENSEX": 5.0,
-                "default": 0.5
-            }
-            
-            min_premium = min_premiums.get(symbol, min_premiums["default"])
-            premium = max(premium, min_premium)
-            
-            # Round to appropriate decimal places
-            if premium > 100:
-                premium = round(premium, 1)
-            else:
-                premium = round(premium, 2)
+            premium = estimate_premium(symbol, current_price, strike_price, option_type, days_to_expiry)
             
             # Update premium label
             self.premium_label.configure(text=f"₹{premium:.2f}")
@@ -3495,7 +2239,7 @@ class StrategyPage:
                 ctk.CTkButton(
                     row_frame,
                     text="Close",
-                    command=lambda idx=i: self.close_trade(idx, current_prices.get(active_trades[idx].symbol, active_trades[idx].entry_price)),
+                    command=lambda trade_id=trade.trade_id, price=current_price: self.close_trade(trade_id, price),
                     width=80,
                     height=24,
                     font=("Arial", 12)
@@ -3506,6 +2250,142 @@ class StrategyPage:
             import traceback
             traceback.print_exc()
 
+    def close_trade(self, trade_id, exit_price):
+        """Ask for confirmation, then close the trade with the given ID"""
+        try:
+            trade = self.trade_manager.get_trade(trade_id)
+            if trade is None or trade.status != "OPEN":
+                print(f"Trade {trade_id} is no longer open")
+                self.update_trades_list()
+                return
+            
+            # Confirm with user before closing
+            popup = ctk.CTkToplevel()
+            popup.title("Confirm Close Trade")
+            popup.geometry("400x300")
+            popup.grab_set()  # Make it modal
+            
+            # Create content frame
+            frame = ctk.CTkFrame(popup)
+            frame.pack(fill="both", expand=True, padx=20, pady=20)
+            
+            # Header
+            ctk.CTkLabel(
+                frame,
+                text="Confirm Close Trade",
+                font=("Arial Bold", 18)
+            ).pack(pady=(0, 15))
+            
+            # Create a line to separate header from content
+            separator = ctk.CTkFrame(frame, height=2, fg_color="#555555")
+            separator.pack(fill="x", padx=10, pady=10)
+            
+            # Trade details
+            ctk.CTkLabel(
+                frame,
+                text=f"Symbol: {trade.symbol}",
+                font=("Arial", 14),
+                anchor="w"
+            ).pack(fill="x", pady=2)
+            
+            type_color = "#4CAF50" if trade.trade_type == "BUY" else "#F44336"
+            ctk.CTkLabel(
+                frame,
+                text=f"Type: {trade.trade_type}",
+                font=("Arial", 14),
+                text_color=type_color,
+                anchor="w"
+            ).pack(fill="x", pady=2)
+            
+            ctk.CTkLabel(
+                frame,
+                text=f"Entry Price: ₹{trade.entry_price:.2f}",
+                font=("Arial", 14),
+                anchor="w"
+            ).pack(fill="x", pady=2)
+            
+            ctk.CTkLabel(
+                frame,
+                text=f"Exit Price: ₹{exit_price:.2f}",
+                font=("Arial Bold", 14),
+                anchor="w"
+            ).pack(fill="x", pady=2)
+            
+            # Calculate P&L
+            if trade.trade_type == "BUY":
+                pnl = (exit_price - trade.entry_price) * trade.qty
+                pnl_pct = ((exit_price / trade.entry_price) - 1) * 100
+            else:  # SELL
+                pnl = (trade.entry_price - exit_price) * trade.qty
+                pnl_pct = ((trade.entry_price / exit_price) - 1) * 100
+                
+            # Format P&L text and color
+            pnl_text = f"₹{pnl:.2f} ({pnl_pct:.2f}%)"
+            pnl_color = "#4CAF50" if pnl >= 0 else "#F44336"
+            
+            # PnL display
+            ctk.CTkLabel(
+                frame,
+                text=f"Profit/Loss: {pnl_text}",
+                font=("Arial Bold", 14),
+                text_color=pnl_color,
+                anchor="w"
+            ).pack(fill="x", pady=10)
+            
+            # Buttons
+            button_frame = ctk.CTkFrame(frame, fg_color="transparent")
+            button_frame.pack(fill="x", pady=10)
+            
+            # Function to execute the trade close
+            def execute_close():
+                # The trade may have hit SL/target while the popup was open
+                success, closed = self.trade_manager.close_trade(trade_id, exit_price)
+                
+                self.update_trades_list()
+                self.update_balance_display()
+                
+                if hasattr(self, 'trade_results_text'):
+                    self.trade_results_text.delete("1.0", "end")
+                    if success:
+                        self.trade_results_text.insert("1.0", f"✅ Trade closed successfully!\n\n")
+                        self.trade_results_text.insert("end", f"Symbol: {closed.symbol}\n")
+                        self.trade_results_text.insert("end", f"Profit/Loss: ₹{closed.pnl:.2f} ({closed.pnl_percent:.2f}%)\n")
+                    else:
+                        self.trade_results_text.insert("1.0", f"Trade {trade.symbol} was already closed\n")
+                
+                # Close the popup
+                popup.destroy()
+            
+            # Cancel function
+            def cancel_close():
+                popup.destroy()
+            
+            # Close button
+            ctk.CTkButton(
+                button_frame,
+                text="Close Trade",
+                command=execute_close,
+                font=("Arial Bold", 14),
+                fg_color="#F44336",  # Red
+                hover_color="#d32f2f",
+                width=150
+            ).pack(side="right", padx=5)
+            
+            # Cancel button
+            ctk.CTkButton(
+                button_frame,
+                text="Cancel",
+                command=cancel_close,
+                font=("Arial", 14),
+                fg_color="#555555",
+                width=100
+            ).pack(side="right", padx=5)
+            
+        except Exception as e:
+            print(f"Error closing trade: {str(e)}")
+            import traceback
+            traceback.print_exc()
+
     def create_history_tab(self):
         """Create the trade history tab with filters and visualization"""
         # Create main frame for the history tab
@@ -3815,6 +2695,120 @@ class StrategyPage:
             import traceback
             traceback.print_exc()
     
+    def create_performance_tab(self):
+        """Create the performance tab with summary metrics and the equity curve"""
+        main_frame = ctk.CTkFrame(self.performance_tab)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Top controls
+        controls_frame = ctk.CTkFrame(main_frame)
+        controls_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(
+            controls_frame,
+            text="Performance",
+            font=("Arial Bold", 18)
+        ).pack(side="left", padx=10)
+        
+        self.equity_range_var = ctk.StringVar(value="Today")
+        ctk.CTkOptionMenu(
+            controls_frame,
+            values=list(EQUITY_RANGES),
+            variable=self.equity_range_var,
+            command=lambda *args: self.update_performance_tab(),
+            width=120
+        ).pack(side="right", padx=10)
+        
+        ctk.CTkLabel(
+            controls_frame,
+            text="Range:",
+            font=("Arial", 12)
+        ).pack(side="right", padx=5)
+        
+        # Metrics row
+        metrics_frame = ctk.CTkFrame(main_frame)
+        metrics_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.performance_labels = {}
+        for key, title in [("total_trades", "Total Trades"), ("win_rate", "Win Rate"),
+                           ("total_pnl", "Total P&L"), ("profit_factor", "Profit Factor"),
+                           ("max_drawdown", "Max Drawdown"), ("sharpe_ratio", "Sharpe"),
+                           ("sortino_ratio", "Sortino")]:
+            box = ctk.CTkFrame(metrics_frame)
+            box.pack(side="left", expand=True, fill="x", padx=5, pady=5)
+            ctk.CTkLabel(box, text=title, font=("Arial", 12)).pack()
+            label = ctk.CTkLabel(box, text="-", font=("Arial Bold", 14))
+            label.pack()
+            self.performance_labels[key] = label
+        
+        # Equity chart frame - the figure is built the first time the tab is shown
+        self.equity_chart_frame = ctk.CTkFrame(main_frame)
+        self.equity_chart_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.equity_line = None
+        
+        self.update_performance_tab()
+    
+    def create_equity_chart(self):
+        """Create the equity figure once; only the line data changes on refresh"""
+        load_matplotlib()
+        self.equity_fig = plt.Figure(figsize=(10, 4))
+        self.equity_ax = self.equity_fig.add_subplot(111)
+        self.equity_line, = self.equity_ax.plot([], [], color="#2196F3")
+        self.equity_ax.set_ylabel("Equity (₹)")
+        self.equity_ax.grid(True, alpha=0.3)
+        self.equity_canvas = FigureCanvasTkAgg(self.equity_fig, master=self.equity_chart_frame)
+        self.equity_canvas.get_tk_widget().pack(fill="both", expand=True)
+    
+    def update_performance_tab(self):
+        """Refresh performance metrics and, while the tab is shown, the equity curve; then reschedule"""
+        try:
+            if not hasattr(self, 'performance_labels') or not hasattr(self, 'trade_manager'):
+                return
+            
+            metrics = self.trade_manager.get_performance_metrics()
+            self.performance_labels["total_trades"].configure(text=str(metrics["total_trades"]))
+            self.performance_labels["win_rate"].configure(text=f"{metrics['win_rate']:.1f}%")
+            self.performance_labels["total_pnl"].configure(
+                text=f"₹{metrics['total_pnl']:,.2f}",
+                text_color="#4CAF50" if metrics["total_pnl"] >= 0 else "#F44336"
+            )
+            self.performance_labels["profit_factor"].configure(text=f"{metrics['profit_factor']:.2f}")
+            self.performance_labels["max_drawdown"].configure(text=f"{metrics['max_drawdown']:.2f}%")
+            self.performance_labels["sharpe_ratio"].configure(text=f"{metrics['sharpe_ratio']:.2f}")
+            self.performance_labels["sortino_ratio"].configure(text=f"{metrics['sortino_ratio']:.2f}")
+            
+            # Equity curve for the selected range, drawn only while visible
+            if self.tab_view.get() != "Performance":
+                return
+            if self.equity_line is None:
+                self.create_equity_chart()
+            lookback, resolution = EQUITY_RANGES[self.equity_range_var.get()]
+            start = time.time() - lookback if lookback else None
+            times, values = self.trade_manager.equity_curve.query(start=start, resolution=resolution)
+            dates = times / 86400.0  # Matplotlib date numbers are days since the epoch
+            self.equity_line.set_data(dates, values)
+            if len(values):
+                self.equity_ax.relim()
+                self.equity_ax.autoscale_view()
+                self.equity_ax.xaxis_date()
+                self.equity_ax.xaxis.set_major_formatter(
+                    mdates.DateFormatter('%H:%M' if resolution != "day" else '%Y-%m-%d'))
+            self.equity_ax.set_title(f"Equity Curve - {self.equity_range_var.get()} ({len(values)} points)")
+            self.equity_canvas.draw_idle()
+            
+        except Exception as e:
+            print(f"Error updating performance tab: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            if self.running and hasattr(self, 'performance_labels'):
+                if getattr(self, '_performance_after_id', None):
+                    try:
+                        self.main_frame.after_cancel(self._performance_after_id)
+                    except Exception:
+                        pass
+                self._performance_after_id = self.main_frame.after(5000, self.update_performance_tab)
+
     def show_trade_details(self, trade):
         """Show detailed information about a specific trade"""
         # Create popup window
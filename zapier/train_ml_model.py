@@ -0,0 +1,118 @@
+"""Train the ML Strategy's model from broker history and backtest it out of sample
+
+Uses the same data path as the strategy page's backtest: candles from
+``Broker.get_history`` and fills from ``FillSimulator.backtest``.
+
+    python train_ml_model.py --broker fake --symbols NIFTY BANKNIFTY --out ml_model.npz
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from protrader.brokers import create_broker
+from protrader.fills import FillSimulator
+from protrader.ml import (candle_features, forward_labels, feature_names, predict_rows, edge_signals, LinearModel,
+                          FeatureCache)
+
+
+def load_history(broker, symbols, resolution, days):
+    end = datetime.now()
+    start = end - timedelta(days=days)
+    history = {}
+    for symbol in symbols:
+        try:
+            df = broker.get_history(symbol, resolution, start, end)
+        except Exception as e:
+            print(f"Error fetching history for {symbol}: {str(e)}")
+            continue
+        if df is not None and not df.empty:
+            history[symbol] = df
+    return history
+
+
+def build_dataset(history, lags, period, train_fraction):
+    """Stack every symbol's (features, labels), split in time so test bars come after train bars"""
+    train_X, train_y, tests = [], [], {}
+    for symbol, df in history.items():
+        close = df['Close'].to_numpy(dtype=np.float64)
+        X = candle_features(close, lags)
+        y = forward_labels(close, period)
+        split = int(len(close) * train_fraction)
+        ok = np.isfinite(X).all(axis=1) & np.isfinite(y)
+        ok[split:] = False
+        train_X.append(X[ok])
+        train_y.append(y[ok])
+        tests[symbol] = (df.iloc[split:], X[split:])
+    return np.vstack(train_X), np.concatenate(train_y), tests
+
+
+def check_live_features(history, lags):
+    """Symbols whose live FeatureCache rows differ from the training ``candle_features`` rows
+
+    Histories are aligned on their last bar, so a shorter one starts late in
+    the cache the way a newly listed symbol does on the live feed.
+    """
+    closes = [df['Close'].to_numpy(dtype=np.float64) for df in history.values()]
+    bars = max(len(c) for c in closes)
+    grid = np.full((bars, len(closes)), np.nan)
+    for j, close in enumerate(closes):
+        grid[bars - len(close):, j] = close
+    cache = FeatureCache(len(closes), lags)
+    rows = np.stack([cache.update(row) for row in grid], axis=1)
+    return [symbol for j, (symbol, close) in enumerate(zip(history, closes))
+            if not np.array_equal(rows[j, bars - len(close):], candle_features(close, lags), equal_nan=True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--broker", default="fake", help="fyers, dhan or fake")
+    parser.add_argument("--client-id", default=os.environ.get("BROKER_CLIENT_ID"))
+    parser.add_argument("--access-token", default=os.environ.get("BROKER_ACCESS_TOKEN"))
+    parser.add_argument("--symbols", nargs="+", default=["NIFTY", "BANKNIFTY", "FINNIFTY"])
+    parser.add_argument("--resolution", default="15", help="Candle resolution in minutes, or 1D")
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--lags", type=int, default=5)
+    parser.add_argument("--period", type=int, default=5, help="Label horizon (prediction_period) in bars")
+    parser.add_argument("--threshold", type=float, default=0.6, help="confidence_threshold for the backtest")
+    parser.add_argument("--train-fraction", type=float, default=0.7)
+    parser.add_argument("--l2", type=float, default=1.0)
+    parser.add_argument("--out", default="ml_model.npz")
+    args = parser.parse_args()
+
+    kwargs = {} if args.broker == "fake" else {"client_id": args.client_id, "access_token": args.access_token}
+    broker = create_broker(args.broker, **kwargs)
+    history = load_history(broker, args.symbols, args.resolution, args.days)
+    if not history:
+        print("No history available, nothing to train on")
+        return 1
+
+    mismatched = check_live_features(history, args.lags)
+    if mismatched:
+        print(f"Warning: live features differ from training features for {', '.join(mismatched)}")
+
+    X, y, tests = build_dataset(history, args.lags, args.period, args.train_fraction)
+    model = LinearModel.fit(X, y, l2=args.l2, names=feature_names(args.lags))
+    model.save(args.out)
+    train_accuracy = ((model.predict(X) >= 0.5) == (y == 1)).mean() * 100
+    print(f"Trained on {len(X)} bars from {len(history)} symbols, in-sample accuracy {train_accuracy:.1f}%")
+    for name, weight in zip(model.names, model.weights):
+        print(f"  {name:>14}: {weight:+.4f}")
+    print(f"Saved model to {args.out}")
+
+    # Out-of-sample backtest with the paper-trading fill model
+    simulator = FillSimulator(mode="ohlc", path="auto")
+    for symbol, (df, features) in tests.items():
+        data = df.copy()
+        proba = predict_rows(model, features)
+        data['Buy_Signal'], data['Sell_Signal'] = edge_signals(proba, args.threshold)
+        trades, summary = simulator.backtest(data)
+        print(f"{symbol}: {summary['total_trades']} trades, win rate {summary['win_rate']:.1f}%, "
+              f"P&L/unit {summary['total_pnl']:.2f}, profit factor {summary['profit_factor']:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())